@@ -3,6 +3,10 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Live match streams (live/<match_id>/stream/) are long-lived async
+responses and should be served through this entry point, e.g.
+``gunicorn backend.asgi:application -k uvicorn.workers.UvicornWorker``.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,7 +12,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 
 import os
+import sys
 from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 
@@ -85,6 +88,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+# Deployed entry point: live match streams need ASGI (see README)
+ASGI_APPLICATION = 'backend.asgi.application'
 
 
 DATABASES = {
@@ -101,6 +106,66 @@ DATABASES = {
     }
 }
 
+# Cache
+# Match state, official roles, engine versions and the live ticker are
+# shared between worker processes through the live cache, so it must be a
+# shared backend: set CACHE_BACKEND / CACHE_LOCATION, e.g.
+# django.core.cache.backends.redis.RedisCache and redis://127.0.0.1:6379.
+# The local memory default is only accepted with DEBUG on and in tests.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "kho-kho-live"),
+    }
+}
+
+LIVE_CACHE_ALIAS = "default"
+LIVE_CACHE_TIMEOUT = 60 * 60  # seconds
+# Tournament live ticker: computed at most once per worker per timeout
+LIVE_TICKER_TIMEOUT = 1  # seconds
+# Official roles, checked on every scoring request (see common.permissions)
+OFFICIAL_ROLES_CACHE_TIMEOUT = 60  # seconds
+
+TESTING = sys.argv[1:2] == ["test"]
+
+# Besides being shared, the backend must increment atomically across
+# processes: the engines' committed-version counter (matches.engines) is
+# a cache.incr(), which file and database caches do as a read then write
+SHARED_LIVE_CACHES = [
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+]
+
+if (
+    CACHES[LIVE_CACHE_ALIAS]["BACKEND"] not in SHARED_LIVE_CACHES
+    and not (DEBUG or TESTING)
+):
+    raise ImproperlyConfigured(
+        "The live cache must be shared between worker processes: set "
+        "CACHE_BACKEND and CACHE_LOCATION to Redis or Memcached"
+    )
+
+# Take a match snapshot every N score events (see scoring.snapshots)
+MATCH_SNAPSHOT_INTERVAL = 50
+
+# Completed matches older than this are packed by
+# `manage.py archive_match_events` (see scoring.archive)
+MATCH_ARCHIVE_AFTER_DAYS = 30
+
+# Score audit log (see scoring.audit)
+# Records are queued in process and bulk inserted every
+# SCORE_AUDIT_BATCH_SIZE records or SCORE_AUDIT_FLUSH_INTERVAL seconds.
+# SCORE_AUDIT_SYNC writes them inside the scoring transaction instead.
+SCORE_AUDIT_SYNC = os.getenv("SCORE_AUDIT_SYNC") == "True"
+SCORE_AUDIT_BATCH_SIZE = 200
+SCORE_AUDIT_FLUSH_INTERVAL = 1.0  # seconds
+SCORE_AUDIT_QUEUE_SIZE = 10000
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -3,6 +3,9 @@ WSGI config for backend project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
 
+Live match streams (live/<match_id>/stream/) answer 501 here: they are
+long-lived async responses and need backend.asgi.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 """
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """
+    One subscriber's view of a match channel.
+    Messages are delivered on the event loop that created it.
+    """
+
+    def __init__(self, broker, match_id, loop, max_queue_size):
+        self.broker = broker
+        self.match_id = match_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.closed = False
+
+    def deliver(self, message):
+        if self.closed:
+            return
+
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop it, the client reconnects and
+            # starts again from a fresh scoreboard
+            self.close()
+
+    async def get(self, timeout=None):
+        """
+        Next message, or None once the subscription is closed.
+        Raises asyncio.TimeoutError if nothing arrives within timeout.
+        """
+        if self.closed and self.queue.empty():
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        """
+        Safe to call from any thread.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.broker.unsubscribe(self)
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self.loop:
+            self._wake_reader()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._wake_reader)
+
+    def _wake_reader(self):
+        # Unblock a reader waiting on an empty queue
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class LocalBroker:
+    """
+    In-process publish/subscribe for live match updates.
+
+    Publishers may run in any thread (sync views, services), subscribers
+    live on asyncio event loops. A publish schedules one callback per
+    event loop, which then fans the message out to every subscriber on
+    that loop, so the cost per subscriber is a queue put.
+
+    Only subscribers in the same worker process are reached.
+    """
+
+    def __init__(self, max_queue_size=256):
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        # match_id -> loop -> set of subscriptions
+        self._channels = defaultdict(lambda: defaultdict(set))
+
+    def subscribe(self, match_id):
+        """
+        Must be called from inside a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(self, match_id, loop, self.max_queue_size)
+
+        with self._lock:
+            self._channels[match_id][loop].add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            loops = self._channels.get(subscription.match_id)
+            if loops is None:
+                return
+
+            subscribers = loops.get(subscription.loop)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del loops[subscription.loop]
+
+            if not loops:
+                del self._channels[subscription.match_id]
+
+    def subscriber_count(self, match_id):
+        with self._lock:
+            loops = self._channels.get(match_id, {})
+            return sum(len(subscribers) for subscribers in loops.values())
+
+    def publish(self, match_id, message):
+        with self._lock:
+            loops = self._channels.get(match_id)
+            if not loops:
+                return
+            targets = [
+                (loop, list(subscribers))
+                for loop, subscribers in loops.items()
+            ]
+
+        for loop, subscribers in targets:
+            if loop.is_closed():
+                continue
+            loop.call_soon_threadsafe(_fan_out, subscribers, message)
+
+
+def _fan_out(subscribers, message):
+    for subscription in subscribers:
+        subscription.deliver(message)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Process wide broker, class taken from settings.MATCH_EVENT_BROKER.
+    """
+    global _broker
+
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_class = import_string(getattr(
+                    settings, "MATCH_EVENT_BROKER", "common.broker.LocalBroker"
+                ))
+                _broker = broker_class()
+
+    return _broker
+
+
+def publish_match_event(match_id, message):
+    """
+    Push a message to the match channel once the current transaction
+    commits, so subscribers never see writes that were rolled back.
+    """
+    transaction.on_commit(
+        lambda: get_broker().publish(match_id, message)
+    )
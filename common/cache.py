@@ -0,0 +1,150 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+SCOREBOARD = "scoreboard"
+MATCH_STATE = "match_state"
+LINEUP = "lineup"
+OFFICIAL_ROLES = "official_roles"
+TICKER = "ticker"
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+# One lock per key being computed by get_or_compute_shared
+_compute_locks_lock = threading.Lock()
+_compute_locks = {}
+
+
+def get_cache():
+    return caches[getattr(settings, "LIVE_CACHE_ALIAS", "default")]
+
+
+def cache_timeout():
+    return getattr(settings, "LIVE_CACHE_TIMEOUT", 60 * 60)
+
+
+def scoreboard_key(match_id, version):
+    # Keyed by match version: entries of older versions are never read again
+    return f"scoreboard:{match_id}:v{version}"
+
+
+def match_state_key(match_id):
+    return f"match_state:{match_id}"
+
+
+def engine_version_key(match_id):
+    # Latest committed Match.version, see matches.engines
+    return f"engine_version:{match_id}"
+
+
+def lineup_key(match_id):
+    return f"lineup:{match_id}"
+
+
+def official_roles_key(user_id, match_id):
+    return f"official_roles:{user_id}:{match_id}"
+
+
+def official_roles_timeout():
+    # Short: role changes made around the model (queryset updates and
+    # deletes) are only picked up once the entry expires
+    return getattr(settings, "OFFICIAL_ROLES_CACHE_TIMEOUT", 60)
+
+
+def ticker_key(tournament_id):
+    return f"ticker:{tournament_id}"
+
+
+def ticker_timeout():
+    return getattr(settings, "LIVE_TICKER_TIMEOUT", 1)
+
+
+def _count(name, outcome):
+    with _stats_lock:
+        counters = _stats.setdefault(name, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+
+def cache_stats():
+    """
+    Hit/miss counters of this worker process, per cached view.
+    """
+    with _stats_lock:
+        return {name: dict(counters) for name, counters in _stats.items()}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def get_or_compute(name, key, compute, timeout=None):
+    """
+    Cached value for key, computing and storing it on a miss.
+
+    Misses are stored with add(), so a reader that computed from data
+    older than a concurrent write-through never overwrites the fresh entry.
+    None results are not cached.
+    """
+    cache = get_cache()
+    value = cache.get(key)
+
+    if value is not None:
+        _count(name, "hits")
+        return value
+
+    _count(name, "misses")
+    value = compute()
+
+    if value is not None:
+        cache.add(key, value, timeout or cache_timeout())
+
+    return value
+
+
+def _compute_lock(key):
+    with _compute_locks_lock:
+        return _compute_locks.setdefault(key, threading.Lock())
+
+
+def get_or_compute_shared(name, key, compute, timeout):
+    """
+    get_or_compute for short-lived entries that many clients poll at once.
+
+    Concurrent misses in this process wait for a single computation
+    instead of each running their own. Nothing writes these entries
+    through: they are stored with set() and left to expire after timeout.
+    """
+    cache = get_cache()
+    value = cache.get(key)
+
+    if value is not None:
+        _count(name, "hits")
+        return value
+
+    with _compute_lock(key):
+        # Computed by the request we waited for
+        value = cache.get(key)
+
+        if value is not None:
+            _count(name, "hits")
+            return value
+
+        _count(name, "misses")
+        value = compute()
+
+        if value is not None:
+            cache.set(key, value, timeout)
+
+    return value
+
+
+def store(key, value):
+    get_cache().set(key, value, cache_timeout())
+
+
+def delete(*keys):
+    get_cache().delete_many(keys)
@@ -1,7 +1,45 @@
 from rest_framework.permissions import BasePermission
+from common import cache as live_cache
 from matches.models import MatchOfficial
 
 
+def get_official_roles(user_id, match_id):
+    """
+    Roles the user holds on the match, cached per (user, match) for
+    OFFICIAL_ROLES_CACHE_TIMEOUT. MatchOfficial.save/delete drop the entry.
+    No roles is never cached, so a new assignment counts straight away.
+    """
+    roles = live_cache.get_or_compute(
+        live_cache.OFFICIAL_ROLES,
+        live_cache.official_roles_key(user_id, match_id),
+        lambda: list(
+            MatchOfficial.objects.filter(
+                match_id=match_id,
+                user_id=user_id
+            ).values_list("role", flat=True)
+        ) or None,
+        timeout=live_cache.official_roles_timeout()
+    )
+
+    return roles or []
+
+
+def get_match_id(request, view):
+    """
+    Match of the request: from the URL, or from the body for endpoints
+    like create-score that post the match id.
+    """
+    match_id = view.kwargs.get("match_id")
+
+    if match_id is None and request.method == "POST":
+        match_id = request.data.get("match")
+
+    try:
+        return int(match_id)
+    except (TypeError, ValueError):
+        return None
+
+
 class IsMatchOfficialOrAdmin(BasePermission):
     """
     Allows access only if:
@@ -18,26 +56,21 @@ class IsMatchOfficialOrAdmin(BasePermission):
         if request.user.role == "ADMIN":
             return True
 
-        match_id = view.kwargs.get("match_id")
+        match_id = get_match_id(request, view)
 
         if not match_id:
             return False
 
-        return MatchOfficial.objects.filter(
-            match_id=match_id,
-            user=request.user
-        ).exists()
+        return bool(get_official_roles(request.user.id, match_id))
 
 
 class IsMatchOfficialWithRole(BasePermission):
     """
     Allows access only if:
     - User is ADMIN
-    - OR user is assigned with specific role
+    - OR user is assigned with one of the view's `official_roles`
     """
 
-    allowed_roles = []
-
     def has_permission(self, request, view):
 
         if not request.user or not request.user.is_authenticated:
@@ -46,13 +79,12 @@ class IsMatchOfficialWithRole(BasePermission):
         if request.user.role == "ADMIN":
             return True
 
-        match_id = view.kwargs.get("match_id")
+        match_id = get_match_id(request, view)
 
         if not match_id:
             return False
 
-        return MatchOfficial.objects.filter(
-            match_id=match_id,
-            user=request.user,
-            role__in=self.allowed_roles
-        ).exists()
+        allowed_roles = getattr(view, "official_roles", [])
+        roles = get_official_roles(request.user.id, match_id)
+
+        return any(role in allowed_roles for role in roles)
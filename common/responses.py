@@ -1,5 +1,6 @@
 from rest_framework.response import Response
 from rest_framework import status
+from django.utils.http import parse_etags
 
 
 def success_response(message, data=None, status_code=status.HTTP_200_OK):
@@ -16,3 +17,26 @@ def error_response(message, errors=None, status_code=status.HTTP_400_BAD_REQUEST
         "message": message,
         "errors": errors
     }, status=status_code)
+
+
+
+def match_etag(match_id, version):
+    return f'"match-{match_id}-v{version}"'
+
+
+def etag_matches(request, etag):
+    """
+    True if the client's If-None-Match already covers this ETag.
+    """
+    header = request.headers.get("If-None-Match")
+
+    if not header:
+        return False
+
+    etags = parse_etags(header)
+
+    return "*" in etags or etag in etags or f"W/{etag}" in etags
+
+
+def not_modified_response(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
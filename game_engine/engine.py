@@ -1,21 +1,133 @@
+from collections import deque
+
 from .match_state import MatchState
 
+
+TURN_FIELDS = ["team_a_points", "team_b_points", "outs", "all_outs", "event_count"]
+
+
+RECENT_EVENTS = 5
+
+
 class KhoKhoEngine:
-    def __init__(self):
-        self.state = MatchState()
+    """
+    In-memory state of one match: clock, scores, outs and the latest
+    events. Fed score events in sequence order.
+    Outs are counted per defending team: events do not name the
+    defender that was tagged, player_out() records one when known.
+    Team A chases in odd turns.
+    """
 
-    def start_match(self, team):
-        self.state.start(team)
+    __slots__ = (
+        "state", "match_id", "team_names", "player_names", "scores", "outs",
+        "sequence", "version", "recent_events", "turn_scores",
+    )
+
+    def __init__(self, match_id=None, team_names=None, player_names=None,
+                 duration_seconds=540):
+        self.state = MatchState(duration_seconds)
+        self.match_id = match_id
+        # {team id: name}, team A first
+        self.team_names = dict(team_names or {})
+        self.player_names = dict(player_names or {})
+        self.scores = dict.fromkeys(self.team_names, 0)
+        # Outs conceded, per defending team
+        self.outs = dict.fromkeys(self.team_names, 0)
+        # Sequence number of the last applied event
+        self.sequence = 0
+        # Change counter of whatever stores the match, set by the owner
+        self.version = 0
+        self.recent_events = deque(maxlen=RECENT_EVENTS)
+        # {turn: {field: value}} for TURN_FIELDS, kept up to date per event
+        self.turn_scores = {}
+
+    def start_match(self, team, now=None):
+        self.state.start(team, now)
+
+    def chasing_team(self, turn):
+        team_ids = list(self.team_names)
+        return team_ids[(turn - 1) % 2] if len(team_ids) == 2 else None
+
+    def start_turn(self, turn):
+        self.state.start_turn(turn, self.chasing_team(turn))
+
+    def turn_score(self, turn):
+        split = self.turn_scores.get(turn)
+        if split is None:
+            split = self.turn_scores[turn] = dict.fromkeys(TURN_FIELDS, 0)
+        return split
 
     def player_out(self, player_id):
-        if player_id not in self.state.out_players:
-            self.state.out_players.append(player_id)
+        self.state.out_players.add(player_id)
+
+    def apply_score(self, event):
+        """
+        Apply one score event (a live feed message). Returns False without
+        changing anything if it is not the next event in sequence.
+        """
+
+        if event["sequence"] != self.sequence + 1:
+            return False
+
+        team_id = event["team_id"]
+        self.scores[team_id] = self.scores.get(team_id, 0) + event["points"]
+
+        if event["turn"] > self.state.turn:
+            self.start_turn(event["turn"])
+
+        # A correction counts its original back out
+        step = -1 if event["reverses"] else 1
+
+        split = self.turn_score(event["turn"])
+        team_a = next(iter(self.team_names), None)
+        split["team_a_points" if team_id == team_a else "team_b_points"] += event["points"]
+        split["event_count"] += 1
+
+        if event["event_type"] == "OUT":
+            defending = event["defending_team_id"]
+            self.outs[defending] = self.outs.get(defending, 0) + step
+            split["outs"] += step
+
+            # Corrections are filed under the turn of their original
+            if event["turn"] == self.state.turn:
+                if event["reverses"]:
+                    self.state.undo_out()
+                else:
+                    # The ALL_OUT it earns follows as its own event
+                    self.state.record_out()
+
+        elif event["event_type"] == "ALL_OUT":
+            split["all_outs"] += step
+
+        self.sequence = event["sequence"]
+
+        self.recent_events.appendleft({
+            "id": event["score_id"],
+            "sequence": event["sequence"],
+            "event_type": event["event_type"],
+            "reverses": event["reverses"],
+            "points": event["points"],
+            "team": self.team_names.get(team_id),
+            "player": self.player_names.get(event["player_id"]),
+            "time": event["time"],
+        })
+
+        return True
 
-    def get_state(self):
+    def get_state(self, now=None):
         return {
             "status": self.state.status,
-            "remaining_time": self.state.remaining_time(),
+            "elapsed_time": int(self.state.elapsed_time(now).total_seconds()),
+            "remaining_time": self.state.remaining_time(now),
             "active_team": self.state.active_team,
+            "turn": self.state.turn,
             "active_batch": self.state.active_batch,
-            "out_players": self.state.out_players
+            "batch_outs": self.state.batch_outs,
+            "out_players": sorted(self.state.out_players),
+            "sequence": self.sequence,
+            "scores": dict(self.scores),
+            "outs": dict(self.outs),
+            "turn_score": dict(
+                self.turn_scores.get(self.state.turn) or dict.fromkeys(TURN_FIELDS, 0)
+            ),
         }
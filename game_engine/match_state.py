@@ -1,23 +1,121 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+
+TURNS = 4        # two innings, each team chases once per innings
+BATCH_SIZE = 3   # defenders sent in together
+BATCHES = 3      # nine defenders on the field
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+def batch_after_out(batch, batch_outs):
+    """
+    (batch, outs in batch, all out) after one more defender is out.
+    All out: the last batch is exhausted and the batches start over.
+    """
+
+    batch_outs += 1
+
+    if batch_outs < BATCH_SIZE:
+        return batch, batch_outs, False
+
+    if batch < BATCHES:
+        return batch + 1, 0, False
+
+    return 1, 0, True
+
+
+def batch_after_correction(batch, batch_outs):
+    """
+    (batch, outs in batch) with one out given back. A correction only
+    follows an out of the same turn, so at the first batch with no outs
+    it takes back the out that made the defenders all out.
+    """
+
+    if batch_outs > 0:
+        return batch, batch_outs - 1
+
+    if batch > 1:
+        return batch - 1, BATCH_SIZE - 1
+
+    return BATCHES, BATCH_SIZE - 1
+
 
 class MatchState:
+    __slots__ = (
+        "status", "start_time", "duration", "elapsed", "running_since",
+        "active_team", "turn", "active_batch", "batch_outs", "out_players",
+    )
+
     def __init__(self, duration_seconds=540):  # 9 minutes
         self.status = "NOT_STARTED"  # NOT_STARTED, RUNNING, PAUSED, FINISHED
         self.start_time = None
         self.duration = timedelta(seconds=duration_seconds)
+        # Running time banked before the current stretch, and when that
+        # stretch began (None while the clock is stopped)
+        self.elapsed = timedelta(0)
+        self.running_since = None
         self.active_team = None
+        self.turn = 1
         self.active_batch = 1
-        self.out_players = []
+        # Defenders of the active batch already out
+        self.batch_outs = 0
+        self.out_players = set()
 
-    def start(self, team):
+    def start(self, team, now=None):
+        now = now or utc_now()
         self.status = "RUNNING"
-        self.start_time = datetime.utcnow()
+        self.start_time = now
+        self.running_since = now
         self.active_team = team
 
-    def remaining_time(self):
-        if self.status != "RUNNING":
-            return int(self.duration.total_seconds())
+    def start_turn(self, turn, team=None):
+        self.turn = turn
+        self.active_batch = 1
+        self.batch_outs = 0
+        if team is not None:
+            self.active_team = team
+
+    def record_out(self):
+        """
+        Count an out against the active batch. True if it was the last
+        defender of the last batch (all out).
+        """
+        self.active_batch, self.batch_outs, all_out = batch_after_out(
+            self.active_batch, self.batch_outs
+        )
+        return all_out
+
+    def undo_out(self):
+        self.active_batch, self.batch_outs = batch_after_correction(
+            self.active_batch, self.batch_outs
+        )
+
+    def pause(self, now=None):
+        self.stop_clock(now)
+        self.status = "PAUSED"
+
+    def resume(self, now=None):
+        self.status = "RUNNING"
+        if self.running_since is None:
+            self.running_since = now or utc_now()
+
+    def finish(self, now=None):
+        self.stop_clock(now)
+        self.status = "FINISHED"
+
+    def stop_clock(self, now=None):
+        if self.running_since is not None:
+            self.elapsed += (now or utc_now()) - self.running_since
+            self.running_since = None
+
+    def elapsed_time(self, now=None):
+        if self.running_since is None:
+            return self.elapsed
+        return self.elapsed + ((now or utc_now()) - self.running_since)
 
-        elapsed = datetime.utcnow() - self.start_time
-        remaining = self.duration - elapsed
+    def remaining_time(self, now=None):
+        remaining = self.duration - self.elapsed_time(now)
         return max(int(remaining.total_seconds()), 0)
@@ -0,0 +1,63 @@
+import random
+
+from .match_state import TURNS, MatchState
+
+
+# Events logged per minute of chasing, roughly a senior league match
+DEFAULT_RATES = {
+    "TOUCH": 6.0,
+    "OUT": 2.0,
+    "BONUS": 0.5,
+    "FOUL": 0.5,
+}
+
+
+class MatchSimulator:
+    """
+    Plays out a synthetic match under the engine's rules: TURNS turns of
+    `turn_seconds`, team A chasing first, events arriving at random
+    (exponential gaps) at `rates` per minute.
+
+    Teams are (team id, [playing player ids]). plays() yields what a
+    scorer would submit, in order; the server adds the ALL_OUTs itself,
+    `all_outs` counts the ones it should have added.
+    """
+
+    def __init__(self, team_a, team_b, turn_seconds=540, rates=None, seed=None):
+        self.teams = [team_a, team_b]
+        self.turn_seconds = turn_seconds
+        self.rates = dict(rates or DEFAULT_RATES)
+        self.random = random.Random(seed)
+        self.state = MatchState(turn_seconds)
+        self.all_outs = 0
+
+    def plays(self):
+        event_types = list(self.rates)
+        weights = [self.rates[event_type] for event_type in event_types]
+        per_second = sum(weights) / 60
+
+        for turn in range(1, TURNS + 1):
+            (attacking, players), (defending, _) = (
+                self.teams if turn % 2 else self.teams[::-1]
+            )
+            self.state.start_turn(turn, attacking)
+
+            at = 0.0
+            while True:
+                at += self.random.expovariate(per_second)
+                if at >= self.turn_seconds:
+                    break
+
+                event_type = self.random.choices(event_types, weights)[0]
+
+                if event_type == "OUT" and self.state.record_out():
+                    self.all_outs += 1
+
+                yield {
+                    "turn": turn,
+                    "at": round(at, 1),
+                    "event_type": event_type,
+                    "attacking_team": attacking,
+                    "defending_team": defending,
+                    "player": self.random.choice(players),
+                }
@@ -0,0 +1,343 @@
+import threading
+from datetime import datetime, timedelta
+
+from django.db import transaction
+
+from common import cache as live_cache
+from game_engine.engine import TURN_FIELDS, KhoKhoEngine
+from players.models import Player
+from scoring.models import ScoreEvent, TurnScore
+from scoring.snapshots import latest_snapshot
+from .models import Match
+
+
+# Match statuses that keep an engine, and their engine counterparts
+ENGINE_STATUS = {"LIVE": "RUNNING", "PAUSED": "PAUSED"}
+MATCH_STATUS = {"RUNNING": "LIVE", "PAUSED": "PAUSED"}
+
+
+class EngineRegistry:
+    """
+    One KhoKhoEngine per LIVE or PAUSED match, in this worker process.
+
+    Engines are fed committed changes of this process directly. Each
+    engine remembers the Match.version it reflects; the latest committed
+    version of a match is kept in the shared live cache, so an engine left
+    behind by another worker's write is caught up from the database.
+    That counter is only seen by every worker on a shared backend with an
+    atomic incr (Redis, Memcached), which settings require outside DEBUG
+    and tests.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._engines = {}
+
+    def get(self, match_id):
+        return self._engines.get(match_id)
+
+    def put(self, engine):
+        with self.lock:
+            self._engines[engine.match_id] = engine
+
+    def discard(self, match_id):
+        with self.lock:
+            self._engines.pop(match_id, None)
+
+    def clear(self):
+        with self.lock:
+            self._engines.clear()
+
+    def __len__(self):
+        return len(self._engines)
+
+
+_registry = EngineRegistry()
+
+
+def get_engine_registry():
+    return _registry
+
+
+def set_clock(engine, match):
+    """
+    Copy status and clock of the match row into its engine.
+    """
+
+    state = engine.state
+    state.status = ENGINE_STATUS.get(match.status, "FINISHED")
+    state.start_time = match.started_at
+    state.elapsed = timedelta(seconds=match.clock_elapsed_seconds)
+    state.running_since = match.clock_running_since
+
+
+def set_turn(engine, score):
+    """
+    Copy turn and batch of the match's running totals into its engine.
+    """
+
+    if score is None:
+        return
+
+    if score.turn != engine.state.turn:
+        engine.start_turn(score.turn)
+    engine.state.active_batch = score.batch
+    engine.state.batch_outs = score.batch_outs
+
+
+def event_rows(match_id, after_sequence):
+    """
+    Events after `after_sequence`, shaped like the live feed messages.
+    """
+
+    events = ScoreEvent.objects.filter(
+        match_id=match_id,
+        sequence__gt=after_sequence
+    ).order_by("sequence").values(
+        "id", "sequence", "event_type", "points", "reverses_id",
+        "attacking_team_id", "defending_team_id", "player_id", "timestamp",
+        "turn", "batch"
+    )
+
+    return [
+        {
+            "score_id": e["id"],
+            "sequence": e["sequence"],
+            "event_type": e["event_type"],
+            "points": e["points"],
+            "reverses": e["reverses_id"],
+            "team_id": e["attacking_team_id"],
+            "defending_team_id": e["defending_team_id"],
+            "player_id": e["player_id"],
+            "turn": e["turn"],
+            "batch": e["batch"],
+            "time": e["timestamp"],
+        }
+        for e in events
+    ]
+
+
+def build_engine(match_id):
+    """
+    Engine for a LIVE or PAUSED match from its latest snapshot plus the
+    events after it. None for any other match.
+    """
+
+    match = Match.objects.select_related(
+        "tournament", "team_a", "team_b", "score"
+    ).filter(id=match_id, status__in=ENGINE_STATUS).first()
+
+    if match is None:
+        return None
+
+    player_names = {
+        player_id: f"{first_name} {last_name}"
+        for player_id, first_name, last_name in Player.objects.filter(
+            team_id__in=[match.team_a_id, match.team_b_id]
+        ).values_list("id", "first_name", "last_name")
+    }
+
+    engine = KhoKhoEngine(
+        match.id,
+        {match.team_a_id: match.team_a.name, match.team_b_id: match.team_b.name},
+        player_names,
+        duration_seconds=match.tournament.max_time_per_turn
+    )
+    engine.start_match(match.team_a_id, match.started_at)
+    set_clock(engine, match)
+    engine.version = match.version
+
+    snapshot = latest_snapshot(match)
+
+    if snapshot is not None:
+        engine.scores = {
+            match.team_a_id: snapshot.team_a_score,
+            match.team_b_id: snapshot.team_b_score,
+        }
+        engine.outs.update(
+            (int(team_id), outs) for team_id, outs in snapshot.team_outs.items()
+        )
+        engine.sequence = snapshot.event_count
+
+    for event in event_rows(match.id, engine.sequence):
+        engine.apply_score(event)
+
+    # Splits and batches are kept current per event, the replay above
+    # only saw the tail: take them as stored
+    engine.turn_scores = {
+        split.pop("turn"): split
+        for split in TurnScore.objects.filter(match=match).values("turn", *TURN_FIELDS)
+    }
+    set_turn(engine, match.score if hasattr(match, "score") else None)
+
+    # scoring.services feeds the engines, import it late
+    from scoring.services import get_recent_events
+
+    engine.recent_events.clear()
+    engine.recent_events.extend(get_recent_events(match))
+
+    return engine
+
+
+def catch_up(engine):
+    """
+    Bring an engine up to the committed state of its match: status and
+    clock from the match row, then the events it has not seen.
+    Returns None once the match is no longer LIVE or PAUSED.
+    """
+
+    match = Match.objects.select_related("score").filter(id=engine.match_id).only(
+        "status", "started_at", "clock_elapsed_seconds",
+        "clock_running_since", "version",
+        "score__turn", "score__batch", "score__batch_outs"
+    ).first()
+
+    if match is None or match.status not in ENGINE_STATUS:
+        return None
+
+    events = event_rows(match.id, engine.sequence)
+
+    with _registry.lock:
+        set_clock(engine, match)
+        for event in events:
+            engine.apply_score(event)
+        set_turn(engine, match.score if hasattr(match, "score") else None)
+        engine.version = match.version
+
+    return engine
+
+
+def get_live_engine(match_id):
+    """
+    Engine of a LIVE or PAUSED match, current as of the latest committed
+    change, or None. Served from memory unless another worker changed the
+    match since this engine last saw it.
+    """
+
+    cache = live_cache.get_cache()
+    key = live_cache.engine_version_key(match_id)
+    committed = cache.get(key)
+
+    engine = _registry.get(match_id)
+
+    if engine is not None and committed is not None and engine.version >= committed:
+        return engine
+
+    # Without the committed version (evicted, restarted cache) start over
+    if engine is None or committed is None:
+        engine = build_engine(match_id)
+    else:
+        engine = catch_up(engine)
+
+    if engine is None:
+        _registry.discard(match_id)
+        return None
+
+    _registry.put(engine)
+    cache.add(key, engine.version, live_cache.cache_timeout())
+
+    return engine
+
+
+def live_match_state(engine):
+    """
+    get_match_state for an engine, plus the engine's scores and outs.
+    """
+
+    with _registry.lock:
+        state = engine.get_state()
+
+    clock = engine.state
+
+    return {
+        "match_id": engine.match_id,
+        **state,
+        "status": MATCH_STATUS.get(clock.status, "COMPLETED"),
+        "started_at": clock.start_time,
+        "ended_at": None,
+        "duration": int(clock.duration.total_seconds()),
+    }
+
+
+def live_scoreboard(engine):
+    """
+    Team names, scores and latest events of an engine.
+    """
+
+    with _registry.lock:
+        (team_a, name_a), (team_b, name_b) = engine.team_names.items()
+        return {
+            "status": MATCH_STATUS.get(engine.state.status, "COMPLETED"),
+            "team_a": name_a,
+            "team_b": name_b,
+            "team_a_score": engine.scores.get(team_a, 0),
+            "team_b_score": engine.scores.get(team_b, 0),
+            "events": list(engine.recent_events),
+        }
+
+
+def version_committed(match_id):
+    try:
+        live_cache.get_cache().incr(live_cache.engine_version_key(match_id))
+    except ValueError:
+        # Not cached: the next reader loads the version from the database
+        pass
+
+
+def engine_scored(match_id, messages):
+    """
+    Feed score events to the match's engine once the transaction commits.
+    Call once per Match.version bump.
+    """
+
+    def apply():
+        version_committed(match_id)
+        engine = _registry.get(match_id)
+
+        if engine is None:
+            return
+
+        # Same event times as the rows read from the database
+        events = [
+            {**message, "time": datetime.fromisoformat(message["time"])}
+            for message in messages
+        ]
+
+        with _registry.lock:
+            applied = all(engine.apply_score(event) for event in events)
+            engine.version += 1
+
+        # Out of order with another write of this process: reload
+        if not applied:
+            _registry.discard(match_id)
+
+    transaction.on_commit(apply)
+
+
+def engine_status_changed(match, turn=None):
+    """
+    Start, pause, resume or end the match's engine, or move it to a new
+    turn, once the transaction commits. Call once per Match.version bump.
+    """
+
+    def apply():
+        version_committed(match.id)
+
+        if match.status not in ENGINE_STATUS:
+            _registry.discard(match.id)
+            return
+
+        engine = _registry.get(match.id)
+
+        if engine is None:
+            # Just started: build it now rather than on the first read
+            get_live_engine(match.id)
+            return
+
+        with _registry.lock:
+            set_clock(engine, match)
+            if turn is not None:
+                engine.start_turn(turn)
+            engine.version += 1
+
+    transaction.on_commit(apply)
@@ -0,0 +1,43 @@
+from common import cache as live_cache
+from .models import MatchPlayer
+
+
+def load_lineup(match_id):
+    """
+    player id -> (team id, lineup status) for every player named in the
+    match lineup, read with one query.
+    """
+
+    return {
+        player_id: (team_id, status)
+        for player_id, team_id, status in MatchPlayer.objects.filter(
+            match_id=match_id
+        ).values_list("player_id", "player__team_id", "status")
+    }
+
+
+def snapshot_lineup(match):
+    """
+    Store the lineup snapshot of a match that has just gone LIVE.
+    The lineup cannot change after that (see MatchPlayer.clean).
+    """
+
+    lineup = load_lineup(match.id)
+    live_cache.store(live_cache.lineup_key(match.id), lineup)
+    return lineup
+
+
+def get_lineup_snapshot(match):
+    """
+    Cached lineup snapshot, rebuilt from the database if it was evicted.
+    """
+
+    return live_cache.get_or_compute(
+        live_cache.LINEUP,
+        live_cache.lineup_key(match.id),
+        lambda: load_lineup(match.id)
+    )
+
+
+def forget_lineup(match_id):
+    live_cache.delete(live_cache.lineup_key(match_id))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0004_match_round_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:16
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_clocks_of_live_matches(apps, schema_editor):
+    # Paused time before this migration is unknown, count from started_at
+    Match = apps.get_model('matches', 'Match')
+    Match.objects.filter(status='LIVE').update(clock_running_since=F('started_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_match_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='clock_elapsed_seconds',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='clock_running_since',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(start_clocks_of_live_matches, migrations.RunPython.noop),
+    ]
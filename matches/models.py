@@ -1,10 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.forms import ValidationError
 from tournaments.models import Tournament
 from teams.models import Team
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db.models import Q
+from django.db.models import F, Q
+from common import cache as live_cache
 
 User = settings.AUTH_USER_MODEL
 
@@ -55,6 +56,17 @@ class Match(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Bumped on every score event and status change, used as ETag.
+    # Only ever changed through bump_version(), so saves elsewhere
+    # should pass update_fields to avoid writing back a stale value.
+    version = models.PositiveIntegerField(default=0, editable=False)
+
+    # Clock of the current turn, written only on start/pause/resume/end
+    # and turn changes: running time banked before the current stretch,
+    # and when that stretch began (None while the clock is stopped)
+    clock_elapsed_seconds = models.FloatField(default=0, editable=False)
+    clock_running_since = models.DateTimeField(null=True, blank=True, editable=False)
+
     class Meta:
         unique_together = ("tournament", "match_number")
 
@@ -117,6 +129,19 @@ class Match(models.Model):
         self.full_clean()
         super().save(*args, **kwargs)
 
+    def start_clock(self, now):
+        if self.clock_running_since is None:
+            self.clock_running_since = now
+
+    def stop_clock(self, now):
+        if self.clock_running_since is not None:
+            self.clock_elapsed_seconds += (now - self.clock_running_since).total_seconds()
+            self.clock_running_since = None
+
+    @classmethod
+    def bump_version(cls, match_id):
+        cls.objects.filter(pk=match_id).update(version=F("version") + 1)
+
     def __str__(self):
         return f"Match {self.match_number} - {self.team_a.name} vs {self.team_b.name}"
 
@@ -168,9 +193,19 @@ class MatchOfficial(models.Model):
             if existing >= 2:
                 raise ValidationError("Only 2 umpires allowed per match.")
 
+    def forget_cached_roles(self):
+        key = live_cache.official_roles_key(self.user_id, self.match_id)
+        transaction.on_commit(lambda: live_cache.delete(key))
+
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+        self.forget_cached_roles()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.forget_cached_roles()
+        return result
 
     def __str__(self):
         return f"{self.user} ({self.role}) - {self.match}"
@@ -257,8 +292,18 @@ class MatchPlayer(models.Model):
                 raise ValidationError("Maximum 9 playing players allowed per team")
 
     def save(self, *args, **kwargs):
+        from .lineup import forget_lineup
+
         self.full_clean()
         super().save(*args, **kwargs)
+        forget_lineup(self.match_id)
+
+    def delete(self, *args, **kwargs):
+        from .lineup import forget_lineup
+
+        result = super().delete(*args, **kwargs)
+        forget_lineup(self.match_id)
+        return result
 
     def __str__(self):
         return f"{self.player} - {self.status}"
@@ -1,11 +1,49 @@
 from django.core.exceptions import ValidationError
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
 from django.utils import timezone
-from scoring.services import get_match_scoreboard
+from common import cache as live_cache
+from common.broker import publish_match_event
+from scoring.services import get_match_scoreboard, refresh_scoreboard_cache, start_next_turn
+from scoring.audit import flush_audit_log
+from scoring.models import ScoreEvent
+from scoring.snapshots import take_match_snapshot
+from tournaments.bracket import advance_winner
+from .engines import engine_status_changed
 from .models import MatchResult
 from .models import Match
 from .models import MatchOfficial
+from .lineup import snapshot_lineup
 from teams.models import Team
+from tournaments.models import Tournament
+
+
+CLOCK_FIELDS = ["clock_elapsed_seconds", "clock_running_since"]
+
+
+def status_changed(match, **extra):
+    """
+    Follow-up of every status transition: bump the match version,
+    refresh the live caches and engine and tell live subscribers.
+    """
+    Match.bump_version(match.id)
+    engine_status_changed(match, turn=extra.get("turn"))
+
+    state = get_match_state_base(match)
+
+    def refresh_live_cache():
+        live_cache.store(live_cache.match_state_key(match.id), state)
+        refresh_scoreboard_cache(match)
+
+    transaction.on_commit(refresh_live_cache)
+
+    publish_match_event(match.id, {
+        "type": "status",
+        "match_id": match.id,
+        "status": match.status,
+        **extra,
+    })
+
 
 def start_match(match):
 
@@ -23,8 +61,14 @@ def start_match(match):
 
     match.status = "LIVE"
     match.started_at = timezone.now()
-    match.save()
+    match.start_clock(match.started_at)
+    match.save(update_fields=["status", "started_at", "clock_running_since"])
+    status_changed(match)
 
+    # Lineup is frozen from here on, score validation reads it from cache
+    transaction.on_commit(lambda: snapshot_lineup(match))
+
+@transaction.atomic
 def end_match(match):
 
     if match.status != "LIVE":
@@ -51,7 +95,7 @@ def end_match(match):
     else:
         is_draw = True
 
-    MatchResult.objects.create(
+    result = MatchResult.objects.create(
         match=match,
         team_a_score=team_a_score,
         team_b_score=team_b_score,
@@ -59,37 +103,213 @@ def end_match(match):
         is_draw=is_draw
     )
 
-    match.status = "COMPLETED"
-    match.save()
+    complete_match(match, result)
 
-def get_match_state(match: Match):
+
+def complete_match(match, result):
     """
-    Returns current authoritative state of the match
+    Close a match whose result has just been stored, whether by end_match
+    or entered by hand: final snapshot, clock and status, knockout
+    advancement, then the live caches, engine and subscribers.
+    Call inside a transaction.
     """
 
-    remaining_time = None
+    take_match_snapshot(match, final=True)
 
-    if match.status == 'LIVE' and match.started_at:
-        elapsed = (timezone.now() - match.started_at).total_seconds()
-        TOTAL_DURATION = 9 * 60  # 9 minutes (change later if needed)
-        remaining_time = max(int(TOTAL_DURATION - elapsed), 0)
+    # The match's audit trail is complete once it has ended
+    transaction.on_commit(flush_audit_log)
+
+    match.status = "COMPLETED"
+    match.ended_at = timezone.now()
+    match.stop_clock(match.ended_at)
+    match.save(update_fields=CLOCK_FIELDS + ["status", "ended_at"])
+
+    # Knockout: the winner moves into the next round's slot
+    advance_winner(match, result.winner_id)
+
+    status_changed(
+        match,
+        team_a_score=result.team_a_score,
+        team_b_score=result.team_b_score,
+        winner_id=result.winner_id,
+        is_draw=result.is_draw
+    )
+
+
+def get_match_state_base(match: Match):
+    """
+    The part of the match state that only changes on status transitions,
+    including the clock: remaining time follows from it without a query.
+    """
 
     return {
         "match_id": match.id,
         "status": match.status,
         "started_at": match.started_at,
         "ended_at": match.ended_at,
-        "remaining_time": remaining_time,
+        "duration": match.tournament.max_time_per_turn,
+        "clock_elapsed_seconds": match.clock_elapsed_seconds,
+        "clock_running_since": match.clock_running_since,
+    }
+
+
+def with_remaining_time(state, now=None):
+    """
+    Adds elapsed and remaining running time. Pauses do not count,
+    the clock only runs while the match is LIVE.
+    """
+
+    if state["status"] not in ("LIVE", "PAUSED"):
+        return {**state, "elapsed_time": None, "remaining_time": None}
+
+    elapsed = state["clock_elapsed_seconds"]
+
+    if state["clock_running_since"]:
+        now = now or timezone.now()
+        elapsed += (now - state["clock_running_since"]).total_seconds()
+
+    return {
+        **state,
+        "elapsed_time": int(elapsed),
+        "remaining_time": max(int(state["duration"] - elapsed), 0),
+    }
+
+
+def get_match_state(match: Match):
+    """
+    Returns current authoritative state of the match
+    """
+
+    return with_remaining_time(get_match_state_base(match))
+
+
+def get_cached_match_state(match_id):
+    """
+    get_match_state by match id, served from the live cache.
+    Every status transition writes the entry through, so a warm read
+    needs no database access. Returns None if the match does not exist.
+    """
+
+    def load():
+        match = Match.objects.select_related("tournament").filter(id=match_id).first()
+        return get_match_state_base(match) if match else None
+
+    state = live_cache.get_or_compute(
+        live_cache.MATCH_STATE,
+        live_cache.match_state_key(match_id),
+        load
+    )
+
+    return with_remaining_time(state) if state else None
+
+
+def get_tournament_ticker_base(tournament_id):
+    """
+    Status, score, clock and last event of every LIVE or PAUSED match of
+    a tournament, in two queries however many matches are running.
+    None if the tournament does not exist.
+    """
+
+    last_event = ScoreEvent.objects.filter(
+        match=OuterRef("pk")
+    ).order_by("-sequence").values("id")[:1]
+
+    matches = list(Match.objects.filter(
+        tournament_id=tournament_id,
+        status__in=["LIVE", "PAUSED"]
+    ).order_by("match_number").values(
+        "id", "match_number", "venue", "status",
+        "clock_elapsed_seconds", "clock_running_since",
+        "tournament__max_time_per_turn",
+        "team_a__name", "team_b__name",
+        "score__team_a_score", "score__team_b_score", "score__turn",
+        last_event_id=Subquery(last_event),
+    ))
+
+    if not matches and not Tournament.objects.filter(id=tournament_id).exists():
+        return None
+
+    events = {
+        e["id"]: e
+        for e in ScoreEvent.objects.filter(
+            id__in=[m["last_event_id"] for m in matches if m["last_event_id"]]
+        ).values(
+            "id", "sequence", "event_type", "points", "timestamp", "reverses_id",
+            "attacking_team__name", "player__first_name", "player__last_name",
+        )
     }
 
+    def event_data(event):
+        if event is None:
+            return None
+        return {
+            "id": event["id"],
+            "sequence": event["sequence"],
+            "event_type": event["event_type"],
+            "reverses": event["reverses_id"],
+            "points": event["points"],
+            "team": event["attacking_team__name"],
+            "player": (
+                f"{event['player__first_name']} {event['player__last_name']}"
+                if event["player__first_name"] is not None else None
+            ),
+            "time": event["timestamp"],
+        }
 
+    return {
+        "tournament_id": tournament_id,
+        "matches": [
+            {
+                "match_id": m["id"],
+                "match_number": m["match_number"],
+                "venue": m["venue"],
+                "status": m["status"],
+                "team_a": m["team_a__name"],
+                "team_b": m["team_b__name"],
+                "team_a_score": m["score__team_a_score"] or 0,
+                "team_b_score": m["score__team_b_score"] or 0,
+                "turn": m["score__turn"] or 1,
+                "duration": m["tournament__max_time_per_turn"],
+                "clock_elapsed_seconds": m["clock_elapsed_seconds"],
+                "clock_running_since": m["clock_running_since"],
+                "last_event": event_data(events.get(m["last_event_id"])),
+            }
+            for m in matches
+        ],
+    }
+
+
+def get_tournament_ticker(tournament_id):
+    """
+    get_tournament_ticker_base, shared by all readers of this worker for
+    LIVE_TICKER_TIMEOUT seconds. Remaining times are worked out per read.
+    """
+
+    ticker = live_cache.get_or_compute_shared(
+        live_cache.TICKER,
+        live_cache.ticker_key(tournament_id),
+        lambda: get_tournament_ticker_base(tournament_id),
+        live_cache.ticker_timeout()
+    )
+
+    if ticker is None:
+        return None
+
+    now = timezone.now()
+
+    return {
+        **ticker,
+        "matches": [with_remaining_time(m, now) for m in ticker["matches"]],
+    }
 
 
 def pause_match(match):
     if match.status != 'LIVE':
             raise ValidationError("Only LIVE match can be paused")
     match.status = 'PAUSED'
-    match.save()
+    match.stop_clock(timezone.now())
+    match.save(update_fields=CLOCK_FIELDS + ["status"])
+    status_changed(match)
     return match
 
 
@@ -98,10 +318,33 @@ def resume_match(match):
         raise ValidationError("Only PAUSED match can be resumed")
 
     match.status = 'LIVE'
-    match.save()
+    match.start_clock(timezone.now())
+    match.save(update_fields=["status", "clock_running_since"])
+    status_changed(match)
     return match
 
 
+@transaction.atomic
+def next_turn(match):
+    """
+    Hand the chase to the other team. The clock starts over, each turn
+    gets the tournament's max_time_per_turn.
+    """
+
+    if match.status not in ("LIVE", "PAUSED"):
+        raise ValidationError("Only LIVE or PAUSED match can change turns")
+
+    turn = start_next_turn(match)
+
+    match.clock_elapsed_seconds = 0
+    if match.clock_running_since is not None:
+        match.clock_running_since = timezone.now()
+    match.save(update_fields=CLOCK_FIELDS)
+
+    status_changed(match, turn=turn)
+    return turn
+
+
 def get_tournament_standings(tournament):
 
     teams = Team.objects.filter(tournament=tournament)
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from common.broker import get_broker
+from scoring.services import get_cached_scoreboard
+from .models import Match
+
+
+KEEPALIVE_SECONDS = 15
+
+
+def sse_message(event, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def authenticate_stream(request):
+    """
+    Validate the JWT from the Authorization header, or from ?token=
+    since browser EventSource cannot send headers.
+    Only the token signature and expiry are checked, no database access.
+    """
+    auth = JWTAuthentication()
+
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+
+    if raw_token is None:
+        raw_token = request.GET.get("token")
+
+    if not raw_token:
+        return False
+
+    try:
+        auth.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return False
+
+    return True
+
+
+class MatchEventStream:
+    """
+    Async iterable of SSE messages for one match subscriber.
+    Django calls close() when the response finishes or the client
+    disconnects, which releases the broker subscription.
+    """
+
+    def __init__(self, match):
+        self.match = match
+        # Subscribe before reading the scoreboard so no delta is missed
+        self.subscription = get_broker().subscribe(match.id)
+
+    def __aiter__(self):
+        return self.events()
+
+    async def events(self):
+        try:
+            scoreboard = await sync_to_async(get_cached_scoreboard)(self.match)
+            yield sse_message("scoreboard", {
+                "match_id": self.match.id,
+                "status": self.match.status,
+                **scoreboard,
+            })
+
+            while True:
+                try:
+                    message = await self.subscription.get(
+                        timeout=KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if message is None:
+                    break
+
+                yield sse_message(message["type"], message)
+        finally:
+            self.subscription.close()
+
+    def close(self):
+        self.subscription.close()
+
+
+async def match_event_stream(request, match_id):
+    """
+    Server-sent events stream of a match.
+
+    Sends the current scoreboard first, then every score delta and
+    status change (start, pause, resume, end) as it is committed.
+    Needs an ASGI server (backend.asgi:application): a WSGI worker would
+    buffer the endless stream, hang and never send a byte, so WSGI
+    requests are turned away.
+    """
+
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"error": "Live streams are only served over ASGI (backend.asgi)"},
+            status=501
+        )
+
+    if not authenticate_stream(request):
+        return JsonResponse(
+            {"error": "Authentication credentials were not provided."},
+            status=401
+        )
+
+    match = await Match.objects.filter(id=match_id).afirst()
+
+    if match is None:
+        return JsonResponse({"error": "Match not found"}, status=404)
+
+    response = StreamingHttpResponse(
+        MatchEventStream(match),
+        content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
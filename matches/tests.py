@@ -1,3 +1,371 @@
-from django.test import TestCase
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import AsyncClient, Client, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from common.broker import LocalBroker
+from common.cache import engine_version_key, get_cache
+from scoring.services import create_score_event, reverse_score_event
+from scoring.tests import create_live_match
+from users.models import User
+from .engines import get_engine_registry, get_live_engine
+from .models import Match, MatchOfficial
+from .services import (
+    end_match,
+    get_match_state,
+    get_tournament_ticker,
+    next_turn,
+    pause_match,
+    resume_match,
+    start_match,
+)
+
+
+class LocalBrokerTests(SimpleTestCase):
+
+    def test_messages_arrive_in_order(self):
+        broker = LocalBroker()
+
+        async def run():
+            subscription = broker.subscribe(1)
+            other = broker.subscribe(2)
+
+            for number in range(3):
+                broker.publish(1, {"n": number})
+
+            received = [await subscription.get(timeout=1) for _ in range(3)]
+            self.assertTrue(other.queue.empty())
+
+            subscription.close()
+            other.close()
+            return received
+
+        received = asyncio.run(run())
+
+        self.assertEqual([message["n"] for message in received], [0, 1, 2])
+        self.assertEqual(broker.subscriber_count(1), 0)
+
+    def test_slow_subscriber_is_dropped(self):
+        broker = LocalBroker(max_queue_size=2)
+
+        async def run():
+            subscription = broker.subscribe(1)
+            for number in range(3):
+                broker.publish(1, {"n": number})
+            await asyncio.sleep(0)
+            return subscription
+
+        subscription = asyncio.run(run())
+
+        self.assertTrue(subscription.closed)
+        self.assertEqual(broker.subscriber_count(1), 0)
+
+    def test_fan_out_to_thousands_of_subscribers(self):
+        """
+        Load test: one worker loop, 5000 subscribers on one match,
+        messages published from another thread like a sync view would.
+        """
+        broker = LocalBroker()
+        subscribers = 5000
+        messages = 20
+
+        async def run():
+            subscriptions = [broker.subscribe(1) for _ in range(subscribers)]
+
+            started = time.perf_counter()
+            publisher = threading.Thread(target=lambda: [
+                broker.publish(1, {"n": number}) for number in range(messages)
+            ])
+            publisher.start()
+
+            async def drain(subscription):
+                for _ in range(messages):
+                    await subscription.get(timeout=10)
+
+            await asyncio.gather(*(drain(s) for s in subscriptions))
+            elapsed = time.perf_counter() - started
+
+            publisher.join()
+            for subscription in subscriptions:
+                subscription.close()
+            return elapsed
+
+        elapsed = asyncio.run(run())
+        self.assertLess(elapsed, 10)
+        self.assertEqual(broker.subscriber_count(1), 0)
+
+    def test_stream_is_only_served_over_asgi(self):
+        url = "/api/live/1/stream/"
+
+        # WSGI would buffer the endless stream and pin the worker
+        self.assertEqual(Client().get(url).status_code, 501)
+
+        async def asgi_get():
+            return await AsyncClient().get(url)
+
+        self.assertEqual(asyncio.run(asgi_get()).status_code, 401)
+
+
+class MatchClockTests(TestCase):
+
+    def setUp(self):
+        get_cache().clear()
+        get_engine_registry().clear()
+        self.match, _, self.user = create_live_match()
+        self.started_at = self.match.started_at
+
+    def at(self, seconds):
+        return mock.patch(
+            "django.utils.timezone.now",
+            return_value=self.started_at + timedelta(seconds=seconds)
+        )
+
+    def test_paused_time_is_not_counted(self):
+        self.match.tournament.max_time_per_turn = 420
+
+        with self.at(100):
+            pause_match(self.match)
+        with self.at(400):
+            self.assertEqual(get_match_state(self.match)["remaining_time"], 320)
+            resume_match(self.match)
+        with self.at(450):
+            state = get_match_state(self.match)
+        self.assertEqual((state["elapsed_time"], state["remaining_time"]), (150, 270))
+
+        with self.at(500):
+            end_match(self.match)
+        self.match.refresh_from_db()
+        self.assertEqual(self.match.clock_elapsed_seconds, 200)
+        self.assertIsNone(self.match.clock_running_since)
+
+    def test_warm_state_reads_no_database(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = f"/api/state/{self.match.id}/"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            pause_match(self.match)
+
+        with self.assertNumQueries(0):
+            response = client.get(url)
+        self.assertEqual(response.data["status"], "PAUSED")
+        self.assertEqual(
+            response.data["remaining_time"],
+            get_match_state(self.match)["remaining_time"]
+        )
+
+
+@override_settings(SCORE_AUDIT_SYNC=True, MATCH_SNAPSHOT_INTERVAL=4)
+class LiveEngineTests(TestCase):
+
+    def setUp(self):
+        get_cache().clear()
+        get_engine_registry().clear()
+        self.match, self.teams, self.user = create_live_match()
+
+    def score(self, event_type="TOUCH"):
+        return create_score_event(
+            match=self.match,
+            event_type=event_type,
+            user=self.user,
+            attacking_team=self.teams[0],
+            defending_team=self.teams[1],
+            player=self.teams[0].players.first(),
+        )
+
+    def test_fed_engine_matches_a_rebuilt_one(self):
+        engine = get_live_engine(self.match.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            outs = [self.score("OUT") for _ in range(9)]
+            next_turn(self.match)
+            self.score()
+            self.score("OUT")
+            reverse_score_event(match=self.match, event_id=outs[0].id, user=self.user)
+            pause_match(self.match)
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_live_engine(self.match.id), engine)
+        fed = engine.get_state()
+        # nine outs and their ALL_OUT, two events of turn 2, the correction
+        self.assertEqual(fed["sequence"], 13)
+        self.assertEqual(fed["outs"][self.teams[1].id], 9)
+        self.assertEqual((fed["turn"], fed["active_batch"], fed["batch_outs"]), (2, 1, 1))
+        self.assertEqual(fed["status"], "PAUSED")
+        self.assertEqual(engine.turn_scores[1]["outs"], 8)
+
+        # Worker restart: snapshot at event 12, then 1 more event
+        get_engine_registry().clear()
+        # match, players, snapshot, tail, turn scores, recent events
+        with self.assertNumQueries(6):
+            rebuilt = get_live_engine(self.match.id)
+        self.assertEqual(rebuilt.get_state(), fed)
+        self.assertEqual(rebuilt.turn_scores, engine.turn_scores)
+        self.assertEqual(list(rebuilt.recent_events), list(engine.recent_events))
+
+    def test_write_of_another_worker_is_caught_up(self):
+        engine = get_live_engine(self.match.id)
+
+        # Committed elsewhere: the database and the shared version move,
+        # this process' engine is not fed
+        self.score()
+        get_cache().incr(engine_version_key(self.match.id))
+
+        # match row, new events
+        with self.assertNumQueries(2):
+            self.assertIs(get_live_engine(self.match.id), engine)
+        self.assertEqual(engine.sequence, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            end_match(self.match)
+        self.assertIsNone(get_engine_registry().get(self.match.id))
+
+    def test_result_entered_by_hand_completes_the_live_match(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.score()
+        self.assertEqual(client.get(f"/api/live/{self.match.id}/").data["status"], "LIVE")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post("/api/match-results/", {
+                "match": self.match.id,
+                "team_a_score": 1,
+                "team_b_score": 0,
+                "winner": self.teams[0].id,
+            })
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(get_engine_registry().get(self.match.id))
+
+        live = client.get(f"/api/live/{self.match.id}/").data
+        self.assertEqual((live["status"], live["result"]["winner"]), ("COMPLETED", self.teams[0].name))
+
+        state = client.get(f"/api/state/{self.match.id}/").data
+        self.assertEqual(state["status"], "COMPLETED")
+        self.assertIsNone(state["clock_running_since"])
+        self.assertTrue(self.match.snapshots.filter(is_final=True).exists())
+
+        # a corrected result is served straight away, not as a 304
+        etag = client.get(f"/api/live/{self.match.id}/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.put(f"/api/match-results/{response.data['id']}/", {
+                "match": self.match.id,
+                "team_a_score": 0,
+                "team_b_score": 1,
+                "winner": self.teams[1].id,
+            })
+        self.assertEqual(response.status_code, 200)
+
+        response = client.get(f"/api/live/{self.match.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["result"]["winner"], self.teams[1].name)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class OfficialRoleTests(TestCase):
+
+    def setUp(self):
+        get_cache().clear()
+        self.match, self.teams, _ = create_live_match()
+        self.official = User.objects.create(username="second-umpire", role="official")
+        self.client = APIClient()
+        self.client.force_authenticate(self.official)
+
+    def test_role_changes_count_straight_away(self):
+        pause = f"/api/pause/{self.match.id}/"
+        resume = f"/api/resume/{self.match.id}/"
+
+        # not an official yet: the refusal is not remembered
+        self.assertEqual(self.client.post(pause).status_code, 403)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment = MatchOfficial.objects.create(
+                match=self.match, user=self.official, role="UMPIRE"
+            )
+        self.assertEqual(self.client.post(pause).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.delete()
+        self.assertEqual(self.client.post(resume).status_code, 403)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class TournamentTickerTests(TestCase):
+
+    def setUp(self):
+        get_cache().clear()
+        get_engine_registry().clear()
+        self.match, self.teams, self.user = create_live_match()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_match(self, number, live=True):
+        match = Match.objects.create(
+            tournament=self.match.tournament,
+            team_a=self.teams[1],
+            team_b=self.teams[0],
+            match_number=number,
+            venue=f"Ground {number}",
+            match_date=self.match.match_date + timedelta(days=number),
+        )
+        MatchOfficial.objects.create(match=match, user=self.user, role="UMPIRE")
+        if live:
+            start_match(match)
+        return match
+
+    def test_all_running_matches_in_constant_queries(self):
+        url = f"/api/live/tournament/{self.match.tournament_id}/"
+        second = self.add_match(2)
+        self.add_match(3, live=False)
+        pause_match(second)
+
+        for event_type in ["TOUCH", "OUT"]:
+            create_score_event(
+                match=self.match,
+                event_type=event_type,
+                user=self.user,
+                attacking_team=self.teams[0],
+                defending_team=self.teams[1],
+                player=self.teams[0].players.first(),
+            )
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+
+        self.assertEqual(
+            [(m["match_id"], m["status"], m["team_a_score"]) for m in response.data["matches"]],
+            [(self.match.id, "LIVE", 2), (second.id, "PAUSED", 0)]
+        )
+        first, paused = response.data["matches"]
+        self.assertEqual(first["last_event"]["event_type"], "OUT")
+        self.assertIsNone(paused["last_event"])
+        self.assertEqual(paused["remaining_time"], get_match_state(second)["remaining_time"])
+
+        # shared until it expires
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        self.assertEqual(self.client.get("/api/live/tournament/0/").status_code, 404)
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def slow_ticker(tournament_id):
+            calls.append(tournament_id)
+            time.sleep(0.05)
+            return {"tournament_id": tournament_id, "matches": []}
+
+        with mock.patch("matches.services.get_tournament_ticker_base", slow_ticker):
+            threads = [
+                threading.Thread(target=get_tournament_ticker, args=(99,))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(calls, [99])
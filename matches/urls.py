@@ -8,10 +8,13 @@ from .views import (
     MatchStateAPI,
     PauseMatchAPI,
     ResumeMatchAPI,
+    NextTurnAPI,
     LiveMatchAPI,
+    TournamentLiveTickerAPI,
     AssignOfficialAPI,
     AssignMatchPlayerAPI
 )
+from .streaming import match_event_stream
 
 router = DefaultRouter()
 router.register(r'match-results', MatchResultViewSet)
@@ -20,9 +23,12 @@ urlpatterns = [
     path("start/<int:match_id>/", StartMatchAPI.as_view()),
     path("pause/<int:match_id>/", PauseMatchAPI.as_view()),
     path("resume/<int:match_id>/", ResumeMatchAPI.as_view()),
+    path("next-turn/<int:match_id>/", NextTurnAPI.as_view()),
     path("end/<int:match_id>/", EndMatchAPI.as_view()),
     path("state/<int:match_id>/", MatchStateAPI.as_view()),
     path("live/<int:match_id>/", LiveMatchAPI.as_view()),
+    path("live/<int:match_id>/stream/", match_event_stream),
+    path("live/tournament/<int:tournament_id>/", TournamentLiveTickerAPI.as_view()),
     path("assign-official/", AssignOfficialAPI.as_view()),
     path("assign-player/", AssignMatchPlayerAPI.as_view()),
     path('', include(router.urls)),
@@ -1,5 +1,4 @@
-from re import match
-from time import timezone
+from django.db import transaction
 
 from django.db.models import Q, Sum, Count, Case, When, IntegerField
 from teams.models import Team
@@ -14,10 +13,11 @@ from django.core.exceptions import ValidationError
 
 from .models import Match
 from .services import start_match
-from .services import end_match
-from .services import get_match_state
-from .services import pause_match, resume_match
-from scoring.services import get_match_scoreboard
+from .services import complete_match, end_match, status_changed
+from .services import get_cached_match_state, get_tournament_ticker
+from .engines import ENGINE_STATUS, get_live_engine, live_match_state, live_scoreboard
+from .services import next_turn, pause_match, resume_match
+from scoring.services import get_cached_scoreboard
 
 from .models import Match, MatchResult
 from .serializers import MatchResultSerializer
@@ -33,12 +33,13 @@ from common.permissions import (
     IsMatchOfficialOrAdmin,
     IsMatchOfficialWithRole
 )
+from common.responses import etag_matches, match_etag, not_modified_response
 
 
 
 class StartMatchAPI(APIView):
     permission_classes = [IsAuthenticated, IsMatchOfficialWithRole]
-    IsMatchOfficialWithRole.allowed_roles = ["UMPIRE"]
+    official_roles = ["UMPIRE"]
 
 
     def post(self, request, match_id):
@@ -65,7 +66,7 @@ class StartMatchAPI(APIView):
 
 class EndMatchAPI(APIView):
     permission_classes = [IsAuthenticated, IsMatchOfficialWithRole]
-    IsMatchOfficialWithRole.allowed_roles = ["UMPIRE"]
+    official_roles = ["UMPIRE"]
 
 
     def post(self, request, match_id):
@@ -93,21 +94,26 @@ class MatchStateAPI(APIView):
     permission_classes = [IsAuthenticated, IsMatchOfficialOrAdmin]
 
     def get(self, request, match_id):
-        try:
-            match = Match.objects.get(id=match_id)
-            state = get_match_state(match)
-        except Match.DoesNotExist:
+        state = get_cached_match_state(match_id)
+
+        if state is None:
             return Response(
                 {"error": "Match not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        # Running matches are served by their live engine
+        if state["status"] in ENGINE_STATUS:
+            engine = get_live_engine(match_id)
+            if engine is not None:
+                state = live_match_state(engine)
+
         return Response(state, status=status.HTTP_200_OK)
 
 
 class PauseMatchAPI(APIView):
     permission_classes = [IsAuthenticated, IsMatchOfficialWithRole]
-    IsMatchOfficialWithRole.allowed_roles = ["UMPIRE"]
+    official_roles = ["UMPIRE"]
 
     def post(self, request, match_id):
         try:
@@ -122,7 +128,7 @@ class PauseMatchAPI(APIView):
 
 class ResumeMatchAPI(APIView):
     permission_classes = [IsAuthenticated, IsMatchOfficialWithRole]
-    IsMatchOfficialWithRole.allowed_roles = ["UMPIRE"]
+    official_roles = ["UMPIRE"]
 
     def post(self, request, match_id):
         try:
@@ -135,14 +141,54 @@ class ResumeMatchAPI(APIView):
             return Response({"error": str(e)}, status=400)
 
 
+class NextTurnAPI(APIView):
+    permission_classes = [IsAuthenticated, IsMatchOfficialWithRole]
+    official_roles = ["UMPIRE"]
+
+    def post(self, request, match_id):
+        try:
+            match = Match.objects.get(id=match_id)
+            turn = next_turn(match)
+            return Response({"message": "Turn started", "turn": turn}, status=200)
+        except Match.DoesNotExist:
+            return Response({"error": "Match not found"}, status=404)
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=400)
+
+
 class LiveMatchAPI(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, match_id):
+        # Running matches: straight from the live engine, no queries
+        state = get_cached_match_state(match_id)
+        engine = None
+
+        if state is not None and state["status"] in ENGINE_STATUS:
+            engine = get_live_engine(match_id)
+
+        if engine is not None:
+            etag = match_etag(match_id, engine.version)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
+            return Response({
+                "match_id": engine.match_id,
+                **live_scoreboard(engine),
+                "result": None,
+            }, headers={"ETag": etag})
+
         try:
-            match = Match.objects.get(id=match_id)
+            match = Match.objects.select_related(
+                "team_a", "team_b", "result__winner"
+            ).get(id=match_id)
 
-            scoreboard = get_match_scoreboard(match)
+            # Unchanged since the client's last poll
+            etag = match_etag(match.id, match.version)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
+            scoreboard = get_cached_scoreboard(match)
             
             result_data = None
 
@@ -163,11 +209,26 @@ class LiveMatchAPI(APIView):
                 "team_b_score": scoreboard.get("team_b_score", 0),
                 "events": scoreboard.get("events", []),
                 "result": result_data,
-            })
+            }, headers={"ETag": etag})
 
         except Match.DoesNotExist:
             return Response({"error": "Match not found"}, status=404)
 
+class TournamentLiveTickerAPI(APIView):
+    """
+    Every LIVE or PAUSED match of a tournament in one response, for
+    match-day screens that would otherwise poll live/<id>/ per match.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, tournament_id):
+        ticker = get_tournament_ticker(tournament_id)
+
+        if ticker is None:
+            return Response({"error": "Tournament not found"}, status=404)
+
+        return Response(ticker)
+
 class AssignOfficialAPI(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -318,12 +379,26 @@ class MatchResultViewSet(viewsets.ModelViewSet):
         # Save result
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
 
-        # Update match status and ended_at
-        match.status = 'COMPLETED'
-        match.ended_at = timezone.now()
-        match.save()
+        with transaction.atomic():
+            self.perform_create(serializer)
+
+            # Same completion as end_match: clock, snapshot, live state
+            complete_match(match, serializer.instance)
 
         headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            result = serializer.save()
+
+            # A corrected result moves the version like any other change,
+            # so clients holding the old one do not get a 304
+            status_changed(
+                result.match,
+                team_a_score=result.team_a_score,
+                team_b_score=result.team_b_score,
+                winner_id=result.winner_id,
+                is_draw=result.is_draw
+            )
\ No newline at end of file
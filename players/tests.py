@@ -1,3 +1,80 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from scoring.services import create_score_event, reverse_score_event
+from scoring.tests import create_live_match
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class LeaderboardTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+        self.players = list(self.teams[0].players.order_by("jersey_number")[:3])
+        self.client = APIClient()
+
+    def score(self, player, event_type="TOUCH"):
+        return create_score_event(
+            match=self.match,
+            event_type=event_type,
+            user=self.user,
+            attacking_team=self.teams[0],
+            defending_team=self.teams[1],
+            player=player,
+        )
+
+    def leaderboard(self, **params):
+        return self.client.get("/api/players/leaderboard/", params)
+
+    def ranking(self, **params):
+        response = self.leaderboard(**params)
+        self.assertEqual(response.status_code, 200)
+        return [
+            (row["player_id"], row["points"])
+            for row in response.data["players"]
+        ]
+
+    def test_players_are_ranked_by_the_stat(self):
+        first, second, third = self.players
+        for player, touches in ((first, 1), (second, 3), (third, 2)):
+            for _ in range(touches):
+                self.score(player)
+        self.score(third, "BONUS")
+        self.score(third, "BONUS")
+
+        expected = [(third.id, 4), (second.id, 3), (first.id, 1)]
+        self.assertEqual(self.ranking(match_id=self.match.id), expected)
+        self.assertEqual(
+            self.ranking(tournament_id=self.match.tournament_id), expected
+        )
+
+        response = self.leaderboard(match_id=self.match.id, stat="touches", limit=1)
+        self.assertEqual(
+            [(row["player_id"], row["touches"]) for row in response.data["players"]],
+            [(second.id, 3)]
+        )
+
+    def test_corrections_update_the_leaderboard(self):
+        first, second, _ = self.players
+        self.score(first)
+        mistake = self.score(first)
+        self.score(second)
+        self.score(second)
+        self.score(second)
+
+        reverse_score_event(match=self.match, event_id=mistake.id, user=self.user)
+
+        expected = [(second.id, 3), (first.id, 1)]
+        self.assertEqual(self.ranking(match_id=self.match.id), expected)
+        self.assertEqual(
+            self.ranking(tournament_id=self.match.tournament_id), expected
+        )
+
+        response = self.leaderboard(match_id=self.match.id, stat="touches")
+        self.assertEqual(response.data["players"][1]["touches"], 1)
+
+    def test_bad_ids_are_rejected(self):
+        for params in ({"match_id": "abc"}, {"tournament_id": "1; drop"}):
+            response = self.leaderboard(**params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("error", response.data)
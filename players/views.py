@@ -5,6 +5,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Count
+from scoring.models import PlayerMatchStat, PlayerTournamentStat
+from scoring.stats import LEADERBOARD_STATS, get_leaderboard
 from .models import Player
 from .serializers import (
     PlayerListSerializer, PlayerDetailSerializer, PlayerCreateSerializer
@@ -31,7 +33,7 @@ class PlayerViewSet(viewsets.ModelViewSet):
 
     def get_permissions(self):
         """Custom permissions based on action"""
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'leaderboard']:
             permission_classes = [AllowAny]
         elif self.action == 'create':
             permission_classes = [IsAuthenticated]
@@ -106,4 +108,54 @@ class PlayerViewSet(viewsets.ModelViewSet):
             defenders=Count('id', filter=Q(role='DEFENDER')),
             all_rounders=Count('id', filter=Q(role='ALL_ROUNDER')),
         )
-        return Response(stats)
\ No newline at end of file
+        return Response(stats)
+
+    @action(detail=False, methods=['get'])
+    def leaderboard(self, request):
+        """Top players of a tournament (or a single match) by a stat"""
+        tournament_id = request.query_params.get('tournament_id')
+        match_id = request.query_params.get('match_id')
+        stat = request.query_params.get('stat', 'points')
+
+        if not tournament_id and not match_id:
+            return Response(
+                {'error': 'tournament_id or match_id is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            tournament_id = int(tournament_id) if tournament_id else None
+            match_id = int(match_id) if match_id else None
+        except ValueError:
+            return Response(
+                {'error': 'tournament_id and match_id must be numbers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if stat not in LEADERBOARD_STATS:
+            return Response(
+                {'error': f"stat must be one of {', '.join(LEADERBOARD_STATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), 100)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if match_id:
+            stats = PlayerMatchStat.objects.filter(match_id=match_id)
+        else:
+            stats = PlayerTournamentStat.objects.filter(
+                tournament_id=tournament_id
+            )
+
+        return Response({
+            'tournament_id': tournament_id,
+            'match_id': match_id,
+            'stat': stat,
+            'players': get_leaderboard(stats, stat, max(limit, 1)),
+        })
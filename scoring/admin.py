@@ -3,7 +3,10 @@ from .models import ScoreEvent
 from .models import ScoreAuditLog
 
 from django.contrib import admin
-from .models import ScoreEvent, ScoreAuditLog
+from .models import (
+    ArchivedMatchEvents, MatchScore, MatchSnapshot, PlayerMatchStat, PlayerTournamentStat,
+    ScoreEvent, ScoreAuditLog, TurnScore,
+)
 
 
 @admin.register(ScoreEvent)
@@ -16,6 +19,8 @@ class ScoreEventAdmin(admin.ModelAdmin):
         "defending_team",
         "player",
         "points",
+        "reverses",
+        "sequence",
         "timestamp",
     )
 
@@ -39,10 +44,59 @@ class ScoreEventAdmin(admin.ModelAdmin):
         obj.full_clean()  
         super().save_model(request, obj, form, change)
 
+    # Events are numbered and totalled by the scoring services only
+    def has_add_permission(self, request):
+        return False
+
+    # Deleting bypasses running totals and the audit trail,
+    # mistakes are fixed with scoring/undo/ instead
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 @admin.register(ScoreAuditLog)
 class ScoreAuditLogAdmin(admin.ModelAdmin):
-    list_display = ('match', 'user', 'points', 'created_at')
-    list_filter = ('match', 'user')
+    list_display = ('match', 'user', 'event_type', 'points', 'score_event_id', 'created_at')
+    list_filter = ('match', 'user', 'event_type')
     search_fields = ('user__username',)
-    readonly_fields = ('match', 'user', 'points', 'created_at')
+    readonly_fields = ('match', 'user', 'score_event_id', 'event_type', 'points', 'created_at')
     ordering = ('-created_at',)
+
+
+@admin.register(MatchScore)
+class MatchScoreAdmin(admin.ModelAdmin):
+    list_display = ('match', 'team_a_score', 'team_b_score', 'event_count', 'turn', 'batch', 'updated_at')
+    readonly_fields = ('match', 'team_a_score', 'team_b_score', 'event_count', 'turn', 'batch', 'batch_outs', 'updated_at')
+
+
+@admin.register(TurnScore)
+class TurnScoreAdmin(admin.ModelAdmin):
+    list_display = ('match', 'turn', 'team_a_points', 'team_b_points', 'outs', 'all_outs', 'event_count')
+    readonly_fields = ('match', 'turn', 'team_a_points', 'team_b_points', 'outs', 'all_outs', 'event_count')
+
+
+@admin.register(MatchSnapshot)
+class MatchSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('match', 'last_event_id', 'event_count', 'team_a_score', 'team_b_score', 'is_final', 'created_at')
+    list_filter = ('is_final',)
+    readonly_fields = ('match', 'last_event_id', 'event_count', 'team_a_score', 'team_b_score', 'player_tallies', 'team_outs', 'is_final', 'created_at')
+
+
+@admin.register(PlayerMatchStat)
+class PlayerMatchStatAdmin(admin.ModelAdmin):
+    list_display = ('player', 'match', 'touches', 'outs', 'bonuses', 'fouls', 'points')
+    list_filter = ('match',)
+    readonly_fields = ('player', 'match', 'touches', 'outs', 'bonuses', 'fouls', 'points', 'updated_at')
+
+
+@admin.register(PlayerTournamentStat)
+class PlayerTournamentStatAdmin(admin.ModelAdmin):
+    list_display = ('player', 'tournament', 'touches', 'outs', 'bonuses', 'fouls', 'points')
+    list_filter = ('tournament',)
+    readonly_fields = ('player', 'tournament', 'touches', 'outs', 'bonuses', 'fouls', 'points', 'updated_at')
+
+
+@admin.register(ArchivedMatchEvents)
+class ArchivedMatchEventsAdmin(admin.ModelAdmin):
+    list_display = ('match', 'event_count', 'last_event_id', 'archived_at')
+    exclude = ('data',)
+    readonly_fields = ('match', 'event_count', 'last_event_id', 'archived_at')
@@ -0,0 +1,155 @@
+import json
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from matches.models import Match
+from .models import ArchivedMatchEvents, MatchScore, ScoreEvent
+
+
+# Column order of an archived event row
+ARCHIVE_FIELDS = [
+    "id",
+    "event_type",
+    "points",
+    "attacking_team_id",
+    "defending_team_id",
+    "player_id",
+    "reverses_id",
+    "client_event_id",
+    "timestamp",
+    "sequence",
+    "turn",
+    "batch",
+]
+
+
+def archive_after_days():
+    return getattr(settings, "MATCH_ARCHIVE_AFTER_DAYS", 30)
+
+
+def pack_events(rows):
+    """
+    Compress event dicts (ARCHIVE_FIELDS) into a blob: a JSON list of
+    rows without keys, timestamps as epoch seconds.
+    """
+
+    packed = [
+        [
+            row["timestamp"].timestamp() if field == "timestamp" else row[field]
+            for field in ARCHIVE_FIELDS
+        ]
+        for row in rows
+    ]
+
+    return zlib.compress(
+        json.dumps(packed, separators=(",", ":")).encode(),
+        level=9
+    )
+
+
+def unpack_events(data):
+    """
+    Event dicts, in id order, from a blob made by pack_events.
+    """
+
+    rows = []
+
+    for packed in json.loads(zlib.decompress(bytes(data))):
+        row = dict(zip(ARCHIVE_FIELDS, packed))
+        # Archives packed before events were numbered / had turns
+        row.setdefault("sequence", None)
+        row.setdefault("turn", 1)
+        row.setdefault("batch", 1)
+        row["timestamp"] = datetime.fromtimestamp(
+            row["timestamp"], tz=dt_timezone.utc
+        )
+        rows.append(row)
+
+    return rows
+
+
+def get_archived_events(match):
+    """
+    Archived event dicts of a match, or None if it was never archived.
+    Live matches are never archived, so they cost no query.
+    """
+
+    if match.status != "COMPLETED":
+        return None
+
+    data = ArchivedMatchEvents.objects.filter(match=match).values_list(
+        "data", flat=True
+    ).first()
+
+    if data is None:
+        return None
+
+    return unpack_events(data)
+
+
+def archive_match(match):
+    """
+    Move the score events of a completed match into its archive record.
+    Returns the number of events archived.
+    """
+
+    if match.status != "COMPLETED":
+        raise ValueError("Only completed matches can be archived")
+
+    with transaction.atomic():
+
+        rows = list(
+            ScoreEvent.objects.filter(match=match).order_by("id").values(
+                *ARCHIVE_FIELDS
+            )
+        )
+
+        # Scoreboards of archived matches are read from running totals,
+        # make sure they exist before the history goes away
+        if not MatchScore.objects.filter(match=match).exists():
+            totals = {match.team_a_id: 0, match.team_b_id: 0}
+            for row in rows:
+                totals[row["attacking_team_id"]] += row["points"]
+
+            MatchScore.objects.create(
+                match=match,
+                team_a_score=totals[match.team_a_id],
+                team_b_score=totals[match.team_b_id],
+                event_count=len(rows)
+            )
+
+        ArchivedMatchEvents.objects.create(
+            match=match,
+            event_count=len(rows),
+            last_event_id=rows[-1]["id"] if rows else 0,
+            data=pack_events(rows)
+        )
+
+        ScoreEvent.objects.filter(match=match).delete()
+
+    return len(rows)
+
+
+def matches_to_archive(older_than_days=None):
+    """
+    Completed, not yet archived matches that ended more than
+    `older_than_days` days ago (MATCH_ARCHIVE_AFTER_DAYS by default).
+    """
+
+    if older_than_days is None:
+        older_than_days = archive_after_days()
+
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+
+    return Match.objects.filter(
+        status="COMPLETED",
+        event_archive__isnull=True
+    ).annotate(
+        finished=Coalesce(F("ended_at"), F("match_date"))
+    ).filter(finished__lt=cutoff).order_by("id")
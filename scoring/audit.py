@@ -0,0 +1,222 @@
+import atexit
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ScoreAuditLog
+
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """
+    Bounded in-process queue of ScoreAuditLog rows.
+
+    A background thread bulk inserts the queued rows once `batch_size`
+    of them are waiting or every `flush_interval` seconds. When the queue
+    is full the caller flushes it inline, so records are never dropped.
+
+    A batch that fails to insert is kept and retried with the next flush.
+    After `max_retries` failed attempts it is written row by row: rows
+    that cannot be stored on their own are logged and dropped, unless
+    none could be, in which case the database is down and all are kept.
+    """
+
+    def __init__(self, batch_size=200, flush_interval=1.0, max_queue_size=10000,
+                 max_retries=5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.queue = queue.Queue(maxsize=max_queue_size)
+
+        # Records of failed inserts, written first by the next flush
+        self._failed = []
+        self._attempts = 0
+
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run,
+            name="score-audit-writer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread and write whatever is still queued.
+        """
+        self._stopping.set()
+        self._wake.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+    def enqueue(self, records):
+        for record in records:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.flush()
+                try:
+                    self.queue.put_nowait(record)
+                except queue.Full:
+                    # Still full: the database is not taking writes
+                    with self._flush_lock:
+                        self._failed.append(record)
+
+        if self.queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Write every queued record now, and any kept from a failed flush.
+        Returns the number written.
+        """
+        with self._flush_lock:
+            records, self._failed = self._failed, []
+            while True:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not records:
+                return 0
+
+            try:
+                ScoreAuditLog.objects.bulk_create(
+                    records,
+                    batch_size=self.batch_size
+                )
+            except Exception:
+                self._attempts += 1
+
+                if self._attempts < self.max_retries:
+                    logger.warning(
+                        "Could not write %s score audit records, will retry",
+                        len(records), exc_info=True
+                    )
+                    self._failed = records
+                    return 0
+
+                return self._write_each(records)
+
+            self._attempts = 0
+            return len(records)
+
+    def _write_each(self, records):
+        failed = []
+
+        for record in records:
+            try:
+                with transaction.atomic():
+                    record.save(force_insert=True)
+            except Exception:
+                failed.append(record)
+
+        if len(failed) == len(records):
+            logger.error(
+                "Could not write %s score audit records, keeping them",
+                len(records)
+            )
+            self._failed = records
+            return 0
+
+        self._attempts = 0
+
+        for record in failed:
+            logger.error(
+                "Dropping score audit record that cannot be written: "
+                "match %s, event %s, %s %s",
+                record.match_id, record.score_event_id,
+                record.event_type, record.points
+            )
+
+        return len(records) - len(failed)
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self.flush()
+        finally:
+            connection.close()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer():
+    """
+    Process wide writer, started on first use and flushed at exit.
+    """
+    global _writer
+
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                writer = AuditWriter(
+                    batch_size=getattr(settings, "SCORE_AUDIT_BATCH_SIZE", 200),
+                    flush_interval=getattr(settings, "SCORE_AUDIT_FLUSH_INTERVAL", 1.0),
+                    max_queue_size=getattr(settings, "SCORE_AUDIT_QUEUE_SIZE", 10000)
+                )
+                writer.start()
+                atexit.register(writer.stop)
+                _writer = writer
+
+    return _writer
+
+
+def record_score_audit(user, events):
+    """
+    Audit stored score events.
+    Queued once the scoring transaction commits, or written straight
+    away when settings.SCORE_AUDIT_SYNC is on.
+    """
+
+    now = timezone.now()
+    records = [
+        ScoreAuditLog(
+            match_id=event.match_id,
+            user_id=user.pk if user is not None else None,
+            score_event_id=event.id,
+            event_type=event.event_type,
+            points=event.points,
+            created_at=now
+        )
+        for event in events
+    ]
+
+    if not records:
+        return
+
+    if getattr(settings, "SCORE_AUDIT_SYNC", False):
+        ScoreAuditLog.objects.bulk_create(records)
+        return
+
+    transaction.on_commit(lambda: get_audit_writer().enqueue(records))
+
+
+def flush_audit_log():
+    """
+    Write queued audit records now (no-op before the writer has started).
+    """
+
+    if _writer is not None:
+        return _writer.flush()
+    return 0
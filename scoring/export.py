@@ -0,0 +1,211 @@
+import csv
+import heapq
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+
+from players.models import Player
+from teams.models import Team
+from .archive import unpack_events
+from .models import ArchivedMatchEvents, ScoreEvent
+
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Output columns, in order
+EXPORT_COLUMNS = [
+    "match_id",
+    "match_number",
+    "event_id",
+    "sequence",
+    "turn",
+    "batch",
+    "time",
+    "event_type",
+    "points",
+    "attacking_team",
+    "defending_team",
+    "player_id",
+    "player",
+    "reverses",
+]
+
+
+def hot_event_rows(tournament_id, chunk_size):
+    """
+    Events still in ScoreEvent, names joined in, read through a
+    server-side cursor `chunk_size` rows at a time.
+    """
+
+    events = ScoreEvent.objects.filter(
+        match__tournament_id=tournament_id
+    ).order_by("match_id", "id").values(
+        "id",
+        "sequence",
+        "turn",
+        "batch",
+        "match_id",
+        "match__match_number",
+        "timestamp",
+        "event_type",
+        "points",
+        "attacking_team__name",
+        "defending_team__name",
+        "player_id",
+        "player__first_name",
+        "player__last_name",
+        "reverses_id",
+    )
+
+    for e in events.iterator(chunk_size=chunk_size):
+        yield {
+            "match_id": e["match_id"],
+            "match_number": e["match__match_number"],
+            "event_id": e["id"],
+            "sequence": e["sequence"],
+            "turn": e["turn"],
+            "batch": e["batch"],
+            "time": e["timestamp"],
+            "event_type": e["event_type"],
+            "points": e["points"],
+            "attacking_team": e["attacking_team__name"],
+            "defending_team": e["defending_team__name"],
+            "player_id": e["player_id"],
+            "player": (
+                f"{e['player__first_name']} {e['player__last_name']}"
+                if e["player__first_name"] is not None else None
+            ),
+            "reverses": e["reverses_id"],
+        }
+
+
+def archived_event_rows(tournament_id):
+    """
+    Events of archived matches, one archive decompressed at a time.
+    """
+
+    archives = list(
+        ArchivedMatchEvents.objects.filter(
+            match__tournament_id=tournament_id
+        ).order_by("match_id").values_list("id", "match_id", "match__match_number")
+    )
+
+    if not archives:
+        return
+
+    team_names = dict(
+        Team.objects.filter(tournament_id=tournament_id).order_by().values_list(
+            "id", "name"
+        )
+    )
+    player_names = {
+        p["id"]: f"{p['first_name']} {p['last_name']}"
+        for p in Player.objects.filter(team__tournament_id=tournament_id).values(
+            "id", "first_name", "last_name"
+        )
+    }
+
+    for archive_id, match_id, match_number in archives:
+        data = ArchivedMatchEvents.objects.values_list("data", flat=True).get(
+            id=archive_id
+        )
+
+        for e in unpack_events(data):
+            yield {
+                "match_id": match_id,
+                "match_number": match_number,
+                "event_id": e["id"],
+                "sequence": e["sequence"],
+                "turn": e["turn"],
+                "batch": e["batch"],
+                "time": e["timestamp"],
+                "event_type": e["event_type"],
+                "points": e["points"],
+                "attacking_team": team_names.get(e["attacking_team_id"]),
+                "defending_team": team_names.get(e["defending_team_id"]),
+                "player_id": e["player_id"],
+                "player": player_names.get(e["player_id"]),
+                "reverses": e["reverses_id"],
+            }
+
+
+def tournament_event_rows(tournament_id, chunk_size=2000):
+    """
+    Every score event of a tournament, hot and archived, ordered by
+    match then event id. Lazy: memory does not grow with the event count.
+    """
+
+    return heapq.merge(
+        hot_event_rows(tournament_id, chunk_size),
+        archived_event_rows(tournament_id),
+        key=lambda row: (row["match_id"], row["event_id"])
+    )
+
+
+class Echo:
+    """
+    File-like object for csv.writer that hands back each written line.
+    """
+
+    def write(self, value):
+        return value
+
+
+def render_ndjson(rows):
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def render_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        row["time"] = row["time"].isoformat()
+        yield writer.writerow([row[column] for column in EXPORT_COLUMNS])
+
+
+def render_events(rows, output):
+    if output == "csv":
+        return render_csv(rows)
+    return render_ndjson(rows)
+
+
+async def in_worker_thread(iterator, batch_size=500):
+    """
+    Serve a sync iterator asynchronously without buffering all of it:
+    pull `batch_size` items at a time in Django's sync thread, where the
+    iterator's database cursor lives.
+    """
+
+    iterator = iter(iterator)
+
+    def take():
+        return list(islice(iterator, batch_size))
+
+    try:
+        while True:
+            parts = await sync_to_async(take)()
+            if not parts:
+                break
+            yield "".join(parts)
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def streaming_content(request, iterator):
+    """
+    Streaming response content for `iterator` that stays lazy on both
+    WSGI and ASGI (which would otherwise read a sync iterator into a list).
+    """
+
+    if isinstance(request, ASGIRequest):
+        return in_worker_thread(iterator)
+    return iterator
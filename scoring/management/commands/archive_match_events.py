@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from scoring.archive import archive_match, matches_to_archive
+
+
+class Command(BaseCommand):
+    help = "Pack the score events of old completed matches into per-match archives"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Archive matches that ended more than this many days ago "
+                 "(default: settings.MATCH_ARCHIVE_AFTER_DAYS)"
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the matches that would be archived"
+        )
+
+    def handle(self, *args, **options):
+        matches = matches_to_archive(options["days"])
+
+        if options["dry_run"]:
+            for match in matches:
+                self.stdout.write(f"Would archive match {match.id}: {match}")
+            return
+
+        archived_matches = 0
+        archived_events = 0
+
+        for match in matches.iterator():
+            archived_events += archive_match(match)
+            archived_matches += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {archived_events} event(s) "
+                f"from {archived_matches} match(es)"
+            )
+        )
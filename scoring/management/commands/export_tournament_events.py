@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from scoring.export import EXPORT_FORMATS, render_events, tournament_event_rows
+from tournaments.models import Tournament
+
+
+class Command(BaseCommand):
+    help = "Export every score event of a tournament as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("tournament_id", type=int)
+        parser.add_argument(
+            "--output",
+            choices=list(EXPORT_FORMATS),
+            default="ndjson"
+        )
+        parser.add_argument(
+            "--file",
+            help="Write to this path instead of stdout"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows fetched per database round trip"
+        )
+
+    def handle(self, *args, **options):
+        tournament_id = options["tournament_id"]
+
+        if not Tournament.objects.filter(id=tournament_id).exists():
+            raise CommandError(f"Tournament {tournament_id} not found")
+
+        rows = tournament_event_rows(tournament_id, options["chunk_size"])
+        lines = render_events(rows, options["output"])
+
+        if options["file"]:
+            with open(options["file"], "w", newline="") as f:
+                f.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
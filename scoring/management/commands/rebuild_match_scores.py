@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from matches.models import Match
+from scoring.services import rebuild_match_scores
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-match running score totals and player stats from ScoreEvent history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "match_ids",
+            nargs="*",
+            type=int,
+            help="Only rebuild these matches (default: all matches)"
+        )
+
+    def handle(self, *args, **options):
+        matches = Match.objects.all()
+
+        if options["match_ids"]:
+            matches = matches.filter(id__in=options["match_ids"])
+
+        rebuilt = rebuild_match_scores(matches.iterator())
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt scores for {rebuilt} match(es)")
+        )
@@ -0,0 +1,85 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from scoring.audit import flush_audit_log
+from scoring.simulation import (
+    SIMULATION_MODES,
+    create_simulated_matches,
+    run_simulation,
+)
+
+
+LOCAL_HOSTS = ["", "localhost", "127.0.0.1", "::1"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Play synthetic matches against the local database and report scoring "
+        "throughput, latency percentiles and queries per event. "
+        "SQLite allows one writer at a time, the audit writer included: "
+        "expect some 'database is locked' errors there."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--matches", type=int, default=4)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Matches played at the same time, one thread each"
+        )
+        parser.add_argument(
+            "--mode",
+            choices=SIMULATION_MODES,
+            default="service",
+            help="service: call create_score_event, http: POST through the test client"
+        )
+        parser.add_argument(
+            "--turn-seconds",
+            type=int,
+            default=540,
+            help="Simulated length of a turn (more seconds, more events)"
+        )
+        parser.add_argument("--seed", type=int, help="Repeatable plays")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the simulated tournament instead of deleting it"
+        )
+
+    def handle(self, *args, **options):
+        host = connection.settings_dict.get("HOST") or ""
+
+        if host not in LOCAL_HOSTS:
+            raise CommandError(f"Refusing to simulate against database host {host!r}")
+
+        if options["matches"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--matches and --concurrency must be at least 1")
+
+        tournament, matches, umpire = create_simulated_matches(
+            options["matches"], turn_seconds=options["turn_seconds"]
+        )
+
+        try:
+            report = run_simulation(
+                matches,
+                umpire,
+                mode=options["mode"],
+                concurrency=options["concurrency"],
+                turn_seconds=options["turn_seconds"],
+                seed=options["seed"],
+            )
+        finally:
+            if not options["keep"]:
+                flush_audit_log()
+                tournament.delete()
+                umpire.delete()
+
+        self.stdout.write(json.dumps(report, indent=2))
+
+        if report["errors"]:
+            self.stdout.write(self.style.WARNING(f"{report['errors']} submission(s) failed"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Simulated {len(matches)} match(es)"))
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0004_match_round_number'),
+        ('scoring', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team_a_score', models.IntegerField(default=0)),
+                ('team_b_score', models.IntegerField(default=0)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('match', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='score', to='matches.match')),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0004_match_round_number'),
+        ('players', '0001_initial'),
+        ('scoring', '0003_matchscore'),
+        ('teams', '0002_alter_team_options_team_captain_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scoreevent',
+            name='client_event_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='scoreevent',
+            constraint=models.UniqueConstraint(fields=('match', 'client_event_id'), name='unique_client_event_per_match'),
+        ),
+    ]
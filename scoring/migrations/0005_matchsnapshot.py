@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-18 11:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_match_version'),
+        ('scoring', '0004_scoreevent_client_event_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_event_id', models.PositiveBigIntegerField(default=0)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('team_a_score', models.IntegerField(default=0)),
+                ('team_b_score', models.IntegerField(default=0)),
+                ('player_tallies', models.JSONField(default=dict)),
+                ('is_final', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='matches.match')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['match', '-last_event_id'], name='scoring_mat_match_i_db5e1d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoring', '0005_matchsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scoreevent',
+            name='reverses',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reversal', to='scoring.scoreevent'),
+        ),
+        migrations.AlterField(
+            model_name='scoreevent',
+            name='points',
+            field=models.IntegerField(default=0),
+        ),
+    ]
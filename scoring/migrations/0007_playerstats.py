@@ -0,0 +1,53 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_match_version'),
+        ('players', '0001_initial'),
+        ('scoring', '0006_scoreevent_reverses'),
+        ('tournaments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerMatchStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('touches', models.IntegerField(default=0)),
+                ('outs', models.IntegerField(default=0)),
+                ('bonuses', models.IntegerField(default=0)),
+                ('fouls', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='matches.match')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_stats', to='players.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['match', '-touches', 'player'], name='pms_touches_idx'), models.Index(fields=['match', '-outs', 'player'], name='pms_outs_idx'), models.Index(fields=['match', '-bonuses', 'player'], name='pms_bonuses_idx'), models.Index(fields=['match', '-fouls', 'player'], name='pms_fouls_idx'), models.Index(fields=['match', '-points', 'player'], name='pms_points_idx')],
+                'constraints': [models.UniqueConstraint(fields=('match', 'player'), name='unique_player_match_stat')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlayerTournamentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('touches', models.IntegerField(default=0)),
+                ('outs', models.IntegerField(default=0)),
+                ('bonuses', models.IntegerField(default=0)),
+                ('fouls', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tournament_stats', to='players.player')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='tournaments.tournament')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tournament', '-touches', 'player'], name='pts_touches_idx'), models.Index(fields=['tournament', '-outs', 'player'], name='pts_outs_idx'), models.Index(fields=['tournament', '-bonuses', 'player'], name='pts_bonuses_idx'), models.Index(fields=['tournament', '-fouls', 'player'], name='pts_fouls_idx'), models.Index(fields=['tournament', '-points', 'player'], name='pts_points_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tournament', 'player'), name='unique_player_tournament_stat')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoring', '0007_playerstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scoreauditlog',
+            name='event_type',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='scoreauditlog',
+            name='score_event',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_logs', to='scoring.scoreevent'),
+        ),
+        migrations.AlterField(
+            model_name='scoreauditlog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
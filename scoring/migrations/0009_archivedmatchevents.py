@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_match_version'),
+        ('scoring', '0008_scoreauditlog_event'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scoreauditlog',
+            name='score_event',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='audit_logs', to='scoring.scoreevent'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedMatchEvents',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('last_event_id', models.PositiveBigIntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('match', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='event_archive', to='matches.match')),
+            ],
+        ),
+    ]
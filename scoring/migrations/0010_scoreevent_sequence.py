@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:08
+
+from django.db import migrations, models
+
+
+def number_existing_events(apps, schema_editor):
+    ScoreEvent = apps.get_model('scoring', 'ScoreEvent')
+
+    match_ids = ScoreEvent.objects.values_list('match_id', flat=True).distinct()
+
+    for match_id in match_ids.iterator():
+        events = list(
+            ScoreEvent.objects.filter(match_id=match_id).order_by('id').only('id')
+        )
+        for sequence, event in enumerate(events, start=1):
+            event.sequence = sequence
+        ScoreEvent.objects.bulk_update(events, ['sequence'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_match_version'),
+        ('players', '0001_initial'),
+        ('scoring', '0009_archivedmatchevents'),
+        ('teams', '0002_alter_team_options_team_captain_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scoreevent',
+            name='sequence',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(number_existing_events, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='scoreevent',
+            name='sequence',
+            field=models.PositiveIntegerField(editable=False),
+        ),
+        migrations.AddConstraint(
+            model_name='scoreevent',
+            constraint=models.UniqueConstraint(fields=('match', 'sequence'), name='unique_sequence_per_match'),
+        ),
+    ]
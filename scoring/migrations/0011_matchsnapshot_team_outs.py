@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scoring', '0010_scoreevent_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchsnapshot',
+            name='team_outs',
+            field=models.JSONField(default=dict),
+        ),
+    ]
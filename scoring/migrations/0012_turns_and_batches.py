@@ -0,0 +1,56 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0006_match_clock'),
+        ('scoring', '0011_matchsnapshot_team_outs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchscore',
+            name='batch',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='matchscore',
+            name='batch_outs',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='matchscore',
+            name='turn',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='scoreevent',
+            name='batch',
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='scoreevent',
+            name='turn',
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.CreateModel(
+            name='TurnScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('turn', models.PositiveSmallIntegerField()),
+                ('team_a_points', models.IntegerField(default=0)),
+                ('team_b_points', models.IntegerField(default=0)),
+                ('outs', models.IntegerField(default=0)),
+                ('all_outs', models.IntegerField(default=0)),
+                ('event_count', models.IntegerField(default=0)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turn_scores', to='matches.match')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('match', 'turn'), name='unique_turn_per_match')],
+            },
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:02
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+from game_engine.match_state import batch_after_correction, batch_after_out
+
+
+# event type -> player counter, as in scoring.stats
+STAT_FIELDS = {
+    "TOUCH": "touches",
+    "OUT": "outs",
+    "BONUS": "bonuses",
+    "FOUL": "fouls",
+}
+
+PLAYER_STATS = ["touches", "outs", "bonuses", "fouls", "points"]
+
+
+def backfill_match_scores(apps, schema_editor):
+    """
+    Matches scored before MatchScore was kept had no row, or a row started
+    at zero by their next event. Rebuild what rebuild_match_scores does
+    (running totals, turn splits, player stats) from their events.
+    """
+    Match = apps.get_model('matches', 'Match')
+    ScoreEvent = apps.get_model('scoring', 'ScoreEvent')
+    MatchScore = apps.get_model('scoring', 'MatchScore')
+    TurnScore = apps.get_model('scoring', 'TurnScore')
+    PlayerMatchStat = apps.get_model('scoring', 'PlayerMatchStat')
+    PlayerTournamentStat = apps.get_model('scoring', 'PlayerTournamentStat')
+
+    event_counts = dict(
+        ScoreEvent.objects.values('match_id').annotate(
+            count=Count('id')
+        ).values_list('match_id', 'count')
+    )
+    stored_counts = dict(MatchScore.objects.values_list('match_id', 'event_count'))
+
+    stale = [
+        match_id for match_id, count in event_counts.items()
+        if stored_counts.get(match_id) != count
+    ]
+
+    # tournament id -> players whose tournament stats need recomputing
+    players = defaultdict(set)
+
+    for match in Match.objects.filter(id__in=stale).iterator():
+        events = list(ScoreEvent.objects.filter(match=match).order_by('sequence'))
+
+        totals = defaultdict(int)
+        turns = defaultdict(lambda: defaultdict(int))
+        stats = defaultdict(lambda: defaultdict(int))
+
+        for event in events:
+            totals[event.attacking_team_id] += event.points
+            step = -1 if event.reverses_id else 1
+
+            split = turns[event.turn]
+            split['team_a_points' if event.attacking_team_id == match.team_a_id else 'team_b_points'] += event.points
+            split['event_count'] += 1
+            if event.event_type == 'OUT':
+                split['outs'] += step
+            elif event.event_type == 'ALL_OUT':
+                split['all_outs'] += step
+
+            if event.player_id is not None:
+                stat = stats[event.player_id]
+                stat['points'] += event.points
+                if event.event_type in STAT_FIELDS:
+                    stat[STAT_FIELDS[event.event_type]] += step
+
+        turn = max(turns, default=1)
+        batch, batch_outs = 1, 0
+        for event in events:
+            if event.turn != turn or event.event_type != 'OUT':
+                continue
+            if event.reverses_id:
+                batch, batch_outs = batch_after_correction(batch, batch_outs)
+            else:
+                batch, batch_outs, _ = batch_after_out(batch, batch_outs)
+
+        MatchScore.objects.update_or_create(
+            match=match,
+            defaults={
+                'team_a_score': totals[match.team_a_id],
+                'team_b_score': totals[match.team_b_id],
+                'event_count': len(events),
+                'turn': turn,
+                'batch': batch,
+                'batch_outs': batch_outs,
+            }
+        )
+
+        TurnScore.objects.filter(match=match).delete()
+        TurnScore.objects.bulk_create([
+            TurnScore(match=match, turn=number, **split)
+            for number, split in turns.items()
+        ])
+
+        players[match.tournament_id].update(
+            PlayerMatchStat.objects.filter(match=match).values_list('player_id', flat=True)
+        )
+        players[match.tournament_id].update(stats)
+
+        PlayerMatchStat.objects.filter(match=match).delete()
+        PlayerMatchStat.objects.bulk_create([
+            PlayerMatchStat(match=match, player_id=player_id, **stat)
+            for player_id, stat in stats.items()
+        ])
+
+    for tournament_id, player_ids in players.items():
+        PlayerTournamentStat.objects.filter(
+            tournament_id=tournament_id,
+            player_id__in=player_ids
+        ).delete()
+
+        PlayerTournamentStat.objects.bulk_create([
+            PlayerTournamentStat(
+                tournament_id=tournament_id,
+                player_id=row['player_id'],
+                **{stat: row[stat] for stat in PLAYER_STATS}
+            )
+            for row in PlayerMatchStat.objects.filter(
+                match__tournament_id=tournament_id,
+                player_id__in=player_ids
+            ).values('player_id').annotate(
+                **{stat: Sum(stat) for stat in PLAYER_STATS}
+            )
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0006_match_clock'),
+        ('scoring', '0012_turns_and_batches'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_match_scores, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,7 @@ from matches.models import Match
 from teams.models import Team
 from players.models import Player
 from django.conf import settings
+from django.utils import timezone
 
 
 
@@ -47,44 +48,327 @@ class ScoreEvent(models.Model):
         choices=EVENT_TYPE
     )
 
-    points = models.PositiveIntegerField(default=0)
+    # Negative for fouls and for corrections of positive events
+    points = models.IntegerField(default=0)
 
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    # 1, 2, 3, ... per match, assigned under the match's MatchScore lock
+    sequence = models.PositiveIntegerField(editable=False)
+
+    # Turn and defending batch the event happened in, taken from the
+    # MatchScore under the same lock. Corrections keep their original's.
+    turn = models.PositiveSmallIntegerField(default=1, editable=False)
+    batch = models.PositiveSmallIntegerField(default=1, editable=False)
+
+    # Set on a correction: the event this one cancels out
+    reverses = models.OneToOneField(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='reversal'
+    )
+
+    # Client generated key, lets scorer devices retry safely
+    client_event_id = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["match", "client_event_id"],
+                name="unique_client_event_per_match"
+            ),
+            models.UniqueConstraint(
+                fields=["match", "sequence"],
+                name="unique_sequence_per_match"
+            ),
+        ]
+
     # VALIDATION 
     def clean(self):
 
-        # 1 Match must be LIVE
-        if self.match.status != 'LIVE':
+        # 1 Match must be LIVE (corrections also while PAUSED)
+        allowed_status = ['LIVE', 'PAUSED'] if self.reverses_id else ['LIVE']
+        if self.match.status not in allowed_status:
             raise ValidationError("Scoring allowed only when match is LIVE.")
 
         # 2️ Attacking & Defending team must be different
-        if self.attacking_team == self.defending_team:
+        if self.attacking_team_id == self.defending_team_id:
             raise ValidationError("Attacking and Defending team cannot be same.")
 
-        # 3️ Teams must belong to match
-        valid_teams = [self.match.team_a, self.match.team_b]
-        if self.attacking_team not in valid_teams:
+        # 3️ Teams must belong to match (ids only, no team lookups)
+        valid_teams = [self.match.team_a_id, self.match.team_b_id]
+        if self.attacking_team_id not in valid_teams:
             raise ValidationError("Attacking team does not belong to this match.")
 
-        if self.defending_team not in valid_teams:
+        if self.defending_team_id not in valid_teams:
             raise ValidationError("Defending team does not belong to this match.")
 
         # 4️ Player must belong to attacking team (if provided)
-        if self.player and self.player.team != self.attacking_team:
+        if self.player and self.player.team_id != self.attacking_team_id:
             raise ValidationError("Player must belong to attacking team.")
 
-        # 5️ Points sanity check
-        if self.points < 0:
+        # 5️ Points sanity check (fouls and corrections may subtract)
+        if self.points < 0 and self.event_type != 'FOUL' and not self.reverses_id:
             raise ValidationError("Points cannot be negative.")
 
-    def save(self, *args, **kwargs):
-        self.full_clean()   # Forces clean() always
+    def save(self, *args, validate=True, **kwargs):
+        # The scoring services run clean() themselves and pass
+        # validate=False: full_clean() would add a query per foreign key
+        # and per unique constraint, which the database enforces anyway
+        if validate:
+            self.full_clean()   # Forces clean() always
         super().save(*args, **kwargs)
 
+    @property
+    def is_correction(self):
+        return self.reverses_id is not None
+
     def __str__(self):
         return f"{self.match} | {self.event_type} | {self.points}"
-    
+
+
+# ======================================
+# Running totals
+
+class MatchScore(models.Model):
+    """
+    Denormalized running totals for a match.
+    Updated by create_score_event in the same transaction as the event,
+    rebuilt from ScoreEvent history by `manage.py rebuild_match_scores`.
+    """
+
+    match = models.OneToOneField(
+        Match,
+        on_delete=models.CASCADE,
+        related_name='score'
+    )
+
+    team_a_score = models.IntegerField(default=0)
+    team_b_score = models.IntegerField(default=0)
+
+    # Also the sequence number of the match's latest event
+    event_count = models.PositiveIntegerField(default=0)
+
+    # Current turn, the defending batch on the field and its outs so far
+    turn = models.PositiveSmallIntegerField(default=1)
+    batch = models.PositiveSmallIntegerField(default=1)
+    batch_outs = models.PositiveSmallIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def add_points(self, match, team_id, points):
+        if team_id == match.team_a_id:
+            self.team_a_score += points
+        elif team_id == match.team_b_id:
+            self.team_b_score += points
+        self.event_count += 1
+
+    def __str__(self):
+        return f"{self.match} | {self.team_a_score} - {self.team_b_score}"
+
+
+# ======================================
+# Turn scores
+
+class TurnScore(models.Model):
+    """
+    Per-turn split of a match's score, updated by delta with every score
+    event, so a turn summary is a single row read.
+    """
+
+    match = models.ForeignKey(
+        Match,
+        on_delete=models.CASCADE,
+        related_name='turn_scores'
+    )
+
+    turn = models.PositiveSmallIntegerField()
+
+    team_a_points = models.IntegerField(default=0)
+    team_b_points = models.IntegerField(default=0)
+    outs = models.IntegerField(default=0)
+    all_outs = models.IntegerField(default=0)
+    event_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["match", "turn"],
+                name="unique_turn_per_match"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.match} | turn {self.turn} | {self.team_a_points} - {self.team_b_points}"
+
+
+# ======================================
+# Snapshots
+
+class MatchSnapshot(models.Model):
+    """
+    Derived state of a match up to and including `last_event_id`.
+    Taken every MATCH_SNAPSHOT_INTERVAL events and when the match ends,
+    so replays only read the events after the latest snapshot.
+    """
+
+    match = models.ForeignKey(
+        Match,
+        on_delete=models.CASCADE,
+        related_name='snapshots'
+    )
+
+    last_event_id = models.PositiveBigIntegerField(default=0)
+    event_count = models.PositiveIntegerField(default=0)
+
+    team_a_score = models.IntegerField(default=0)
+    team_b_score = models.IntegerField(default=0)
+
+    # {"<player id>": {"TOUCH": 3, "OUT": 1, ..., "points": 4}}
+    player_tallies = models.JSONField(default=dict)
+
+    # {"<team id>": outs conceded}
+    team_outs = models.JSONField(default=dict)
+
+    is_final = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['match', '-last_event_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.match} | snapshot @ event {self.last_event_id}"
+
+
+# ======================================
+# Archive
+
+class ArchivedMatchEvents(models.Model):
+    """
+    All score events of a completed match packed into one compressed
+    blob (see scoring.archive). The hot ScoreEvent rows are deleted once
+    archived, read paths fall back to this record.
+    """
+
+    match = models.OneToOneField(
+        Match,
+        on_delete=models.CASCADE,
+        related_name='event_archive'
+    )
+
+    event_count = models.PositiveIntegerField(default=0)
+    last_event_id = models.PositiveBigIntegerField(default=0)
+
+    # zlib compressed JSON, one row per event
+    data = models.BinaryField()
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.match} | {self.event_count} archived events"
+
+
+# ======================================
+# Player statistics
+
+class PlayerStatFields(models.Model):
+    """
+    Counters shared by the per-match and per-tournament player stats.
+    Corrections count back down, so these are net of undone events.
+    """
+
+    touches = models.IntegerField(default=0)
+    outs = models.IntegerField(default=0)
+    bonuses = models.IntegerField(default=0)
+    fouls = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+def leaderboard_indexes(scope, prefix):
+    # One (scope, -stat, player) index per stat for top-N reads
+    return [
+        models.Index(
+            fields=[scope, f"-{stat}", "player"],
+            name=f"{prefix}_{stat}_idx"
+        )
+        for stat in ["touches", "outs", "bonuses", "fouls", "points"]
+    ]
+
+
+class PlayerMatchStat(PlayerStatFields):
+    """
+    A player's stats in one match, updated by delta with every score event.
+    """
+
+    match = models.ForeignKey(
+        Match,
+        on_delete=models.CASCADE,
+        related_name='player_stats'
+    )
+
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        related_name='match_stats'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["match", "player"],
+                name="unique_player_match_stat"
+            ),
+        ]
+        indexes = leaderboard_indexes("match", "pms")
+
+    def __str__(self):
+        return f"{self.player} | {self.match} | {self.points} pts"
+
+
+class PlayerTournamentStat(PlayerStatFields):
+    """
+    A player's stats over a tournament, updated by delta with every score
+    event. Backs the player leaderboard.
+    """
+
+    tournament = models.ForeignKey(
+        'tournaments.Tournament',
+        on_delete=models.CASCADE,
+        related_name='player_stats'
+    )
+
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        related_name='tournament_stats'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tournament", "player"],
+                name="unique_player_tournament_stat"
+            ),
+        ]
+        indexes = leaderboard_indexes("tournament", "pts")
+
+    def __str__(self):
+        return f"{self.player} | {self.tournament} | {self.points} pts"
+
 
 # ======================================
 # Audit
@@ -99,8 +383,23 @@ class ScoreAuditLog(models.Model):
         on_delete=models.SET_NULL,
         null=True
     )
+    # No database constraint: the id stays valid after the event is
+    # moved to ArchivedMatchEvents and its hot row deleted
+    score_event = models.ForeignKey(
+        ScoreEvent,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='audit_logs'
+    )
+    event_type = models.CharField(
+        max_length=20,
+        blank=True
+    )
     points = models.IntegerField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the record is taken, rows are written later in batches
+    created_at = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
         return f"{self.user} added {self.points} points"
@@ -0,0 +1,148 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMinute
+
+from matches.models import Match
+from .archive import unpack_events
+from .models import ArchivedMatchEvents, ScoreEvent
+
+
+def minute_buckets(events):
+    """
+    Points per team per wall-clock minute, summed by the database:
+    one row per (match, minute) that had events.
+    """
+
+    return events.annotate(
+        minute=TruncMinute("timestamp")
+    ).values("match_id", "minute").annotate(
+        team_a=Coalesce(
+            Sum("points", filter=Q(attacking_team_id=F("match__team_a_id"))),
+            Value(0)
+        ),
+        team_b=Coalesce(
+            Sum("points", filter=Q(attacking_team_id=F("match__team_b_id"))),
+            Value(0)
+        ),
+    ).order_by("match_id", "minute")
+
+
+def archived_minute_buckets(match, data):
+    """
+    minute_buckets rows for an archived match, from its blob.
+    """
+
+    totals = defaultdict(lambda: [0, 0])
+
+    for event in unpack_events(data):
+        minute = event["timestamp"].replace(second=0, microsecond=0)
+        if event["attacking_team_id"] == match["team_a_id"]:
+            totals[minute][0] += event["points"]
+        elif event["attacking_team_id"] == match["team_b_id"]:
+            totals[minute][1] += event["points"]
+
+    return [
+        {"match_id": match["id"], "minute": minute, "team_a": a, "team_b": b}
+        for minute, (a, b) in sorted(totals.items())
+    ]
+
+
+def build_series(match, rows, bucket_minutes):
+    """
+    Cumulative score per team at the end of every `bucket_minutes`
+    bucket since the match started, gaps filled with the running total.
+    """
+
+    series = []
+
+    if rows:
+        start = match["started_at"] or rows[0]["minute"]
+        start = start.replace(second=0, microsecond=0)
+
+        per_bucket = defaultdict(lambda: [0, 0])
+        for row in rows:
+            minute = (row["minute"] - start) // timedelta(minutes=1)
+            bucket = max(minute, 0) // bucket_minutes
+            per_bucket[bucket][0] += row["team_a"]
+            per_bucket[bucket][1] += row["team_b"]
+
+        team_a_score = team_b_score = 0
+        for bucket in range(max(per_bucket) + 1):
+            team_a_score += per_bucket[bucket][0]
+            team_b_score += per_bucket[bucket][1]
+            series.append({
+                "minute": (bucket + 1) * bucket_minutes,
+                "team_a_score": team_a_score,
+                "team_b_score": team_b_score,
+            })
+
+    return {
+        "match_id": match["id"],
+        "team_a_id": match["team_a_id"],
+        "team_b_id": match["team_b_id"],
+        "bucket_minutes": bucket_minutes,
+        "series": series,
+    }
+
+
+MATCH_FIELDS = ["id", "team_a_id", "team_b_id", "started_at", "status"]
+
+
+def progression_for_matches(matches, events, bucket_minutes):
+    """
+    Series for every match in `matches` (dicts of MATCH_FIELDS) from one
+    grouped query over `events`, archived matches read from their blobs.
+    """
+
+    rows_by_match = defaultdict(list)
+    for row in minute_buckets(events):
+        rows_by_match[row["match_id"]].append(row)
+
+    # Completed matches without hot rows may have been archived
+    archived_ids = [
+        match["id"] for match in matches
+        if match["status"] == "COMPLETED" and match["id"] not in rows_by_match
+    ]
+    if archived_ids:
+        by_id = {match["id"]: match for match in matches}
+        archives = ArchivedMatchEvents.objects.filter(
+            match_id__in=archived_ids
+        ).values_list("match_id", "data")
+
+        for match_id, data in archives.iterator():
+            rows_by_match[match_id] = archived_minute_buckets(
+                by_id[match_id], data
+            )
+
+    return [
+        build_series(match, rows_by_match[match["id"]], bucket_minutes)
+        for match in matches
+    ]
+
+
+def get_match_progression(match, bucket_minutes=1):
+
+    matches = [{field: getattr(match, field) for field in MATCH_FIELDS}]
+
+    return progression_for_matches(
+        matches,
+        ScoreEvent.objects.filter(match=match),
+        bucket_minutes
+    )[0]
+
+
+def get_tournament_progression(tournament_id, bucket_minutes=1):
+
+    matches = list(
+        Match.objects.filter(tournament_id=tournament_id).order_by(
+            "match_number"
+        ).values(*MATCH_FIELDS)
+    )
+
+    return progression_for_matches(
+        matches,
+        ScoreEvent.objects.filter(match__tournament_id=tournament_id),
+        bucket_minutes
+    )
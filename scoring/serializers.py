@@ -14,4 +14,5 @@ class ScoreEventSerializer(serializers.ModelSerializer):
             'event_type',
             'points',
             'timestamp',
+            'client_event_id',
         ]
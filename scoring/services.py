@@ -1,9 +1,246 @@
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 
-from matches.models import Match, MatchPlayer
+from common import cache as live_cache
+from common.broker import publish_match_event
+
+from matches.engines import engine_scored
+from matches.lineup import get_lineup_snapshot
+from matches.models import Match
 from teams.models import Team
 from players.models import Player
-from .models import ScoreAuditLog, ScoreEvent
+from .archive import get_archived_events
+from .audit import record_score_audit
+from game_engine.match_state import TURNS, batch_after_correction, batch_after_out
+from .models import MatchScore, ScoreEvent
+from .snapshots import snapshot_due, take_match_snapshot
+from .stats import (
+    apply_player_stats,
+    apply_turn_scores,
+    rebuild_player_stats,
+    rebuild_turn_scores,
+)
+
+
+# RULE
+EVENT_POINTS = {
+    "TOUCH": 1,
+    "OUT": 1,
+    "BONUS": 1,
+    "ALL_OUT": 2,
+    "FOUL": -1,
+}
+
+
+class SequenceConflict(Exception):
+    """
+    The match moved on since the client last saw it: another scorer
+    recorded events after `expected_sequence`.
+    """
+
+    def __init__(self, expected_sequence, current_sequence):
+        self.expected_sequence = expected_sequence
+        self.current_sequence = current_sequence
+        super().__init__(
+            f"Match is at sequence {current_sequence}, "
+            f"client expected {expected_sequence}"
+        )
+
+
+def check_expected_sequence(score, expected_sequence):
+    """
+    Optimistic concurrency check, made while holding the MatchScore lock.
+    """
+
+    if expected_sequence is not None and expected_sequence != score.event_count:
+        raise SequenceConflict(expected_sequence, score.event_count)
+
+
+def validate_event_teams(match, attacking_team_id, defending_team_id):
+
+    match_team_ids = [match.team_a_id, match.team_b_id]
+
+    if attacking_team_id not in match_team_ids:
+        raise ValidationError("Attacking team is not part of this match")
+
+    if defending_team_id not in match_team_ids:
+        raise ValidationError("Defending team is not part of this match")
+
+    if attacking_team_id == defending_team_id:
+        raise ValidationError("Attacking and defending teams cannot be same")
+
+
+def validate_client_event_id(client_event_id):
+    """
+    The client key as it is stored and looked up: a string, or None if
+    none was sent. Numeric keys are accepted in their string form.
+    """
+
+    if client_event_id is None or client_event_id == "":
+        return None
+
+    if isinstance(client_event_id, bool) or not isinstance(client_event_id, (str, int)):
+        raise ValidationError("client_event_id must be a string or a number")
+
+    client_event_id = str(client_event_id)
+    max_length = ScoreEvent._meta.get_field("client_event_id").max_length
+
+    if len(client_event_id) > max_length:
+        raise ValidationError(
+            f"client_event_id cannot be longer than {max_length} characters"
+        )
+
+    return client_event_id
+
+
+def get_event_points(event_type):
+
+    if event_type not in EVENT_POINTS:
+        raise ValidationError("Invalid event type")
+
+    return EVENT_POINTS[event_type]
+
+
+# Only ever recorded by the server, after the out that earns them
+SERVER_EVENT_TYPES = {"ALL_OUT"}
+
+
+def get_submitted_event_points(event_type):
+    """
+    Points for an event sent by a scorer, who may not send the
+    server's own event types.
+    """
+
+    if not isinstance(event_type, str):
+        raise ValidationError("Invalid event type")
+
+    if event_type in SERVER_EVENT_TYPES:
+        raise ValidationError(f"{event_type} is recorded automatically")
+
+    return get_event_points(event_type)
+
+
+# Running totals fields written back after every event
+SCORE_FIELDS = [
+    "team_a_score", "team_b_score", "event_count",
+    "turn", "batch", "batch_outs", "updated_at",
+]
+
+
+def lock_match_score(match):
+    """
+    The match's running totals row, locked until the transaction ends.
+    A match scored before it had one gets it rebuilt from its history,
+    so totals and sequence numbers carry on from there.
+    Call inside a transaction.
+    """
+
+    score = MatchScore.objects.select_for_update().filter(match=match).first()
+
+    if score is None:
+        rebuild_match_score(match)
+        score = MatchScore.objects.select_for_update().get(match=match)
+
+    return score
+
+
+def place_in_turn(match, score, event, original=None):
+    """
+    Stamp the event with the current turn and batch, and move the batch
+    on for an out. Returns the automatic ALL_OUT event (not yet saved)
+    when the out exhausted the defenders' last batch, else None.
+    Call while holding the match's MatchScore lock.
+    """
+
+    # A correction is filed under the turn of the event it cancels
+    if original is not None:
+        event.turn, event.batch = original.turn, original.batch
+
+        if event.event_type == "OUT" and original.turn == score.turn:
+            score.batch, score.batch_outs = batch_after_correction(
+                score.batch, score.batch_outs
+            )
+        return None
+
+    event.turn, event.batch = score.turn, score.batch
+
+    if event.event_type != "OUT":
+        return None
+
+    score.batch, score.batch_outs, all_out = batch_after_out(
+        score.batch, score.batch_outs
+    )
+
+    if not all_out:
+        return None
+
+    return ScoreEvent(
+        match=match,
+        event_type="ALL_OUT",
+        points=get_event_points("ALL_OUT"),
+        attacking_team_id=event.attacking_team_id,
+        defending_team_id=event.defending_team_id,
+        turn=event.turn,
+        batch=event.batch
+    )
+
+
+def start_next_turn(match):
+    """
+    Move the match on to its next turn: the defenders start again from
+    their first batch. Returns the new turn number.
+    """
+
+    with transaction.atomic():
+        score = lock_match_score(match)
+
+        if score.turn >= TURNS:
+            raise ValidationError("All turns of the match have been played")
+
+        score.turn += 1
+        score.batch = 1
+        score.batch_outs = 0
+        score.save(update_fields=["turn", "batch", "batch_outs", "updated_at"])
+
+    return score.turn
+
+
+def score_event_message(event, score):
+    """
+    Delta pushed to live subscribers of the match for a stored event.
+    """
+
+    return {
+        "type": "score",
+        "match_id": event.match_id,
+        "score_id": event.id,
+        "event_type": event.event_type,
+        "points": event.points,
+        "team_id": event.attacking_team_id,
+        "defending_team_id": event.defending_team_id,
+        "player_id": event.player_id,
+        "reverses": event.reverses_id,
+        "sequence": event.sequence,
+        "turn": event.turn,
+        "batch": event.batch,
+        "time": event.timestamp.isoformat(),
+        "team_a_score": score.team_a_score,
+        "team_b_score": score.team_b_score,
+    }
+
+
+def find_score_event_id(match_id, client_event_id):
+    """
+    Id of an already stored event with this client key, if any.
+    A single lookup on the (match, client_event_id) unique index.
+    """
+
+    return ScoreEvent.objects.filter(
+        match_id=match_id,
+        client_event_id=client_event_id
+    ).values_list("id", flat=True).first()
 
 
 def create_score_event(
@@ -13,9 +250,11 @@ def create_score_event(
     user,
     attacking_team: Team,
     defending_team: Team,
-    player: Player | None = None
+    player: Player | None = None,
+    client_event_id: str | None = None,
+    expected_sequence: int | None = None
 ):
-    
+
     # -------------------------
     # MATCH STATE VALIDATION
     # -------------------------
@@ -25,96 +264,601 @@ def create_score_event(
     # -------------------------
     # TEAM VALIDATION
     # -------------------------
-    if attacking_team not in [match.team_a, match.team_b]:
-        raise ValidationError("Attacking team is not part of this match")
-
-    if defending_team not in [match.team_a, match.team_b]:
-        raise ValidationError("Defending team is not part of this match")
-
-    if attacking_team == defending_team:
-        raise ValidationError("Attacking and defending teams cannot be same")
+    validate_event_teams(match, attacking_team.id, defending_team.id)
 
     # -------------------------
     # PLAYER VALIDATION
     # -------------------------
     if player is not None:
 
-        if player.team not in [match.team_a, match.team_b]:
+        if player.team_id not in [match.team_a_id, match.team_b_id]:
             raise ValidationError("Player does not belong to this match")
 
-        is_playing = MatchPlayer.objects.filter(
+        lineup_entry = get_lineup_snapshot(match).get(player.id)
+
+        if lineup_entry is None or lineup_entry[1] != "PLAYING":
+            raise ValidationError("Substitute player cannot score")
+
+    client_event_id = validate_client_event_id(client_event_id)
+
+    # Assign points BEFORE creating event
+    points = get_submitted_event_points(event_type)
+
+    with transaction.atomic():
+
+        # Lock the running totals row so concurrent scorers on the
+        # same match apply their deltas one after another
+        score = lock_match_score(match)
+
+        # A retry that raced the original submission
+        if client_event_id:
+            existing = ScoreEvent.objects.filter(
+                match=match,
+                client_event_id=client_event_id
+            ).first()
+
+            if existing is not None:
+                return existing
+
+        check_expected_sequence(score, expected_sequence)
+
+        # -------------------------
+        # CREATE SCORE EVENT
+        # -------------------------
+        score_event = ScoreEvent(
             match=match,
+            event_type=event_type,
+            points=points,
+            attacking_team=attacking_team,
+            defending_team=defending_team,
             player=player,
-            status="PLAYING"
-        ).exists()
+            client_event_id=client_event_id,
+            sequence=score.event_count + 1
+        )
+        all_out = place_in_turn(match, score, score_event)
+        score_event.clean()
+        score_event.save(validate=False)
 
-        if not is_playing:
-            raise ValidationError("Substitute player cannot score")
+        # -------------------------
+        # RUNNING TOTALS
+        # -------------------------
+        previous_count = score.event_count
+        score.add_points(match, attacking_team.id, points)
+        messages = [score_event_message(score_event, score)]
+        stored = [score_event]
+
+        # Last defender of the last batch: the chasers earn the ALL_OUT
+        if all_out is not None:
+            all_out.sequence = score.event_count + 1
+            all_out.clean()
+            all_out.save(validate=False)
+            score.add_points(match, all_out.attacking_team_id, all_out.points)
+            messages.append(score_event_message(all_out, score))
+            stored.append(all_out)
+
+        score.save(update_fields=SCORE_FIELDS)
+
+        apply_player_stats(match, stored)
+        apply_turn_scores(match, stored)
+
+        if snapshot_due(previous_count, score.event_count):
+            take_match_snapshot(match)
+
+        Match.bump_version(match.id)
+        transaction.on_commit(lambda: refresh_scoreboard_cache(match))
+
+        for message in messages:
+            publish_match_event(match.id, message)
+        engine_scored(match.id, messages)
+
+        # -------------------------
+        # AUDIT LOG (HISTORY)
+        # -------------------------
+        record_score_audit(user, stored)
+
+    return score_event
+
+
+def create_score_events_bulk(*, match: Match, events, user, expected_sequence=None):
+    """
+    Validate and store a list of buffered score events for one match.
+    The match and its lineup are loaded once, valid events are written
+    with bulk inserts in a single transaction and invalid ones are skipped.
+    Returns one result dict per submitted event, in order.
+    """
+
+    if match.status != "LIVE":
+        raise ValidationError("Score can be added only when match is LIVE")
+
+    # player id -> (team id, lineup status)
+    lineup = get_lineup_snapshot(match)
+
+    results = []
+    pending = []
+
+    for index, data in enumerate(events):
+        try:
+            attacking_team_id = int(data.get("attacking_team") or 0)
+            defending_team_id = int(data.get("defending_team") or 0)
+            player_id = int(data["player"]) if data.get("player") else None
+        except (TypeError, ValueError):
+            results.append({
+                "index": index,
+                "success": False,
+                "error": "Invalid team or player id",
+            })
+            continue
+
+        try:
+            validate_event_teams(match, attacking_team_id, defending_team_id)
+
+            if player_id is not None:
+                if player_id not in lineup:
+                    raise ValidationError("Player is not in the match lineup")
+
+                player_team_id, player_status = lineup[player_id]
+
+                if player_team_id != attacking_team_id:
+                    raise ValidationError("Player must belong to attacking team")
+
+                if player_status != "PLAYING":
+                    raise ValidationError("Substitute player cannot score")
+
+            client_event_id = validate_client_event_id(data.get("client_event_id"))
 
-    # RULE 
-   
-    EVENT_POINTS = {
-        "TOUCH": 1,
-        "OUT": 1,
-        "BONUS": 1,
-        "ALL_OUT": 2,
-        "FOUL": -1,
+            points = get_submitted_event_points(data.get("event_type"))
+
+        except ValidationError as e:
+            results.append({
+                "index": index,
+                "success": False,
+                "error": " ".join(e.messages),
+            })
+            continue
+
+        result = {"index": index, "success": True, "score_id": None}
+        results.append(result)
+        pending.append((result, ScoreEvent(
+            match=match,
+            event_type=data["event_type"],
+            points=points,
+            attacking_team_id=attacking_team_id,
+            defending_team_id=defending_team_id,
+            player_id=player_id,
+            client_event_id=client_event_id
+        )))
+
+    if not pending:
+        return results
+
+    with transaction.atomic():
+
+        score = lock_match_score(match)
+
+        # -------------------------
+        # DUPLICATE SUBMISSIONS
+        # -------------------------
+        keys = [
+            event.client_event_id for _, event in pending
+            if event.client_event_id
+        ]
+        seen = dict(
+            ScoreEvent.objects.filter(
+                match=match,
+                client_event_id__in=keys
+            ).values_list("client_event_id", "id")
+        ) if keys else {}
+
+        new_events = []
+        repeats = []
+        queued_keys = set()
+
+        for result, event in pending:
+            key = event.client_event_id
+
+            if key in seen:
+                result["score_id"] = seen[key]
+                result["duplicate"] = True
+            elif key in queued_keys:
+                repeats.append((result, key))
+            else:
+                if key:
+                    queued_keys.add(key)
+                new_events.append((result, event))
+
+        # A retried batch gets its stored results back, the sequence
+        # check only guards events that would be written now
+        if not new_events:
+            return results
+
+        check_expected_sequence(score, expected_sequence)
+
+        # Automatic ALL_OUTs go in right after the out that earned them
+        pending = []
+
+        for result, event in new_events:
+            pending.append((result, event))
+            all_out = place_in_turn(match, score, event)
+            if all_out is not None:
+                pending.append((None, all_out))
+
+        for sequence, (_, event) in enumerate(pending, start=score.event_count + 1):
+            event.sequence = sequence
+
+        created = ScoreEvent.objects.bulk_create(
+            [event for _, event in pending]
+        )
+
+        previous_count = score.event_count
+        messages = []
+
+        for (result, _), event in zip(pending, created):
+            if result is not None:
+                result["score_id"] = event.id
+            score.add_points(match, event.attacking_team_id, event.points)
+            messages.append(score_event_message(event, score))
+            publish_match_event(match.id, messages[-1])
+
+        score.save(update_fields=SCORE_FIELDS)
+
+        apply_player_stats(match, created)
+        apply_turn_scores(match, created)
+
+        if snapshot_due(previous_count, score.event_count):
+            take_match_snapshot(match)
+
+        Match.bump_version(match.id)
+        transaction.on_commit(lambda: refresh_scoreboard_cache(match))
+        engine_scored(match.id, messages)
+
+        record_score_audit(user, created)
+
+    # Keys repeated inside the same batch point at the first copy
+    created_ids = {
+        event.client_event_id: event.id for event in created
+        if event.client_event_id
     }
+    for result, key in repeats:
+        result["score_id"] = created_ids[key]
+        result["duplicate"] = True
 
-    if event_type not in EVENT_POINTS:
-        raise ValidationError("Invalid event type")
+    return results
 
-    # Assign points BEFORE creating event
-    points = EVENT_POINTS[event_type]
 
-    # -------------------------
-    # CREATE SCORE EVENT
-    # -------------------------
-    score_event = ScoreEvent.objects.create(
+def all_out_pair(match, event):
+    """
+    The other half of an out and the automatic ALL_OUT it earned, which
+    are stored one after the other. None if `event` is not part of one.
+    """
+
+    if event.event_type == "OUT":
+        sequence, event_type = event.sequence + 1, "ALL_OUT"
+    elif event.event_type == "ALL_OUT":
+        sequence, event_type = event.sequence - 1, "OUT"
+    else:
+        return None
+
+    return ScoreEvent.objects.filter(
         match=match,
+        sequence=sequence,
         event_type=event_type,
-        points=points, 
-        attacking_team=attacking_team,
-        defending_team=defending_team,
-        player=player
-    )
+        reverses__isnull=True,
+        reversal__isnull=True
+    ).select_related("player").first()
 
-    # -------------------------
-    # AUDIT LOG (HISTORY)
-    # -------------------------
-    ScoreAuditLog.objects.create(
-        match=match,
-        user=user,
-        points=points
+
+def reverse_score_event(*, match: Match, event_id, user):
+    """
+    Undo a score event by recording a compensating event linked to it.
+    An out and the ALL_OUT it earned are undone together.
+    Running totals, snapshots and the live feed move by the reversed
+    delta, nothing is recomputed from history.
+    """
+
+    if match.status not in ["LIVE", "PAUSED"]:
+        raise ValidationError("Score can be corrected only while match is LIVE or PAUSED")
+
+    with transaction.atomic():
+
+        score = lock_match_score(match)
+
+        original = ScoreEvent.objects.filter(
+            match=match,
+            id=event_id
+        ).select_related("player").first()
+
+        if original is None:
+            raise ValidationError("Score event not found in this match")
+
+        if original.reverses_id is not None:
+            raise ValidationError("A correction cannot be reversed")
+
+        if ScoreEvent.objects.filter(reverses=original).exists():
+            raise ValidationError("Score event already reversed")
+
+        originals = [original]
+        paired = all_out_pair(match, original)
+        if paired is not None:
+            originals.append(paired)
+            originals.sort(key=lambda event: event.sequence)
+
+        previous_count = score.event_count
+        corrections = []
+        messages = []
+
+        for reversed_event in originals:
+            correction = ScoreEvent(
+                match=match,
+                event_type=reversed_event.event_type,
+                points=-reversed_event.points,
+                attacking_team_id=reversed_event.attacking_team_id,
+                defending_team_id=reversed_event.defending_team_id,
+                player=reversed_event.player,
+                reverses=reversed_event,
+                sequence=score.event_count + 1
+            )
+            place_in_turn(match, score, correction, original=reversed_event)
+            correction.clean()
+            correction.save(validate=False)
+
+            score.add_points(match, correction.attacking_team_id, correction.points)
+            corrections.append(correction)
+            messages.append(score_event_message(correction, score))
+
+        score.save(update_fields=SCORE_FIELDS)
+
+        apply_player_stats(match, corrections)
+        apply_turn_scores(match, corrections)
+
+        if snapshot_due(previous_count, score.event_count):
+            take_match_snapshot(match)
+
+        Match.bump_version(match.id)
+        transaction.on_commit(lambda: refresh_scoreboard_cache(match))
+
+        for message in messages:
+            publish_match_event(match.id, message)
+        engine_scored(match.id, messages)
+
+        record_score_audit(user, corrections)
+
+    return next(c for c in corrections if c.reverses_id == original.id)
+
+
+def aggregate_match_scores(match):
+    """
+    Team totals and event count for a match straight from ScoreEvent,
+    computed with one conditional aggregate.
+    """
+
+    totals = ScoreEvent.objects.filter(match=match).aggregate(
+        team_a_score=Coalesce(
+            Sum("points", filter=Q(attacking_team_id=match.team_a_id)), 0
+        ),
+        team_b_score=Coalesce(
+            Sum("points", filter=Q(attacking_team_id=match.team_b_id)), 0
+        ),
+        event_count=Count("id"),
     )
 
-    return score_event
+    if totals["event_count"] == 0:
+        archived = get_archived_events(match)
 
+        if archived:
+            totals = {
+                "team_a_score": sum(
+                    e["points"] for e in archived
+                    if e["attacking_team_id"] == match.team_a_id
+                ),
+                "team_b_score": sum(
+                    e["points"] for e in archived
+                    if e["attacking_team_id"] == match.team_b_id
+                ),
+                "event_count": len(archived),
+            }
 
-def get_match_scoreboard(match):
+    return totals
+
+
+def get_recent_events(match, limit=5):
+    """
+    Latest events of a match with team and player names joined in.
+    """
+
+    events = ScoreEvent.objects.filter(match=match).order_by(
+        "-sequence"
+    ).values(
+        "id",
+        "sequence",
+        "event_type",
+        "points",
+        "timestamp",
+        "reverses_id",
+        "attacking_team__name",
+        "player__first_name",
+        "player__last_name",
+    )[:limit]
+
+    if not events:
+        archived = get_archived_events(match)
+
+        if archived:
+            events = recent_archived_events(archived, limit)
+
+    return [
+        {
+            "id": e["id"],
+            "sequence": e["sequence"],
+            "event_type": e["event_type"],
+            "reverses": e["reverses_id"],
+            "points": e["points"],
+            "team": e["attacking_team__name"],
+            "player": (
+                f"{e['player__first_name']} {e['player__last_name']}"
+                if e["player__first_name"] is not None else None
+            ),
+            "time": e["timestamp"],
+        }
+        for e in events
+    ]
+
+
+def recent_archived_events(archived, limit):
+    """
+    The latest archived events, shaped like get_recent_events' query rows.
+    """
+
+    # Archived events are stored in id order, which is sequence order
+    latest = archived[::-1][:limit]
 
-    events = ScoreEvent.objects.filter(match=match).order_by("-timestamp")
+    team_names = dict(Team.objects.filter(
+        id__in={e["attacking_team_id"] for e in latest}
+    ).order_by().values_list("id", "name"))
 
-    team_a_score = 0
-    team_b_score = 0
+    player_names = {
+        p["id"]: p for p in Player.objects.filter(
+            id__in={e["player_id"] for e in latest if e["player_id"]}
+        ).values("id", "first_name", "last_name")
+    }
+
+    rows = []
+    for e in latest:
+        player = player_names.get(e["player_id"], {})
+        rows.append({
+            "id": e["id"],
+            "sequence": e["sequence"],
+            "event_type": e["event_type"],
+            "points": e["points"],
+            "timestamp": e["timestamp"],
+            "reverses_id": e["reverses_id"],
+            "attacking_team__name": team_names.get(e["attacking_team_id"]),
+            "player__first_name": player.get("first_name"),
+            "player__last_name": player.get("last_name"),
+        })
+
+    return rows
+
+
+def get_match_scoreboard(match):
+
+    totals = MatchScore.objects.filter(match=match).values(
+        "team_a_score", "team_b_score"
+    ).first()
 
-    for event in events:
-        if event.attacking_team == match.team_a:
-            team_a_score += event.points
-        elif event.attacking_team == match.team_b:
-            team_b_score += event.points
+    # Matches scored before running totals existed
+    if totals is None:
+        totals = aggregate_match_scores(match)
 
     return {
-        "team_a_score": team_a_score,
-        "team_b_score": team_b_score,
-        "events": [
-            {
-                "event_type": e.event_type,
-                "points": e.points,
-                "team": e.attacking_team.name,
-                "player": e.player.name if e.player else None,
-                "time": e.timestamp,
-            }
-            for e in events[:5]
-        ]
+        "team_a_score": totals["team_a_score"],
+        "team_b_score": totals["team_b_score"],
+        "events": get_recent_events(match),
     }
+
+
+def get_cached_scoreboard(match):
+    """
+    get_match_scoreboard served from the live cache.
+    Entries are keyed by match.version, so a warm entry is always current
+    for the match row the caller just loaded.
+    """
+
+    return live_cache.get_or_compute(
+        live_cache.SCOREBOARD,
+        live_cache.scoreboard_key(match.id, match.version),
+        lambda: get_match_scoreboard(match)
+    )
+
+
+def refresh_scoreboard_cache(match):
+    """
+    Write-through after a committed change: store the scoreboard under the
+    match's new version so the next readers never rebuild it.
+    """
+
+    version = Match.objects.filter(id=match.id).values_list(
+        "version", flat=True
+    ).first()
+
+    if version is None:
+        return
+
+    live_cache.store(
+        live_cache.scoreboard_key(match.id, version),
+        get_match_scoreboard(match)
+    )
+
+
+def replay_turn_state(match):
+    """
+    (turn, batch, outs in batch) the match's events leave it in.
+    """
+
+    events = ScoreEvent.objects.filter(match=match).order_by("sequence").values_list(
+        "turn", "event_type", "reverses_id"
+    )
+
+    if not events.exists():
+        events = [
+            (e.get("turn", 1), e["event_type"], e["reverses_id"])
+            for e in get_archived_events(match) or []
+        ]
+
+    events = list(events)
+    turn = max((event[0] for event in events), default=1)
+    batch, batch_outs = 1, 0
+
+    for event_turn, event_type, reverses_id in events:
+        if event_turn != turn or event_type != "OUT":
+            continue
+
+        if reverses_id:
+            batch, batch_outs = batch_after_correction(batch, batch_outs)
+        else:
+            batch, batch_outs, _ = batch_after_out(batch, batch_outs)
+
+    return turn, batch, batch_outs
+
+
+def rebuild_match_score(match):
+    """
+    Recompute one match's MatchScore row, player stats and turn scores
+    from its history. Call inside a transaction.
+    """
+
+    turn, batch, batch_outs = replay_turn_state(match)
+    current = MatchScore.objects.filter(match=match).values_list("turn", flat=True).first()
+
+    # A turn started without events yet is only known to the row
+    if current is not None and current > turn:
+        turn, batch, batch_outs = current, 1, 0
+
+    MatchScore.objects.update_or_create(
+        match=match,
+        defaults={
+            **aggregate_match_scores(match),
+            "turn": turn,
+            "batch": batch,
+            "batch_outs": batch_outs,
+        }
+    )
+    rebuild_player_stats(match)
+    rebuild_turn_scores(match)
+
+
+def rebuild_match_scores(matches):
+    """
+    Recompute MatchScore rows, player stats and turn scores for the given
+    matches from ScoreEvent history. Returns the number of matches rebuilt.
+    """
+
+    rebuilt = 0
+
+    for match in matches:
+        with transaction.atomic():
+            rebuild_match_score(match)
+        Match.bump_version(match.id)
+
+        rebuilt += 1
+
+    return rebuilt
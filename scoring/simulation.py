@@ -0,0 +1,319 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from game_engine.simulator import MatchSimulator
+from matches.models import Match, MatchOfficial, MatchPlayer
+from matches.services import end_match, next_turn, start_match
+from players.models import Player
+from teams.models import Team
+from tournaments.models import Tournament
+from users.models import User
+from .audit import flush_audit_log
+from .models import ScoreEvent
+from .services import create_score_event
+
+
+SIMULATION_MODES = ["service", "http"]
+
+SQUAD_SIZE = 12
+PLAYING = 9
+
+
+def create_simulated_matches(count, turn_seconds=540):
+    """
+    A throwaway tournament with one LIVE match per pair of simulated
+    teams: full squads, lineups of nine plus substitutes and an umpire.
+    Returns (tournament, matches, umpire).
+    """
+
+    stamp = timezone.now().strftime("%Y%m%d%H%M%S%f")
+    today = date.today()
+
+    tournament = Tournament.objects.create(
+        name=f"Simulation {stamp}",
+        location="Simulation",
+        gender="MEN",
+        start_date=today,
+        end_date=today + timedelta(days=1),
+        organizer="simulate_matches",
+        max_time_per_turn=turn_seconds,
+    )
+
+    teams = Team.objects.bulk_create([
+        Team(
+            tournament=tournament,
+            name=f"Sim {stamp} Team {index}",
+            short_name=f"S{index}",
+            color="Red",
+            state="MH",
+            city="Pune",
+            gender="MEN",
+            age_group="SENIOR",
+        )
+        for index in range(2 * count)
+    ])
+
+    players = Player.objects.bulk_create([
+        Player(
+            team=team,
+            first_name=f"Player{number}",
+            last_name=team.short_name,
+            jersey_number=number,
+            role="ALL_ROUNDER",
+            date_of_birth=date(2000, 1, 1),
+        )
+        for team in teams
+        for number in range(1, SQUAD_SIZE + 1)
+    ])
+
+    umpire = User.objects.create(username=f"sim-umpire-{stamp}", role="official")
+
+    now = timezone.now()
+    matches = Match.objects.bulk_create([
+        Match(
+            tournament=tournament,
+            team_a=teams[2 * index],
+            team_b=teams[2 * index + 1],
+            match_number=index + 1,
+            venue=f"Ground {index + 1}",
+            match_date=now,
+        )
+        for index in range(count)
+    ])
+
+    squads = {}
+    for player in players:
+        squads.setdefault(player.team_id, []).append(player)
+
+    MatchPlayer.objects.bulk_create([
+        MatchPlayer(
+            match=match,
+            player=player,
+            status="PLAYING" if number < PLAYING else "SUBSTITUTE",
+        )
+        for match in matches
+        for team_id in (match.team_a_id, match.team_b_id)
+        for number, player in enumerate(squads[team_id])
+    ])
+
+    MatchOfficial.objects.bulk_create([
+        MatchOfficial(match=match, user=umpire, role="UMPIRE")
+        for match in matches
+    ])
+
+    for match in matches:
+        start_match(match)
+
+    return tournament, matches, umpire
+
+
+def playing_ids(match):
+    """
+    {team id: [PLAYING player ids]} of a match's lineup.
+    """
+
+    lineup = {match.team_a_id: [], match.team_b_id: []}
+
+    for player_id, team_id in MatchPlayer.objects.filter(
+        match=match, status="PLAYING"
+    ).order_by("player_id").values_list("player_id", "player__team_id"):
+        lineup[team_id].append(player_id)
+
+    return lineup
+
+
+class ServiceScorer:
+    """
+    Submits plays straight to create_score_event.
+    """
+
+    def __init__(self, match, umpire):
+        self.match = match
+        self.umpire = umpire
+        self.teams = Team.objects.in_bulk([match.team_a_id, match.team_b_id])
+        self.players = Player.objects.in_bulk(
+            Player.objects.filter(team_id__in=self.teams).values_list("id", flat=True)
+        )
+
+    def score(self, play, client_event_id):
+        create_score_event(
+            match=self.match,
+            event_type=play["event_type"],
+            user=self.umpire,
+            attacking_team=self.teams[play["attacking_team"]],
+            defending_team=self.teams[play["defending_team"]],
+            player=self.players[play["player"]],
+            client_event_id=client_event_id,
+        )
+
+    def next_turn(self):
+        next_turn(self.match)
+
+    def end(self):
+        self.match.refresh_from_db()
+        end_match(self.match)
+
+
+class HttpScorer:
+    """
+    Submits plays to the HTTP endpoints through the DRF test client,
+    so authentication, permissions and serialization are included.
+    """
+
+    def __init__(self, match, umpire):
+        self.match = match
+        host = next(
+            (h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")),
+            "localhost"
+        )
+        self.client = APIClient(SERVER_NAME=host)
+        self.client.force_authenticate(umpire)
+
+    def post(self, url, data=None):
+        response = self.client.post(url, data or {}, format="json")
+        if response.status_code >= 400:
+            raise RuntimeError(f"{url}: {response.status_code} {response.data}")
+
+    def score(self, play, client_event_id):
+        self.post("/api/scoring/create-score/", {
+            "match": self.match.id,
+            "event_type": play["event_type"],
+            "attacking_team": play["attacking_team"],
+            "defending_team": play["defending_team"],
+            "player": play["player"],
+            "client_event_id": client_event_id,
+        })
+
+    def next_turn(self):
+        self.post(f"/api/next-turn/{self.match.id}/")
+
+    def end(self):
+        self.post(f"/api/end/{self.match.id}/")
+
+
+SCORERS = {"service": ServiceScorer, "http": HttpScorer}
+
+
+def play_match(match, umpire, mode, turn_seconds, seed):
+    """
+    Play one simulated match to the end. Returns one (latency seconds,
+    query count, error) sample per score submission, and the number of
+    ALL_OUTs the server should have added.
+    """
+
+    samples = []
+    all_outs = 0
+
+    try:
+        lineup = playing_ids(match)
+        simulator = MatchSimulator(
+            (match.team_a_id, lineup[match.team_a_id]),
+            (match.team_b_id, lineup[match.team_b_id]),
+            turn_seconds=turn_seconds,
+            seed=seed,
+        )
+        scorer = SCORERS[mode](match, umpire)
+        turn = 1
+
+        for number, play in enumerate(simulator.plays(), start=1):
+            if play["turn"] != turn:
+                scorer.next_turn()
+                turn = play["turn"]
+
+            error = None
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                try:
+                    scorer.score(play, f"sim-{match.id}-{number}")
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                latency = time.perf_counter() - started
+
+            samples.append((latency, len(queries), error))
+
+        all_outs = simulator.all_outs
+        scorer.end()
+    finally:
+        connections.close_all()
+
+    return samples, all_outs
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(latency * 1000 for latency, _, _ in samples)
+    query_counts = [queries for _, queries, _ in samples]
+    errors = [error for _, _, error in samples if error]
+
+    if not samples:
+        return {"calls": 0, "errors": 0, "elapsed_seconds": round(elapsed, 3)}
+
+    return {
+        "calls": len(samples),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "elapsed_seconds": round(elapsed, 3),
+        "calls_per_second": round(len(samples) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p90": round(percentile(latencies, 0.90), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(latencies[-1], 2),
+            "mean": round(statistics.fmean(latencies), 2),
+        },
+        "queries_per_call": {
+            "mean": round(statistics.fmean(query_counts), 1),
+            "max": max(query_counts),
+        },
+    }
+
+
+def run_simulation(matches, umpire, mode="service", concurrency=1,
+                   turn_seconds=540, seed=None):
+    """
+    Play every match, `concurrency` at a time, each from its own thread
+    and database connection. Returns the summary of all submissions.
+    """
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        runs = [
+            pool.submit(
+                play_match, match, umpire, mode, turn_seconds,
+                None if seed is None else seed + index
+            )
+            for index, match in enumerate(matches)
+        ]
+        results = [run.result() for run in runs]
+
+    samples = [sample for run_samples, _ in results for sample in run_samples]
+
+    elapsed = time.perf_counter() - started
+    flush_audit_log()
+
+    report = summarize(samples, elapsed)
+    report["mode"] = mode
+    report["matches"] = len(matches)
+    report["concurrency"] = concurrency
+
+    stored = ScoreEvent.objects.filter(match__in=matches)
+    report["events_stored"] = stored.count()
+    report["all_outs"] = {
+        "expected": sum(all_outs for _, all_outs in results),
+        "stored": stored.filter(event_type="ALL_OUT").count(),
+    }
+
+    return report
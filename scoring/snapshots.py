@@ -0,0 +1,145 @@
+from django.conf import settings
+
+from .archive import get_archived_events
+from .models import MatchSnapshot, ScoreEvent
+
+
+def snapshot_interval():
+    return getattr(settings, "MATCH_SNAPSHOT_INTERVAL", 50)
+
+
+def empty_state(match):
+    return {
+        "match_id": match.id,
+        "team_a_score": 0,
+        "team_b_score": 0,
+        "event_count": 0,
+        "last_event_id": 0,
+        "player_tallies": {},
+        "team_outs": {},
+    }
+
+
+def state_from_snapshot(match, snapshot):
+    return {
+        "match_id": match.id,
+        "team_a_score": snapshot.team_a_score,
+        "team_b_score": snapshot.team_b_score,
+        "event_count": snapshot.event_count,
+        "last_event_id": snapshot.last_event_id,
+        "player_tallies": snapshot.player_tallies,
+        "team_outs": snapshot.team_outs,
+    }
+
+
+def apply_event(state, match, event):
+    """
+    Fold one event (a dict from tail_events) into a replay state.
+    """
+
+    if event["attacking_team_id"] == match.team_a_id:
+        state["team_a_score"] += event["points"]
+    elif event["attacking_team_id"] == match.team_b_id:
+        state["team_b_score"] += event["points"]
+
+    if event["player_id"] is not None:
+        tally = state["player_tallies"].setdefault(
+            str(event["player_id"]), {"points": 0}
+        )
+        # A correction takes its original back out of the tally
+        step = -1 if event["reverses_id"] else 1
+        tally[event["event_type"]] = tally.get(event["event_type"], 0) + step
+        tally["points"] += event["points"]
+
+    if event["event_type"] == "OUT":
+        defending = str(event["defending_team_id"])
+        step = -1 if event["reverses_id"] else 1
+        state["team_outs"][defending] = state["team_outs"].get(defending, 0) + step
+
+    state["event_count"] += 1
+    state["last_event_id"] = event["id"]
+
+
+def tail_events(match, after_event_id):
+    """
+    Events after `after_event_id` in id order, from the archive once the
+    match's hot rows have been archived.
+    """
+
+    events = list(ScoreEvent.objects.filter(
+        match=match,
+        id__gt=after_event_id
+    ).order_by("id").values(
+        "id", "attacking_team_id", "defending_team_id", "player_id",
+        "event_type", "points", "reverses_id"
+    ))
+
+    if not events:
+        archived = get_archived_events(match) or []
+        events = [e for e in archived if e["id"] > after_event_id]
+
+    return events
+
+
+def latest_snapshot(match):
+    return MatchSnapshot.objects.filter(match=match).order_by(
+        "-last_event_id", "-id"
+    ).first()
+
+
+def replay_match(match):
+    """
+    Current derived state of the match: the latest snapshot plus only the
+    events recorded after it.
+    """
+
+    snapshot = latest_snapshot(match)
+
+    if snapshot is None:
+        state = empty_state(match)
+    else:
+        state = state_from_snapshot(match, snapshot)
+
+    replayed = 0
+
+    # Nothing can be scored after the final snapshot
+    if snapshot is None or not snapshot.is_final:
+        for event in tail_events(match, state["last_event_id"]):
+            apply_event(state, match, event)
+            replayed += 1
+
+    state["snapshot_id"] = snapshot.id if snapshot else None
+    state["replayed_events"] = replayed
+
+    return state
+
+
+def take_match_snapshot(match, final=False):
+    """
+    Persist the current replay state as a new snapshot.
+    Call while holding the match's MatchScore row lock (or once the match
+    has ended) so no event can slip in between.
+    """
+
+    state = replay_match(match)
+
+    return MatchSnapshot.objects.create(
+        match=match,
+        last_event_id=state["last_event_id"],
+        event_count=state["event_count"],
+        team_a_score=state["team_a_score"],
+        team_b_score=state["team_b_score"],
+        player_tallies=state["player_tallies"],
+        team_outs=state["team_outs"],
+        is_final=final
+    )
+
+
+def snapshot_due(previous_count, new_count):
+    """
+    True if the event count crossed a multiple of the snapshot interval.
+    """
+
+    interval = snapshot_interval()
+
+    return new_count // interval > previous_count // interval
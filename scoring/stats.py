@@ -0,0 +1,238 @@
+from collections import defaultdict
+
+from django.db.models import Count, F, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .archive import get_archived_events
+from .models import PlayerMatchStat, PlayerTournamentStat, ScoreEvent, TurnScore
+
+
+# event type -> counter it increments
+STAT_FIELDS = {
+    "TOUCH": "touches",
+    "OUT": "outs",
+    "BONUS": "bonuses",
+    "FOUL": "fouls",
+}
+
+LEADERBOARD_STATS = ["touches", "outs", "bonuses", "fouls", "points"]
+
+
+def player_stat_deltas(events):
+    """
+    {player_id: {field: delta}} for a list of stored score events.
+    A correction counts its original back out.
+    """
+
+    deltas = defaultdict(lambda: defaultdict(int))
+
+    for event in events:
+        if event.player_id is None:
+            continue
+
+        delta = deltas[event.player_id]
+        field = STAT_FIELDS.get(event.event_type)
+
+        if field is not None:
+            delta[field] += -1 if event.reverses_id else 1
+        delta["points"] += event.points
+
+    return deltas
+
+
+def apply_player_stats(match, events):
+    """
+    Move the match and tournament stats of every player involved in
+    `events` by the events' delta. Call inside the scoring transaction.
+    """
+
+    for player_id, delta in player_stat_deltas(events).items():
+        changes = {
+            field: F(field) + value
+            for field, value in delta.items() if value
+        }
+        if not changes:
+            continue
+
+        # Updates are relative, so concurrent matches of the same
+        # tournament cannot lose each other's increments
+        for model, scope in [
+            (PlayerMatchStat, {"match_id": match.id}),
+            (PlayerTournamentStat, {"tournament_id": match.tournament_id}),
+        ]:
+            stat, _ = model.objects.get_or_create(player_id=player_id, **scope)
+            model.objects.filter(id=stat.id).update(**changes)
+
+
+def count_of(event_type):
+    # Net count of an event type: originals minus their corrections
+    return (
+        Count("id", filter=Q(event_type=event_type, reverses__isnull=True))
+        - Count("id", filter=Q(event_type=event_type, reverses__isnull=False))
+    )
+
+
+def rebuild_player_stats(match):
+    """
+    Recompute the match's player stats from ScoreEvent history, then the
+    tournament stats of every player who scored in it.
+    """
+
+    # Players who had stats before the rebuild may have none after it
+    player_ids = set(
+        PlayerMatchStat.objects.filter(match=match).values_list(
+            "player_id", flat=True
+        )
+    )
+
+    rows = list(ScoreEvent.objects.filter(
+        match=match,
+        player__isnull=False
+    ).values("player_id").annotate(
+        points_total=Coalesce(Sum("points"), Value(0)),
+        **{
+            field: count_of(event_type)
+            for event_type, field in STAT_FIELDS.items()
+        }
+    ))
+
+    if not rows:
+        archived = get_archived_events(match) or []
+        rows = [
+            {"player_id": player_id, "points_total": delta.pop("points", 0), **delta}
+            for player_id, delta in player_stat_deltas(
+                ScoreEvent(**event) for event in archived
+            ).items()
+        ]
+
+    PlayerMatchStat.objects.filter(match=match).delete()
+    PlayerMatchStat.objects.bulk_create([
+        PlayerMatchStat(
+            match=match,
+            player_id=row["player_id"],
+            points=row["points_total"],
+            **{field: row.get(field, 0) for field in STAT_FIELDS.values()}
+        )
+        for row in rows
+    ])
+
+    player_ids.update(row["player_id"] for row in rows)
+
+    totals = PlayerMatchStat.objects.filter(
+        match__tournament_id=match.tournament_id,
+        player_id__in=player_ids
+    ).values("player_id").annotate(**{
+        f"{stat}_total": Coalesce(Sum(stat), Value(0), output_field=IntegerField())
+        for stat in LEADERBOARD_STATS
+    })
+
+    for row in totals:
+        PlayerTournamentStat.objects.update_or_create(
+            tournament_id=match.tournament_id,
+            player_id=row["player_id"],
+            defaults={
+                stat: row[f"{stat}_total"] for stat in LEADERBOARD_STATS
+            }
+        )
+        player_ids.discard(row["player_id"])
+
+    # No match stats left in the tournament
+    PlayerTournamentStat.objects.filter(
+        tournament_id=match.tournament_id,
+        player_id__in=player_ids
+    ).delete()
+
+
+def turn_score_deltas(match, events):
+    """
+    {turn: {field: delta}} of TurnScore fields for a list of score events.
+    A correction counts its original back out, in the original's turn.
+    """
+
+    deltas = defaultdict(lambda: defaultdict(int))
+
+    for event in events:
+        delta = deltas[event.turn]
+        step = -1 if event.reverses_id else 1
+
+        if event.attacking_team_id == match.team_a_id:
+            delta["team_a_points"] += event.points
+        else:
+            delta["team_b_points"] += event.points
+
+        if event.event_type == "OUT":
+            delta["outs"] += step
+        elif event.event_type == "ALL_OUT":
+            delta["all_outs"] += step
+
+        delta["event_count"] += 1
+
+    return deltas
+
+
+def apply_turn_scores(match, events):
+    """
+    Move the match's per-turn splits by the events' delta.
+    Call inside the scoring transaction.
+    """
+
+    for turn, delta in turn_score_deltas(match, events).items():
+        turn_score, _ = TurnScore.objects.get_or_create(match=match, turn=turn)
+        TurnScore.objects.filter(id=turn_score.id).update(**{
+            field: F(field) + value for field, value in delta.items() if value
+        })
+
+
+def rebuild_turn_scores(match):
+    """
+    Recompute the match's per-turn splits from ScoreEvent history.
+    """
+
+    events = ScoreEvent.objects.filter(match=match).only(
+        "turn", "event_type", "points", "attacking_team_id", "reverses_id"
+    )
+
+    if not events.exists():
+        events = [ScoreEvent(**event) for event in get_archived_events(match) or []]
+
+    TurnScore.objects.filter(match=match).delete()
+    TurnScore.objects.bulk_create([
+        TurnScore(match=match, turn=turn, **delta)
+        for turn, delta in turn_score_deltas(match, events).items()
+    ])
+
+
+def get_turn_scores(match_id):
+    """
+    Per-turn splits of a match, in turn order.
+    """
+
+    return list(TurnScore.objects.filter(match_id=match_id).order_by("turn").values(
+        "turn", "team_a_points", "team_b_points", "outs", "all_outs", "event_count"
+    ))
+
+
+def get_leaderboard(stats, stat="points", limit=10):
+    """
+    Top `limit` rows of a PlayerMatchStat / PlayerTournamentStat queryset
+    by `stat`, read along the (scope, -stat, player) index.
+    """
+
+    rows = stats.order_by(f"-{stat}", "player_id").values(
+        "player_id",
+        "player__first_name",
+        "player__last_name",
+        "player__team__name",
+        *LEADERBOARD_STATS
+    )[:limit]
+
+    return [
+        {
+            "rank": rank,
+            "player_id": row["player_id"],
+            "player": f"{row['player__first_name']} {row['player__last_name']}",
+            "team": row["player__team__name"],
+            **{field: row[field] for field in LEADERBOARD_STATS},
+        }
+        for rank, row in enumerate(rows, start=1)
+    ]
@@ -1,3 +1,1087 @@
-from django.test import TestCase
+import csv
+import json
+import threading
+import time
+from importlib import import_module
+from datetime import date, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.core.exceptions import ValidationError
+from django.db import OperationalError, connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from matches.engines import get_engine_registry, get_live_engine
+from matches.models import Match, MatchOfficial, MatchPlayer
+from matches.services import end_match, next_turn, start_match
+from players.models import Player
+from teams.models import Team
+from tournaments.models import Tournament
+from users.models import User
+
+from common.cache import get_cache
+from game_engine.simulator import MatchSimulator
+from .archive import archive_match, matches_to_archive
+from .audit import AuditWriter, record_score_audit
+from .models import MatchScore, MatchSnapshot, ScoreAuditLog, ScoreEvent, TurnScore
+from .progression import get_match_progression, get_tournament_progression
+from .simulation import ServiceScorer, playing_ids
+from .services import (
+    SequenceConflict,
+    aggregate_match_scores,
+    rebuild_match_score,
+    replay_turn_state,
+    create_score_event,
+    create_score_events_bulk,
+    get_recent_events,
+    reverse_score_event,
+)
+from .snapshots import apply_event, empty_state, replay_match, tail_events
+from .stats import get_turn_scores, rebuild_turn_scores
+
+
+def create_live_match(name="Test Cup", umpire_name="umpire"):
+    """
+    Tournament with two full teams, a lineup, an umpire and a LIVE match.
+    """
+
+    tournament = Tournament.objects.create(
+        name=name,
+        location="Pune",
+        gender="MEN",
+        start_date=date(2026, 1, 1),
+        end_date=date(2027, 12, 31),
+        organizer="Test",
+    )
+
+    teams = []
+    for index in range(2):
+        team = Team.objects.create(
+            tournament=tournament,
+            name=f"Team {index}",
+            short_name=f"T{index}",
+            color="Red",
+            state="MH",
+            city="Pune",
+            gender="MEN",
+            age_group="SENIOR",
+        )
+        for number in range(1, 10):
+            Player.objects.create(
+                team=team,
+                first_name=f"Player{number}",
+                last_name=f"Team{index}",
+                jersey_number=number,
+                role="ALL_ROUNDER",
+                date_of_birth=date(2000, 1, 1),
+            )
+        teams.append(team)
+
+    umpire = User.objects.create(username=umpire_name, role="ADMIN")
+
+    match = Match.objects.create(
+        tournament=tournament,
+        team_a=teams[0],
+        team_b=teams[1],
+        match_number=1,
+        venue="Ground 1",
+        match_date=timezone.now(),
+    )
+
+    for player in Player.objects.filter(team__in=teams):
+        MatchPlayer.objects.create(match=match, player=player)
+
+    MatchOfficial.objects.create(match=match, user=umpire, role="UMPIRE")
+    start_match(match)
+    match.refresh_from_db()
+
+    return match, teams, umpire
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class ScoreboardQueryCountTests(TestCase):
+
+    def setUp(self):
+        get_cache().clear()
+        get_engine_registry().clear()
+        self.match, self.teams, self.user = create_live_match()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_events(self, count):
+        player = self.teams[0].players.first()
+        for _ in range(count):
+            create_score_event(
+                match=self.match,
+                event_type="TOUCH",
+                user=self.user,
+                attacking_team=self.teams[0],
+                defending_team=self.teams[1],
+                player=player,
+            )
+
+    def test_scoreboard_query_count_is_constant(self):
+        for count in (1, 25):
+            self.add_events(count)
+            # match, running totals, recent events
+            with self.assertNumQueries(3):
+                response = self.client.get(
+                    f"/api/scoring/scoreboard/{self.match.id}/"
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["data"]["events"]), 5)
+
+    def test_live_match_is_served_by_the_engine(self):
+        url = f"/api/live/{self.match.id}/"
+        # First read caches the match state and builds the engine
+        self.client.get(url)
+
+        for count in (1, 25):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.add_events(count)
+            with self.assertNumQueries(0):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["team_a"], "Team 0")
+            self.assertEqual(response.data["events"][0]["player"], "Player1 Team0")
+
+        self.assertEqual(response.data["team_a_score"], 26)
+        self.assertEqual(len(response.data["events"]), 5)
+
+    def test_unchanged_scoreboard_returns_not_modified(self):
+        self.add_events(1)
+        url = f"/api/scoring/scoreboard/{self.match.id}/"
+
+        etag = self.client.get(url)["ETag"]
+
+        # only the match row is read
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.add_events(1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_warm_scoreboard_cache_skips_score_events(self):
+        # run the write-through that follows the commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_events(3)
+
+        # only the match row is read
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"/api/scoring/scoreboard/{self.match.id}/"
+            )
+        self.assertEqual(response.data["data"]["team_a_score"], 3)
+
+
+class AuditWriterTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+
+    def score(self):
+        return create_score_event(
+            match=self.match,
+            event_type="TOUCH",
+            user=self.user,
+            attacking_team=self.teams[0],
+            defending_team=self.teams[1],
+            player=self.teams[0].players.first(),
+        )
+
+    @override_settings(SCORE_AUDIT_SYNC=True)
+    def test_sync_mode_writes_with_the_event(self):
+        event = self.score()
+
+        log = ScoreAuditLog.objects.get()
+        self.assertEqual(log.score_event, event)
+        self.assertEqual(log.event_type, "TOUCH")
+        self.assertEqual(log.user, self.user)
+
+    @override_settings(SCORE_AUDIT_SYNC=False)
+    def test_queued_records_are_written_in_one_batch(self):
+        # Not started: nothing is written until flush()
+        writer = AuditWriter(batch_size=100)
+        events = [self.score() for _ in range(5)]
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            record_score_audit(self.user, events)
+        self.assertEqual(len(callbacks), 1)
+
+        writer.enqueue(ScoreAuditLog(
+            match=self.match, user=self.user, score_event=event,
+            event_type=event.event_type, points=event.points
+        ) for event in events)
+        self.assertEqual(ScoreAuditLog.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(writer.flush(), 5)
+
+        self.assertEqual(
+            list(ScoreAuditLog.objects.values_list("score_event", flat=True)
+                 .order_by("score_event")),
+            [event.id for event in events]
+        )
+
+    def test_full_queue_flushes_inline(self):
+        writer = AuditWriter(batch_size=100, max_queue_size=2)
+        event = self.score()
+        ScoreAuditLog.objects.all().delete()
+
+        writer.enqueue(
+            ScoreAuditLog(match=self.match, score_event=event, points=1)
+            for _ in range(3)
+        )
+
+        self.assertEqual(ScoreAuditLog.objects.count(), 2)
+        self.assertEqual(writer.flush(), 1)
+
+    def test_failed_flush_is_retried(self):
+        writer = AuditWriter(batch_size=100, max_retries=2)
+        events = [self.score() for _ in range(3)]
+        ScoreAuditLog.objects.all().delete()
+
+        writer.enqueue(
+            ScoreAuditLog(match=self.match, score_event=event, points=1)
+            for event in events
+        )
+
+        with mock.patch.object(
+            ScoreAuditLog.objects, "bulk_create",
+            side_effect=OperationalError("connection lost")
+        ), self.assertLogs("scoring.audit", "WARNING"):
+            self.assertEqual(writer.flush(), 0)
+        self.assertEqual(ScoreAuditLog.objects.count(), 0)
+
+        self.assertEqual(writer.flush(), 3)
+        self.assertEqual(ScoreAuditLog.objects.count(), 3)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class AuditWriterFailureTests(TransactionTestCase):
+    """
+    The writer thread runs in autocommit, as here: a failed insert
+    does not poison an enclosing transaction.
+    """
+
+    def test_rows_that_cannot_be_written_do_not_hold_back_the_rest(self):
+        match, teams, user = create_live_match()
+        writer = AuditWriter(batch_size=100, max_retries=1)
+        event = create_score_event(
+            match=match,
+            event_type="TOUCH",
+            user=user,
+            attacking_team=teams[0],
+            defending_team=teams[1],
+            player=teams[0].players.first(),
+        )
+        ScoreAuditLog.objects.all().delete()
+
+        writer.enqueue([
+            ScoreAuditLog(match=match, score_event=event, points=1),
+            ScoreAuditLog(match=match, score_event=event, points=None),
+        ])
+
+        with self.assertLogs("scoring.audit", "ERROR"):
+            self.assertEqual(writer.flush(), 1)
+        self.assertEqual(writer.flush(), 0)
+        self.assertEqual(ScoreAuditLog.objects.count(), 1)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class EventSequenceTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+        self.player = self.teams[0].players.first()
+
+    def score(self, **kwargs):
+        return create_score_event(
+            match=self.match,
+            event_type="TOUCH",
+            user=self.user,
+            attacking_team=self.teams[0],
+            defending_team=self.teams[1],
+            player=self.player,
+            **kwargs
+        )
+
+    def test_scoring_an_event_stays_within_its_query_budget(self):
+        self.score()
+
+        # savepoint, lock totals, retry lookup, event insert, totals
+        # update, player match and tournament stats (read + update each),
+        # turn split (read + update), match version, audit insert, release
+        with self.assertNumQueries(14):
+            self.score(client_event_id="budget-1")
+
+    def test_overlong_client_event_ids_are_rejected(self):
+        event = {
+            "event_type": "TOUCH",
+            "attacking_team": self.teams[0].id,
+            "defending_team": self.teams[1].id,
+            "player": self.player.id,
+        }
+
+        results = create_score_events_bulk(match=self.match, user=self.user, events=[
+            {**event, "client_event_id": "x" * 65},
+            {**event, "client_event_id": "x" * 64},
+        ])
+        self.assertEqual([r["success"] for r in results], [False, True])
+
+        with self.assertRaises(ValidationError):
+            self.score(client_event_id="y" * 65)
+        self.assertEqual(self.match.score_events.count(), 1)
+
+    def test_event_types_that_are_not_strings_fail_per_item(self):
+        event = {
+            "attacking_team": self.teams[0].id,
+            "defending_team": self.teams[1].id,
+            "player": self.player.id,
+        }
+
+        results = create_score_events_bulk(match=self.match, user=self.user, events=[
+            {**event, "event_type": ["OUT"]},
+            {**event, "event_type": {"type": "OUT"}},
+            {**event, "event_type": "OUT"},
+        ])
+        self.assertEqual([r["success"] for r in results], [False, False, True])
+        self.assertEqual(results[0]["error"], "Invalid event type")
+
+    def test_sequence_is_gap_free_across_write_paths(self):
+        first = self.score()
+        create_score_events_bulk(match=self.match, user=self.user, events=[
+            {
+                "event_type": "BONUS",
+                "attacking_team": self.teams[0].id,
+                "defending_team": self.teams[1].id,
+                "player": self.player.id,
+            }
+        ] * 3)
+        reverse_score_event(match=self.match, event_id=first.id, user=self.user)
+        self.score()
+
+        self.assertEqual(
+            list(self.match.score_events.order_by("id").values_list(
+                "sequence", flat=True
+            )),
+            [1, 2, 3, 4, 5, 6]
+        )
+
+    def test_stale_expected_sequence_conflicts(self):
+        self.score(expected_sequence=0)
+        self.score(expected_sequence=1)
+
+        with self.assertRaises(SequenceConflict) as raised:
+            self.score(expected_sequence=1)
+        self.assertEqual(raised.exception.current_sequence, 2)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post("/api/scoring/create-score/", {
+            "match": self.match.id,
+            "event_type": "TOUCH",
+            "attacking_team": self.teams[0].id,
+            "defending_team": self.teams[1].id,
+            "player": self.player.id,
+            "expected_sequence": 1,
+        }, format="json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["current_sequence"], 2)
+        self.assertEqual(self.match.score_events.count(), 2)
+
+    def test_retried_batch_gets_its_results_not_a_conflict(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        batch = {
+            "match": self.match.id,
+            "expected_sequence": 0,
+            "events": [
+                {
+                    "event_type": "TOUCH",
+                    "attacking_team": self.teams[0].id,
+                    "defending_team": self.teams[1].id,
+                    "player": self.player.id,
+                    "client_event_id": f"device-1-{n}",
+                }
+                for n in range(2)
+            ],
+        }
+
+        first = client.post("/api/scoring/create-score/batch/", batch, format="json")
+        retry = client.post("/api/scoring/create-score/batch/", batch, format="json")
+
+        self.assertEqual(retry.status_code, first.status_code)
+        self.assertEqual(
+            [r["score_id"] for r in retry.data["results"]],
+            [r["score_id"] for r in first.data["results"]]
+        )
+        self.assertTrue(all(r["duplicate"] for r in retry.data["results"]))
+        self.assertEqual(self.match.score_events.count(), 2)
+
+        # with a new event in it, the stale sequence is still refused
+        batch["events"].append({**batch["events"][0], "client_event_id": "device-1-2"})
+        response = client.post("/api/scoring/create-score/batch/", batch, format="json")
+        self.assertEqual(response.status_code, 409)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class IdempotentScoringTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+        self.player = self.teams[0].players.first()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_retried_submission_returns_the_original_event(self):
+        data = {
+            "match": self.match.id,
+            "event_type": "TOUCH",
+            "attacking_team": self.teams[0].id,
+            "defending_team": self.teams[1].id,
+            "player": self.player.id,
+            "client_event_id": "device-1-1",
+        }
+
+        first = self.client.post("/api/scoring/create-score/", data, format="json")
+        self.assertEqual(first.status_code, 201)
+
+        retry = self.client.post("/api/scoring/create-score/", data, format="json")
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.data["score_id"], first.data["score_id"])
+
+        # a retry that raced the original, caught under the totals lock
+        event = create_score_event(
+            match=self.match,
+            event_type="TOUCH",
+            user=self.user,
+            attacking_team=self.teams[0],
+            defending_team=self.teams[1],
+            player=self.player,
+            client_event_id="device-1-1",
+        )
+        self.assertEqual(event.id, first.data["score_id"])
+
+        self.assertEqual(self.match.score_events.count(), 1)
+        self.assertEqual(MatchScore.objects.get(match=self.match).team_a_score, 1)
+
+
+    def test_retried_batch_with_numeric_ids_is_recognised(self):
+        event = {
+            "event_type": "TOUCH",
+            "attacking_team": self.teams[0].id,
+            "defending_team": self.teams[1].id,
+            "player": self.player.id,
+        }
+        batch = {
+            "match": self.match.id,
+            "events": [{**event, "client_event_id": n} for n in (7, 8)],
+        }
+
+        first = self.client.post("/api/scoring/create-score/batch/", batch, format="json")
+        self.assertEqual(first.status_code, 201)
+
+        retry = self.client.post("/api/scoring/create-score/batch/", batch, format="json")
+        self.assertEqual(
+            [r["score_id"] for r in retry.data["results"]],
+            [r["score_id"] for r in first.data["results"]]
+        )
+        self.assertTrue(all(r["duplicate"] for r in retry.data["results"]))
+
+        # the single path finds the same keys
+        response = self.client.post(
+            "/api/scoring/create-score/",
+            {**event, "match": self.match.id, "client_event_id": 7},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["score_id"], first.data["results"][0]["score_id"])
+
+        # keys that are neither strings nor numbers are refused per item
+        batch["events"] = [
+            {**event, "client_event_id": {"id": 9}},
+            {**event, "client_event_id": [9]},
+            {**event, "client_event_id": "9"},
+        ]
+        response = self.client.post("/api/scoring/create-score/batch/", batch, format="json")
+        self.assertEqual(
+            [r["success"] for r in response.data["results"]], [False, False, True]
+        )
+        self.assertEqual(self.match.score_events.count(), 3)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class UndoScoreEventTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_undo_records_a_correction_once(self):
+        event = create_score_event(
+            match=self.match,
+            event_type="OUT",
+            user=self.user,
+            attacking_team=self.teams[0],
+            defending_team=self.teams[1],
+            player=self.teams[0].players.first(),
+        )
+        url = f"/api/scoring/undo/{self.match.id}/{event.id}/"
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 201)
+        correction = self.match.score_events.get(id=response.data["score_id"])
+        self.assertEqual(
+            (correction.reverses_id, correction.points, correction.sequence),
+            (event.id, -1, 2)
+        )
+
+        score = MatchScore.objects.get(match=self.match)
+        self.assertEqual((score.team_a_score, score.batch_outs), (0, 0))
+
+        # neither the original nor its correction can be undone again
+        self.assertEqual(self.client.post(url).status_code, 400)
+        response = self.client.post(
+            f"/api/scoring/undo/{self.match.id}/{correction.id}/"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.match.score_events.count(), 2)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True, MATCH_SNAPSHOT_INTERVAL=5)
+class SnapshotReplayTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+
+    def score(self, event_type, attacking, player):
+        return create_score_event(
+            match=self.match,
+            event_type=event_type,
+            user=self.user,
+            attacking_team=self.teams[attacking],
+            defending_team=self.teams[1 - attacking],
+            player=player,
+        )
+
+    def full_replay(self):
+        state = empty_state(self.match)
+        for event in tail_events(self.match, 0):
+            apply_event(state, self.match, event)
+        return state
+
+    def test_replay_from_snapshot_equals_full_replay(self):
+        players = [team.players.first() for team in self.teams]
+        events = [
+            self.score(event_type, index % 2, players[index % 2])
+            for index, event_type in enumerate(
+                ["TOUCH", "OUT", "BONUS", "FOUL", "TOUCH", "OUT", "TOUCH"] * 2
+            )
+        ]
+        reverse_score_event(match=self.match, event_id=events[1].id, user=self.user)
+
+        # 15 events: snapshots at 5, 10 and 15
+        self.assertEqual(
+            list(MatchSnapshot.objects.filter(match=self.match).order_by(
+                "event_count"
+            ).values_list("event_count", flat=True)),
+            [5, 10, 15]
+        )
+        self.score("TOUCH", 0, players[0])
+
+        state = replay_match(self.match)
+        self.assertEqual(state["replayed_events"], 1)
+
+        expected = self.full_replay()
+        for field in expected:
+            self.assertEqual(state[field], expected[field], field)
+
+        score = MatchScore.objects.get(match=self.match)
+        self.assertEqual(
+            (state["team_a_score"], state["team_b_score"], state["event_count"]),
+            (score.team_a_score, score.team_b_score, score.event_count)
+        )
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class ArchiveTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+
+    def test_archived_match_reads_back_the_same(self):
+        player = self.teams[1].players.first()
+        events = [
+            create_score_event(
+                match=self.match,
+                event_type=event_type,
+                user=self.user,
+                attacking_team=self.teams[1],
+                defending_team=self.teams[0],
+                player=player,
+            )
+            for event_type in ["TOUCH", "OUT", "BONUS", "TOUCH"]
+        ]
+        reverse_score_event(match=self.match, event_id=events[2].id, user=self.user)
+        end_match(self.match)
+
+        # only matches that ended long enough ago are picked
+        self.assertNotIn(self.match, matches_to_archive())
+        Match.objects.filter(id=self.match.id).update(
+            ended_at=timezone.now() - timedelta(days=31)
+        )
+        self.assertIn(self.match, matches_to_archive())
+
+        totals = aggregate_match_scores(self.match)
+        recent = get_recent_events(self.match)
+        MatchSnapshot.objects.filter(match=self.match).delete()
+        state = replay_match(self.match)
+
+        self.assertEqual(archive_match(self.match), 5)
+        self.assertFalse(self.match.score_events.exists())
+        self.assertNotIn(self.match, matches_to_archive())
+
+        self.assertEqual(aggregate_match_scores(self.match), totals)
+        self.assertEqual(get_recent_events(self.match), recent)
+        self.assertEqual(replay_match(self.match), state)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class EventExportTests(TestCase):
+
+    def setUp(self):
+        self.archived, self.teams, self.user = create_live_match()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def score(self, match, event_type):
+        return create_score_event(
+            match=match,
+            event_type=event_type,
+            user=self.user,
+            attacking_team=self.teams[0],
+            defending_team=self.teams[1],
+            player=self.teams[0].players.first(),
+        )
+
+    def second_match(self):
+        match = Match.objects.create(
+            tournament=self.archived.tournament,
+            team_a=self.teams[0],
+            team_b=self.teams[1],
+            match_number=2,
+            venue="Ground 1",
+            match_date=self.archived.match_date + timedelta(days=1),
+        )
+        MatchPlayer.objects.bulk_create([
+            MatchPlayer(match=match, player=player)
+            for player in Player.objects.filter(team__in=self.teams)
+        ])
+        MatchOfficial.objects.create(match=match, user=self.user, role="UMPIRE")
+        start_match(match)
+        match.refresh_from_db()
+        return match
+
+    def export(self, output):
+        response = self.client.get(
+            f"/api/scoring/export/{self.archived.tournament_id}/", {"output": output}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_hot_and_archived_events_are_streamed_in_order(self):
+        self.score(self.archived, "TOUCH")
+        self.score(self.archived, "OUT")
+        end_match(self.archived)
+        archive_match(self.archived)
+
+        live = self.second_match()
+        for event_type in ["BONUS", "TOUCH", "FOUL"]:
+            self.score(live, event_type)
+
+        expected = [
+            (self.archived.id, 1, "TOUCH"),
+            (self.archived.id, 2, "OUT"),
+            (live.id, 1, "BONUS"),
+            (live.id, 2, "TOUCH"),
+            (live.id, 3, "FOUL"),
+        ]
+
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+        self.assertEqual(
+            [(row["match_id"], row["sequence"], row["event_type"]) for row in rows],
+            expected
+        )
+        # names of archived events come from the tournament's teams
+        self.assertEqual(rows[0]["attacking_team"], "Team 0")
+        self.assertEqual(rows[0]["player"], "Player1 Team0")
+
+        header, *rows = csv.reader(self.export("csv").splitlines())
+        self.assertEqual(header[:4], ["match_id", "match_number", "event_id", "sequence"])
+        self.assertEqual(
+            [(int(row[0]), int(row[3]), row[7]) for row in rows],
+            expected
+        )
+
+    def test_unknown_output_is_rejected(self):
+        response = self.client.get(
+            f"/api/scoring/export/{self.archived.tournament_id}/", {"output": "xml"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class ProgressionTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+        self.started = timezone.now().replace(second=0, microsecond=0)
+        Match.objects.filter(id=self.match.id).update(started_at=self.started)
+        self.match.refresh_from_db()
+
+    def score(self, attacking, seconds):
+        event = create_score_event(
+            match=self.match,
+            event_type="TOUCH",
+            user=self.user,
+            attacking_team=self.teams[attacking],
+            defending_team=self.teams[1 - attacking],
+            player=self.teams[attacking].players.first(),
+        )
+        ScoreEvent.objects.filter(id=event.id).update(
+            timestamp=self.started + timedelta(seconds=seconds)
+        )
+
+    def series(self, bucket_minutes=1):
+        return [
+            (point["minute"], point["team_a_score"], point["team_b_score"])
+            for point in get_match_progression(self.match, bucket_minutes)["series"]
+        ]
+
+    def test_scores_are_summed_per_minute(self):
+        for attacking, seconds in [(0, 10), (1, 40), (0, 150), (0, 170)]:
+            self.score(attacking, seconds)
+
+        # the quiet second minute carries the running total
+        self.assertEqual(self.series(), [(1, 1, 1), (2, 1, 1), (3, 3, 1)])
+        self.assertEqual(self.series(2), [(2, 1, 1), (4, 3, 1)])
+
+        (tournament_series,) = get_tournament_progression(self.match.tournament_id)
+        self.assertEqual(
+            tournament_series, get_match_progression(self.match)
+        )
+
+        # archived matches are bucketed from their blob
+        end_match(self.match)
+        archive_match(self.match)
+        self.assertEqual(self.series(), [(1, 1, 1), (2, 1, 1), (3, 3, 1)])
+
+    def test_bucket_size_is_checked(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = f"/api/scoring/progression/{self.match.id}/"
+
+        self.assertEqual(client.get(url, {"bucket": 2}).status_code, 200)
+        self.assertEqual(client.get(url, {"bucket": 0}).status_code, 400)
+        self.assertEqual(client.get(url, {"bucket": "x"}).status_code, 400)
+
+
+@override_settings(SCORE_AUDIT_SYNC=True)
+class TurnAndBatchTests(TestCase):
+
+    def setUp(self):
+        self.match, self.teams, self.user = create_live_match()
+        self.player = self.teams[0].players.first()
+
+    def out(self):
+        return create_score_event(
+            match=self.match,
+            event_type="OUT",
+            user=self.user,
+            attacking_team=self.teams[0],
+            defending_team=self.teams[1],
+            player=self.player,
+        )
+
+    def test_last_batch_exhausted_records_all_out(self):
+        outs = [self.out() for _ in range(9)]
+        self.assertEqual([e.batch for e in outs], [1, 1, 1, 2, 2, 2, 3, 3, 3])
+
+        all_out = self.match.score_events.get(event_type="ALL_OUT")
+        self.assertEqual((all_out.sequence, all_out.points, all_out.turn), (10, 2, 1))
+
+        score = MatchScore.objects.get(match=self.match)
+        self.assertEqual((score.team_a_score, score.batch, score.batch_outs), (11, 1, 0))
+
+        # a correction gives the out back to the batch on the field
+        self.out()
+        reverse_score_event(match=self.match, event_id=outs[-1].id, user=self.user)
+        score.refresh_from_db()
+        self.assertEqual((score.batch, score.batch_outs), (1, 0))
+
+    def test_undoing_an_all_out_restores_the_last_batch(self):
+        get_cache().clear()
+        get_engine_registry().clear()
+        engine = get_live_engine(self.match.id)
+
+        def turn_state():
+            score = MatchScore.objects.get(match=self.match)
+            state = engine.get_state()
+            self.assertEqual(
+                (state["active_batch"], state["batch_outs"]),
+                (score.batch, score.batch_outs)
+            )
+            self.assertEqual(replay_turn_state(self.match), (1, score.batch, score.batch_outs))
+            return score.batch, score.batch_outs
+
+        with self.captureOnCommitCallbacks(execute=True):
+            outs = [self.out() for _ in range(9)]
+        all_out = self.match.score_events.get(event_type="ALL_OUT")
+        self.assertEqual(turn_state(), (1, 0))
+
+        # undoing either half of the pair takes back both
+        for event_type in ("ALL_OUT", "OUT"):
+            undone = all_out if event_type == "ALL_OUT" else outs[-1]
+            with self.subTest(undone=event_type):
+                with self.captureOnCommitCallbacks(execute=True):
+                    correction = reverse_score_event(
+                        match=self.match, event_id=undone.id, user=self.user
+                    )
+                self.assertEqual(correction.reverses_id, undone.id)
+                self.assertEqual(turn_state(), (3, 2))
+                self.assertEqual(MatchScore.objects.get(match=self.match).team_a_score, 8)
+                self.assertEqual(TurnScore.objects.get(match=self.match, turn=1).all_outs, 0)
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    outs[-1] = self.out()
+                all_out = self.match.score_events.filter(
+                    event_type="ALL_OUT", reverses__isnull=True, reversal__isnull=True
+                ).get()
+                self.assertEqual(all_out.sequence, outs[-1].sequence + 1)
+                self.assertEqual(turn_state(), (1, 0))
+
+        rebuild_match_score(self.match)
+        self.assertEqual(turn_state(), (1, 0))
+        self.assertEqual(MatchScore.objects.get(match=self.match).team_a_score, 11)
+
+    def test_bulk_path_matches_single_path(self):
+        results = create_score_events_bulk(match=self.match, user=self.user, events=[
+            {
+                "event_type": "OUT",
+                "attacking_team": self.teams[0].id,
+                "defending_team": self.teams[1].id,
+                "player": self.player.id,
+            }
+        ] * 10)
+
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(
+            list(self.match.score_events.order_by("sequence").values_list(
+                "event_type", "batch"
+            ))[8:],
+            [("OUT", 3), ("ALL_OUT", 3), ("OUT", 1)]
+        )
+
+    def test_scorers_cannot_send_all_out(self):
+        event = {
+            "event_type": "ALL_OUT",
+            "attacking_team": self.teams[0].id,
+            "defending_team": self.teams[1].id,
+        }
+
+        with self.assertRaises(ValidationError):
+            create_score_event(
+                match=self.match,
+                event_type="ALL_OUT",
+                user=self.user,
+                attacking_team=self.teams[0],
+                defending_team=self.teams[1],
+            )
+
+        results = create_score_events_bulk(match=self.match, user=self.user, events=[event])
+        self.assertFalse(results[0]["success"])
+        self.assertFalse(self.match.score_events.exists())
+
+    def test_turn_splits_are_kept_per_turn(self):
+        for _ in range(3):
+            self.out()
+
+        self.assertEqual(next_turn(self.match), 2)
+        create_score_event(
+            match=self.match,
+            event_type="TOUCH",
+            user=self.user,
+            attacking_team=self.teams[1],
+            defending_team=self.teams[0],
+            player=self.teams[1].players.first(),
+        )
+
+        with self.assertNumQueries(1):
+            turns = get_turn_scores(self.match.id)
+
+        self.assertEqual(
+            [(t["turn"], t["team_a_points"], t["team_b_points"], t["outs"]) for t in turns],
+            [(1, 3, 0, 3), (2, 0, 1, 0)]
+        )
+        self.assertEqual(
+            self.match.score_events.filter(turn=2).get().batch, 1
+        )
+
+        # rebuilt from history, the splits come out the same
+        TurnScore.objects.all().delete()
+        rebuild_turn_scores(self.match)
+        self.assertEqual(get_turn_scores(self.match.id), turns)
+
+    def test_match_scored_before_running_totals_carries_on(self):
+        for _ in range(4):
+            self.out()
+        MatchScore.objects.filter(match=self.match).delete()
+        TurnScore.objects.filter(match=self.match).delete()
+
+        event = self.out()
+
+        self.assertEqual(event.sequence, 5)
+        score = MatchScore.objects.get(match=self.match)
+        self.assertEqual(
+            (score.team_a_score, score.event_count, score.batch, score.batch_outs),
+            (5, 5, 2, 2)
+        )
+        self.assertEqual(get_turn_scores(self.match.id)[0]["outs"], 5)
+
+    def test_migration_backfills_missing_and_zeroed_totals(self):
+        backfill = import_module(
+            "scoring.migrations.0013_backfill_match_scores"
+        ).backfill_match_scores
+
+        for _ in range(4):
+            self.out()
+        expected = get_turn_scores(self.match.id)
+        stats = list(self.player.tournament_stats.values("outs", "points"))
+
+        MatchScore.objects.filter(match=self.match).update(
+            team_a_score=0, event_count=0, batch=1, batch_outs=0
+        )
+        TurnScore.objects.all().delete()
+        self.player.match_stats.all().delete()
+        self.player.tournament_stats.all().delete()
+
+        backfill(django_apps, None)
+
+        score = MatchScore.objects.get(match=self.match)
+        self.assertEqual(
+            (score.team_a_score, score.event_count, score.batch, score.batch_outs),
+            (4, 4, 2, 1)
+        )
+        self.assertEqual(get_turn_scores(self.match.id), expected)
+        self.assertEqual(list(self.player.tournament_stats.values("outs", "points")), stats)
+
+    def test_simulated_match_gets_the_expected_all_outs(self):
+        lineup = playing_ids(self.match)
+        simulator = MatchSimulator(
+            (self.teams[0].id, lineup[self.teams[0].id]),
+            (self.teams[1].id, lineup[self.teams[1].id]),
+            turn_seconds=300,
+            seed=7,
+        )
+        scorer = ServiceScorer(self.match, self.user)
+
+        plays, turn = 0, 1
+        for play in simulator.plays():
+            if play["turn"] != turn:
+                scorer.next_turn()
+                turn = play["turn"]
+            scorer.score(play, f"sim-{plays}")
+            plays += 1
+
+        self.assertGreater(simulator.all_outs, 0)
+        self.assertEqual(
+            self.match.score_events.filter(event_type="ALL_OUT").count(),
+            simulator.all_outs
+        )
+        self.assertEqual(self.match.score_events.count(), plays + simulator.all_outs)
+        self.assertEqual(MatchScore.objects.get(match=self.match).turn, 4)
+
+
+@skipUnless(
+    connection.features.has_select_for_update,
+    "needs row locks (e.g. PostgreSQL)"
+)
+@override_settings(SCORE_AUDIT_SYNC=True)
+class ConcurrentScoringTests(TransactionTestCase):
+    """
+    Stress test: several scorers per match writing at the same time,
+    measured in events per second per match.
+    """
+
+    scorers = 4
+    events_per_scorer = 50
+    # Loose floor: only catches scorers serialized across matches or
+    # stuck waiting on each other's locks
+    min_events_per_second = 25
+
+    def score_from_thread(self, match, teams, user, errors):
+        try:
+            player = teams[0].players.first()
+            for _ in range(self.events_per_scorer):
+                create_score_event(
+                    match=match,
+                    event_type="TOUCH",
+                    user=user,
+                    attacking_team=teams[0],
+                    defending_team=teams[1],
+                    player=player,
+                )
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connections.close_all()
+
+    def test_concurrent_scorers_get_unique_gap_free_sequences(self):
+        games = [
+            create_live_match(name=f"Cup {index}", umpire_name=f"umpire{index}")
+            for index in range(2)
+        ]
+
+        errors = []
+        threads = [
+            threading.Thread(
+                target=self.score_from_thread,
+                args=(match, teams, user, errors)
+            )
+            for match, teams, user in games
+            for _ in range(self.scorers)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(errors, [])
+
+        per_match = self.scorers * self.events_per_scorer
+        for match, _, _ in games:
+            sequences = list(match.score_events.order_by("sequence").values_list(
+                "sequence", flat=True
+            ))
+            self.assertEqual(sequences, list(range(1, per_match + 1)))
+            self.assertEqual(match.score.event_count, per_match)
+
+        rate = per_match / elapsed
+        self.assertGreaterEqual(
+            rate,
+            self.min_events_per_second,
+            f"{rate:,.0f} events/s per match "
+            f"({self.scorers} scorers x {len(games)} matches)"
+        )
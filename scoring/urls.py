@@ -1,7 +1,26 @@
 from django.urls import path
-from .views import CreateScoreEventAPI, MatchScoreboardAPI
+from .views import (
+    CreateScoreEventAPI,
+    CreateScoreEventBatchAPI,
+    LiveCacheStatsAPI,
+    MatchProgressionAPI,
+    MatchReplayAPI,
+    MatchScoreboardAPI,
+    TournamentEventExportAPI,
+    TournamentProgressionAPI,
+    TurnScoresAPI,
+    UndoScoreEventAPI,
+)
 
 urlpatterns = [
     path('create-score/', CreateScoreEventAPI.as_view()),
+    path('create-score/batch/', CreateScoreEventBatchAPI.as_view()),
+    path('undo/<int:match_id>/<int:event_id>/', UndoScoreEventAPI.as_view()),
     path('scoreboard/<int:match_id>/', MatchScoreboardAPI.as_view()),
+    path('replay/<int:match_id>/', MatchReplayAPI.as_view()),
+    path('progression/<int:match_id>/', MatchProgressionAPI.as_view()),
+    path('progression/tournament/<int:tournament_id>/', TournamentProgressionAPI.as_view()),
+    path('turns/<int:match_id>/', TurnScoresAPI.as_view()),
+    path('export/<int:tournament_id>/', TournamentEventExportAPI.as_view()),
+    path('cache-stats/', LiveCacheStatsAPI.as_view()),
 ]
@@ -4,19 +4,55 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
 from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
 
-from common.responses import error_response, success_response
+from common.responses import (
+    error_response,
+    etag_matches,
+    match_etag,
+    not_modified_response,
+    success_response,
+)
 from teams.models import Team
 from players.models import Player
 from matches.models import Match
+from tournaments.models import Tournament
+from common.cache import cache_stats
 from common.permissions import IsMatchOfficialWithRole
-from .services import create_score_event, get_match_scoreboard
+from .services import (
+    SequenceConflict,
+    create_score_event,
+    create_score_events_bulk,
+    find_score_event_id,
+    get_cached_scoreboard,
+    reverse_score_event,
+    validate_client_event_id,
+)
+from .export import (
+    EXPORT_FORMATS,
+    render_events,
+    streaming_content,
+    tournament_event_rows,
+)
+from .progression import get_match_progression, get_tournament_progression
+from .snapshots import replay_match
+from .stats import get_turn_scores
+
+
+def sequence_conflict_response(conflict):
+    return Response(
+        {
+            "error": "Match has new events, refresh and retry",
+            "expected_sequence": conflict.expected_sequence,
+            "current_sequence": conflict.current_sequence,
+        },
+        status=status.HTTP_409_CONFLICT
+    )
 
 
 class CreateScoreEventAPI(APIView):
     permission_classes = [IsAuthenticated, IsMatchOfficialWithRole]
-
-    IsMatchOfficialWithRole.allowed_roles = ["UMPIRE"]
+    official_roles = ["UMPIRE"]
 
     def post(self, request):
         try:
@@ -25,6 +61,10 @@ class CreateScoreEventAPI(APIView):
             attacking_team_id = request.data.get("attacking_team")
             defending_team_id = request.data.get("defending_team")
             player_id = request.data.get("player")
+            client_event_id = validate_client_event_id(
+                request.data.get("client_event_id")
+            )
+            expected_sequence = request.data.get("expected_sequence")
 
             if not all([match_id, attacking_team_id, defending_team_id]):
                 return Response(
@@ -32,6 +72,25 @@ class CreateScoreEventAPI(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
+            # Retried submission: answer from the index, skip validation
+            if client_event_id:
+                existing_id = find_score_event_id(match_id, client_event_id)
+
+                if existing_id is not None:
+                    return Response(
+                        {"message": "Score already recorded", "score_id": existing_id},
+                        status=status.HTTP_200_OK
+                    )
+
+            if expected_sequence is not None:
+                try:
+                    expected_sequence = int(expected_sequence)
+                except (TypeError, ValueError):
+                    return Response(
+                        {"error": "expected_sequence must be a number"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+
             match = Match.objects.get(id=match_id)
             attacking_team = Team.objects.get(id=attacking_team_id)
             defending_team = Team.objects.get(id=defending_team_id)
@@ -43,14 +102,23 @@ class CreateScoreEventAPI(APIView):
                 user=request.user,
                 attacking_team=attacking_team,
                 defending_team=defending_team,
-                player=player
+                player=player,
+                client_event_id=client_event_id,
+                expected_sequence=expected_sequence
             )
 
             return Response(
-                {"message": "Score added successfully", "score_id": score_event.id},
+                {
+                    "message": "Score added successfully",
+                    "score_id": score_event.id,
+                    "sequence": score_event.sequence,
+                },
                 status=status.HTTP_201_CREATED
             )
 
+        except SequenceConflict as e:
+            return sequence_conflict_response(e)
+
         except Match.DoesNotExist:
             return Response({"error": "Match not found"}, status=404)
 
@@ -64,6 +132,104 @@ class CreateScoreEventAPI(APIView):
             return Response({"error": str(e)}, status=400)
 
 
+class CreateScoreEventBatchAPI(APIView):
+    """
+    Accepts a list of buffered score events for one match, e.g. replayed
+    by a scorer device after it regains connectivity.
+    """
+    permission_classes = [IsAuthenticated, IsMatchOfficialWithRole]
+    official_roles = ["UMPIRE"]
+
+    MAX_EVENTS = 200
+
+    def post(self, request):
+        match_id = request.data.get("match")
+        events = request.data.get("events")
+        expected_sequence = request.data.get("expected_sequence")
+
+        if not match_id or not isinstance(events, list) or not events:
+            return Response(
+                {"error": "match and a non-empty events list are required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if len(events) > self.MAX_EVENTS:
+            return Response(
+                {"error": f"At most {self.MAX_EVENTS} events per batch"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not all(isinstance(event, dict) for event in events):
+            return Response(
+                {"error": "Each event must be an object"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if expected_sequence is not None:
+            try:
+                expected_sequence = int(expected_sequence)
+            except (TypeError, ValueError):
+                return Response(
+                    {"error": "expected_sequence must be a number"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        try:
+            match = Match.objects.get(id=match_id)
+            results = create_score_events_bulk(
+                match=match,
+                events=events,
+                user=request.user,
+                expected_sequence=expected_sequence
+            )
+        except Match.DoesNotExist:
+            return Response({"error": "Match not found"}, status=404)
+        except SequenceConflict as e:
+            return sequence_conflict_response(e)
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=400)
+
+        created = sum(1 for result in results if result["success"])
+
+        return Response(
+            {
+                "message": f"{created} of {len(results)} scores added",
+                "results": results,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        )
+
+
+class UndoScoreEventAPI(APIView):
+    """
+    Correct a mistaken score by recording a reversing event.
+    """
+    permission_classes = [IsAuthenticated, IsMatchOfficialWithRole]
+    official_roles = ["UMPIRE"]
+
+    def post(self, request, match_id, event_id):
+        try:
+            match = Match.objects.get(id=match_id)
+            correction = reverse_score_event(
+                match=match,
+                event_id=event_id,
+                user=request.user
+            )
+        except Match.DoesNotExist:
+            return Response({"error": "Match not found"}, status=404)
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response(
+            {
+                "message": "Score reversed successfully",
+                "score_id": correction.id,
+                "reverses": event_id,
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+
 class MatchScoreboardAPI(APIView):
     def get(self, request, match_id):
         try:
@@ -74,10 +240,163 @@ class MatchScoreboardAPI(APIView):
                 status_code=404
             )
 
-        data = get_match_scoreboard(match)
-        return success_response(
+        # Unchanged since the client's last poll
+        etag = match_etag(match.id, match.version)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+
+        data = get_cached_scoreboard(match)
+        response = success_response(
             "Scoreboard fetched successfully",
             data=data,
             status_code=200
             )
+        response["ETag"] = etag
+        return response
+
+
+class MatchReplayAPI(APIView):
+    """
+    Current derived state (scores, per-player tallies) rebuilt from the
+    latest snapshot plus the events after it.
+    """
+
+    def get(self, request, match_id):
+        try:
+            match = Match.objects.get(id=match_id)
+        except Match.DoesNotExist:
+            return error_response(
+                "Match not found",
+                status_code=404
+            )
+
+        return success_response(
+            "Match state replayed successfully",
+            data=replay_match(match)
+        )
+
+
+def bucket_minutes_param(request):
+    """
+    ?bucket=<minutes>, 1 to 60, default 1. None if invalid.
+    """
+    try:
+        bucket = int(request.query_params.get("bucket", 1))
+    except ValueError:
+        return None
+
+    return bucket if 1 <= bucket <= 60 else None
+
+
+class MatchProgressionAPI(APIView):
+    """
+    Cumulative score per team per minute (or ?bucket= minutes) of a match,
+    for momentum charts.
+    """
+
+    def get(self, request, match_id):
+        bucket = bucket_minutes_param(request)
+
+        if bucket is None:
+            return error_response("bucket must be between 1 and 60 minutes")
+
+        try:
+            match = Match.objects.get(id=match_id)
+        except Match.DoesNotExist:
+            return error_response(
+                "Match not found",
+                status_code=404
+            )
+
+        return success_response(
+            "Score progression fetched successfully",
+            data=get_match_progression(match, bucket)
+        )
+
+
+class TurnScoresAPI(APIView):
+    """
+    Per-turn score split of a match, one stored row per turn.
+    """
+
+    def get(self, request, match_id):
+        turns = get_turn_scores(match_id)
+
+        if not turns and not Match.objects.filter(id=match_id).exists():
+            return error_response(
+                "Match not found",
+                status_code=404
+            )
+
+        return success_response(
+            "Turn scores fetched successfully",
+            data={"match_id": match_id, "turns": turns}
+        )
+
+
+class TournamentProgressionAPI(APIView):
+    """
+    Score progression of every match of a tournament in one response.
+    """
+
+    def get(self, request, tournament_id):
+        bucket = bucket_minutes_param(request)
+
+        if bucket is None:
+            return error_response("bucket must be between 1 and 60 minutes")
+
+        if not Tournament.objects.filter(id=tournament_id).exists():
+            return error_response(
+                "Tournament not found",
+                status_code=404
+            )
+
+        return success_response(
+            "Score progression fetched successfully",
+            data=get_tournament_progression(tournament_id, bucket)
+        )
+
+
+class TournamentEventExportAPI(APIView):
+    """
+    Every score event of a tournament as NDJSON (default) or CSV,
+    streamed row by row: ?output=ndjson|csv
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, tournament_id):
+        # "format" is taken by DRF's content negotiation
+        output = request.query_params.get("output", "ndjson")
+
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"error": "output must be ndjson or csv"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not Tournament.objects.filter(id=tournament_id).exists():
+            return Response({"error": "Tournament not found"}, status=404)
+
+        rows = tournament_event_rows(tournament_id)
+
+        response = StreamingHttpResponse(
+            streaming_content(request._request, render_events(rows, output)),
+            content_type=EXPORT_FORMATS[output]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tournament-{tournament_id}-events.{output}"'
+        )
+        return response
+
+
+class LiveCacheStatsAPI(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.role != "ADMIN":
+            return Response(
+                {"error": "Only admin can view cache statistics"},
+                status=status.HTTP_403_FORBIDDEN
+            )
 
+        return Response(cache_stats(), status=status.HTTP_200_OK)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Tournament
+from .models import KnockoutSlot, Tournament
 
 
 @admin.register(Tournament)
@@ -58,4 +58,10 @@ class TournamentAdmin(admin.ModelAdmin):
     )
     def save(self, *args, **kwargs):
         self.full_clean()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+@admin.register(KnockoutSlot)
+class KnockoutSlotAdmin(admin.ModelAdmin):
+    list_display = ("tournament", "round_number", "position", "team_a", "team_b", "winner", "match")
+    list_filter = ("tournament",)
@@ -0,0 +1,303 @@
+# tournaments/bracket.py
+import logging
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from matches.models import Match
+from .models import KnockoutSlot
+from .scheduling import DEFAULT_MATCH_MINUTES, DEFAULT_REST_MINUTES, TeamCalendar
+from .utils import bulk_create_matches
+
+
+logger = logging.getLogger(__name__)
+
+
+def bracket_size(team_count):
+    size = 1
+    while size < team_count:
+        size *= 2
+    return size
+
+
+def seed_order(size):
+    """
+    Seeds in bracket order, paired two by two into round 1 slots, so the
+    top seeds can only meet late: 8 -> [1, 8, 4, 5, 2, 7, 3, 6].
+    """
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+def next_slot_key(slot):
+    """
+    (round, position, side) the slot's winner moves to.
+    """
+    return slot.round_number + 1, slot.position // 2, "a" if slot.position % 2 == 0 else "b"
+
+
+def next_match_date(tournament, slot, feeders):
+    """
+    A day after the later feeder match (or the round's day for a slot fed
+    by byes), moved to the first start from there at which both teams are
+    free and rested, within the tournament. None if there is none left.
+    """
+    dates = [match.match_date for match in feeders if match is not None]
+
+    if dates:
+        match_date = max(dates) + timedelta(days=1)
+    else:
+        match_date = timezone.make_aware(datetime.combine(
+            tournament.start_date + timedelta(days=slot.round_number - 1),
+            time.min
+        ))
+
+    last_day = timezone.make_aware(datetime.combine(tournament.end_date, time.min))
+    length = timedelta(minutes=DEFAULT_MATCH_MINUTES)
+    calendar = TeamCalendar(
+        timedelta(minutes=DEFAULT_MATCH_MINUTES + DEFAULT_REST_MINUTES)
+    )
+
+    team_ids = [slot.team_a_id, slot.team_b_id]
+    for start, team_a_id, team_b_id in Match.objects.filter(
+        Q(team_a_id__in=team_ids) | Q(team_b_id__in=team_ids)
+    ).values_list("match_date", "team_a_id", "team_b_id"):
+        calendar.add(team_a_id, start)
+        calendar.add(team_b_id, start)
+
+    # Moved back to the last day, it must still follow the feeders
+    start = min(match_date, last_day)
+    if dates:
+        start = max(start, max(dates) + calendar.gap)
+
+    last_start = timezone.make_aware(
+        datetime.combine(tournament.end_date, time.max)
+    ) - length
+
+    while start <= last_start:
+        if all(calendar.is_free(team_id, start) for team_id in team_ids):
+            return start
+        start += length
+
+    return None
+
+
+def advance(slot):
+    """
+    Move a decided slot's winner into its next-round slot and create
+    that slot's match once both teams are known. Only the next slot is
+    read and written, under a row lock so the two feeders of a slot can
+    finish at the same time. Call inside a transaction.
+    """
+    round_number, position, side = next_slot_key(slot)
+
+    target = KnockoutSlot.objects.select_for_update().filter(
+        tournament_id=slot.tournament_id,
+        round_number=round_number,
+        position=position
+    ).first()
+
+    # The final has no next slot
+    if target is None:
+        return None
+
+    seed = slot.seed_a if slot.winner_id == slot.team_a_id else slot.seed_b
+
+    setattr(target, f"team_{side}_id", slot.winner_id)
+    setattr(target, f"seed_{side}", seed)
+    update_fields = [f"team_{side}", f"seed_{side}"]
+
+    if target.team_a_id and target.team_b_id and target.match_id is None:
+        feeders = Match.objects.filter(
+            bracket_slot__tournament_id=slot.tournament_id,
+            bracket_slot__round_number=slot.round_number,
+            bracket_slot__position__in=[position * 2, position * 2 + 1]
+        )
+        feeders = list(feeders)
+        venue = feeders[0].venue if feeders else "TBD"
+        tournament = slot.tournament
+        match_date = next_match_date(tournament, target, feeders)
+
+        # Left for the organisers to schedule rather than failing the
+        # result that decided the slot: get_bracket shows both teams
+        # without a match
+        try:
+            if match_date is None:
+                raise ValidationError("No free time left in the tournament")
+
+            target.match = Match.objects.create(
+                tournament=tournament,
+                team_a_id=target.team_a_id,
+                team_b_id=target.team_b_id,
+                round_number=round_number,
+                match_date=match_date,
+                venue=venue,
+                status="SCHEDULED"
+            )
+            update_fields.append("match")
+        except ValidationError as e:
+            logger.warning(
+                "Knockout match of round %s, position %s (tournament %s) "
+                "not scheduled: %s",
+                round_number, position, slot.tournament_id, e
+            )
+
+    target.save(update_fields=update_fields)
+    return target
+
+
+def generate_knockout_bracket(tournament, team_ids, venue="TBD"):
+    """
+    Build every slot of a single-elimination bracket for `team_ids`, given
+    in seed order (best first). Round 1 matches are created one per day
+    from the start date; seeds without an opponent get a bye and go
+    straight to round 2. Returns the round 1 matches.
+    """
+    team_ids = list(team_ids)
+
+    if len(team_ids) < 2:
+        raise ValidationError("At least 2 teams are required for a knockout")
+
+    if len(set(team_ids)) != len(team_ids):
+        raise ValidationError("A team can only be seeded once")
+
+    size = bracket_size(len(team_ids))
+    order = seed_order(size)
+
+    def team_for(seed):
+        return team_ids[seed - 1] if seed <= len(team_ids) else None
+
+    with transaction.atomic():
+
+        if KnockoutSlot.objects.filter(tournament=tournament).exists():
+            raise ValidationError("Bracket has already been generated for this tournament")
+
+        slots = []
+        round_number, slots_in_round = 1, size // 2
+        while slots_in_round >= 1:
+            for position in range(slots_in_round):
+                slot = KnockoutSlot(
+                    tournament=tournament,
+                    round_number=round_number,
+                    position=position
+                )
+                if round_number == 1:
+                    seed_a, seed_b = order[position * 2], order[position * 2 + 1]
+                    slot.team_a_id = team_for(seed_a)
+                    slot.team_b_id = team_for(seed_b)
+                    slot.seed_a = seed_a if slot.team_a_id else None
+                    slot.seed_b = seed_b if slot.team_b_id else None
+                slots.append(slot)
+            round_number += 1
+            slots_in_round //= 2
+
+        slots = KnockoutSlot.objects.bulk_create(slots)
+        first_round = [slot for slot in slots if slot.round_number == 1]
+        playing = [slot for slot in first_round if slot.team_a_id and slot.team_b_id]
+
+        matches = bulk_create_matches(tournament, [
+            {
+                'team_a': slot.team_a_id,
+                'team_b': slot.team_b_id,
+                'round': 1,
+                'match_date': timezone.make_aware(datetime.combine(
+                    tournament.start_date + timedelta(days=index), time.min
+                )),
+                'venue': venue,
+            }
+            for index, slot in enumerate(playing)
+        ])
+
+        for slot, match in zip(playing, matches):
+            slot.match = match
+        KnockoutSlot.objects.bulk_update(playing, ["match"])
+
+        # Byes: the seeded team goes through without playing
+        for slot in first_round:
+            if slot.match_id is None:
+                slot.winner_id = slot.team_a_id or slot.team_b_id
+                slot.save(update_fields=["winner"])
+                advance(slot)
+
+    return matches
+
+
+def advance_winner(match, winner_id):
+    """
+    end_match hook: record the winner of a knockout match and move them
+    on. No-op for league matches and for draws, which the organisers
+    have to settle before the bracket can continue.
+    """
+    if winner_id is None:
+        return None
+
+    with transaction.atomic():
+        slot = KnockoutSlot.objects.select_for_update().select_related(
+            "tournament"
+        ).filter(match_id=match.id).first()
+
+        if slot is None or slot.winner_id is not None:
+            return None
+
+        slot.winner_id = winner_id
+        slot.save(update_fields=["winner"])
+
+        return advance(slot)
+
+
+def get_bracket(tournament_id):
+    """
+    The whole bracket, teams, winners and results included, read in one
+    query and grouped by round.
+    """
+    slots = KnockoutSlot.objects.filter(
+        tournament_id=tournament_id
+    ).order_by("round_number", "position").values(
+        "round_number",
+        "position",
+        "team_a_id",
+        "team_a__name",
+        "seed_a",
+        "team_b_id",
+        "team_b__name",
+        "seed_b",
+        "winner_id",
+        "match_id",
+        "match__status",
+        "match__match_date",
+        "match__result__team_a_score",
+        "match__result__team_b_score",
+    )
+
+    rounds = {}
+    for slot in slots:
+        rounds.setdefault(slot["round_number"], []).append({
+            "position": slot["position"],
+            "team_a": {
+                "id": slot["team_a_id"],
+                "name": slot["team_a__name"],
+                "seed": slot["seed_a"],
+            } if slot["team_a_id"] else None,
+            "team_b": {
+                "id": slot["team_b_id"],
+                "name": slot["team_b__name"],
+                "seed": slot["seed_b"],
+            } if slot["team_b_id"] else None,
+            "winner_id": slot["winner_id"],
+            "match_id": slot["match_id"],
+            "status": slot["match__status"],
+            "match_date": slot["match__match_date"],
+            "team_a_score": slot["match__result__team_a_score"],
+            "team_b_score": slot["match__result__team_b_score"],
+        })
+
+    return [
+        {"round": round_number, "slots": round_slots}
+        for round_number, round_slots in rounds.items()
+    ]
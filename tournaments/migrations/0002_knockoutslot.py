@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_match_version'),
+        ('teams', '0002_alter_team_options_team_captain_name_and_more'),
+        ('tournaments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KnockoutSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round_number', models.PositiveIntegerField()),
+                ('position', models.PositiveIntegerField()),
+                ('seed_a', models.PositiveIntegerField(blank=True, null=True)),
+                ('seed_b', models.PositiveIntegerField(blank=True, null=True)),
+                ('match', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bracket_slot', to='matches.match')),
+                ('team_a', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team')),
+                ('team_b', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bracket_slots', to='tournaments.tournament')),
+                ('winner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team')),
+            ],
+            options={
+                'ordering': ['round_number', 'position'],
+                'unique_together': {('tournament', 'round_number', 'position')},
+            },
+        ),
+    ]
@@ -89,3 +89,62 @@ class Tournament(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.age_group} - {self.gender})"
+
+
+class KnockoutSlot(models.Model):
+    """
+    One position of a knockout bracket. Round 1 slots hold seeded teams,
+    later slots are filled by the winners of slots 2 * position and
+    2 * position + 1 of the previous round (see tournaments.bracket).
+    """
+
+    tournament = models.ForeignKey(
+        Tournament,
+        on_delete=models.CASCADE,
+        related_name="bracket_slots"
+    )
+
+    round_number = models.PositiveIntegerField()
+    position = models.PositiveIntegerField()
+
+    team_a = models.ForeignKey(
+        "teams.Team",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+    team_b = models.ForeignKey(
+        "teams.Team",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+
+    seed_a = models.PositiveIntegerField(null=True, blank=True)
+    seed_b = models.PositiveIntegerField(null=True, blank=True)
+
+    match = models.OneToOneField(
+        "matches.Match",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="bracket_slot"
+    )
+
+    # Set when the slot's match ends, or straight away for a bye
+    winner = models.ForeignKey(
+        "teams.Team",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+
+    class Meta:
+        unique_together = ("tournament", "round_number", "position")
+        ordering = ["round_number", "position"]
+
+    def __str__(self):
+        return f"{self.tournament} | round {self.round_number} slot {self.position}"
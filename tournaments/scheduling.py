@@ -0,0 +1,197 @@
+# tournaments/scheduling.py
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from matches.models import Match
+from .utils import bulk_create_matches, generate_round_robin_fixtures
+
+
+DEFAULT_DAY_START = time(9, 0)
+DEFAULT_DAY_END = time(18, 0)
+DEFAULT_MATCH_MINUTES = 60
+DEFAULT_REST_MINUTES = 120
+
+
+def generate_slot_times(start_date, end_date, day_start, day_end, match_minutes):
+    """
+    Aware start times of every match slot between the two dates,
+    in order, in the current time zone.
+    """
+    length = timedelta(minutes=match_minutes)
+    times = []
+
+    day = start_date
+    while day <= end_date:
+        start = timezone.make_aware(datetime.combine(day, day_start))
+        last_start = timezone.make_aware(datetime.combine(day, day_end)) - length
+
+        while start <= last_start:
+            times.append(start)
+            start += length
+
+        day += timedelta(days=1)
+
+    return times
+
+
+class TeamCalendar:
+    """
+    Sorted start times of every team's matches. Free checks are bisect
+    lookups for the neighbouring matches, not queries.
+    """
+
+    def __init__(self, gap):
+        # a team's matches must start at least `gap` apart
+        self.gap = gap
+        self.starts = {}
+
+    def add(self, team_id, start):
+        insort(self.starts.setdefault(team_id, []), start)
+
+    def is_free(self, team_id, start):
+        starts = self.starts.get(team_id)
+        if not starts:
+            return True
+
+        index = bisect_left(starts, start)
+
+        if index < len(starts) and starts[index] - start < self.gap:
+            return False
+
+        if index > 0 and start - starts[index - 1] < self.gap:
+            return False
+
+        return True
+
+
+def schedule_fixtures(
+    fixtures,
+    venues,
+    slot_times,
+    match_minutes=DEFAULT_MATCH_MINUTES,
+    rest_minutes=DEFAULT_REST_MINUTES,
+    existing=(),
+):
+    """
+    Greedily place each fixture (dicts with team_a, team_b, round) in the
+    earliest venue slot where both teams are free and rested.
+    `existing` is (start, venue, team_a, team_b) of matches already booked.
+
+    Returns (scheduled, unplaced): scheduled fixtures carry match_date and
+    venue and are sorted by start time, unplaced are returned as given.
+    """
+    calendar = TeamCalendar(
+        timedelta(minutes=match_minutes + rest_minutes)
+    )
+
+    # slot index -> venues still free at that time
+    free_venues = [list(venues) for _ in slot_times]
+
+    length = timedelta(minutes=match_minutes)
+
+    for start, venue, team_a_id, team_b_id in existing:
+        calendar.add(team_a_id, start)
+        calendar.add(team_b_id, start)
+
+        # every slot that overlaps the booked match loses the venue
+        for index in range(
+            bisect_right(slot_times, start - length),
+            bisect_left(slot_times, start + length)
+        ):
+            if venue in free_venues[index]:
+                free_venues[index].remove(venue)
+
+    # Slots before this one are fully booked
+    first_open = 0
+
+    scheduled = []
+    unplaced = []
+
+    for fixture in fixtures:
+        while first_open < len(slot_times) and not free_venues[first_open]:
+            first_open += 1
+
+        for index in range(first_open, len(slot_times)):
+            if not free_venues[index]:
+                continue
+
+            start = slot_times[index]
+
+            if not (
+                calendar.is_free(fixture['team_a'], start)
+                and calendar.is_free(fixture['team_b'], start)
+            ):
+                continue
+
+            calendar.add(fixture['team_a'], start)
+            calendar.add(fixture['team_b'], start)
+            scheduled.append({
+                **fixture,
+                'match_date': start,
+                'venue': free_venues[index].pop(0),
+            })
+            break
+        else:
+            unplaced.append(fixture)
+
+    scheduled.sort(key=lambda fix: (fix['match_date'], venues.index(fix['venue'])))
+
+    return scheduled, unplaced
+
+
+def existing_bookings(tournament, team_ids, venues):
+    """
+    Matches that already hold a venue or one of the teams during the
+    tournament, loaded in one query.
+    """
+    start = timezone.make_aware(datetime.combine(tournament.start_date, time.min))
+    end = timezone.make_aware(datetime.combine(tournament.end_date, time.max))
+
+    return list(
+        Match.objects.filter(
+            match_date__range=(start, end)
+        ).filter(
+            Q(venue__in=venues) |
+            Q(team_a_id__in=team_ids) |
+            Q(team_b_id__in=team_ids)
+        ).values_list("match_date", "venue", "team_a_id", "team_b_id")
+    )
+
+
+def schedule_matches_for_tournament(
+    tournament,
+    team_ids,
+    venues,
+    day_start=DEFAULT_DAY_START,
+    day_end=DEFAULT_DAY_END,
+    match_minutes=DEFAULT_MATCH_MINUTES,
+    rest_minutes=DEFAULT_REST_MINUTES,
+):
+    """
+    Round-robin fixtures packed into venue/time slots within the
+    tournament dates, then created with bulk_create_matches.
+    Returns (created matches, fixtures that could not be placed).
+    """
+    slot_times = generate_slot_times(
+        tournament.start_date,
+        tournament.end_date,
+        day_start,
+        day_end,
+        match_minutes
+    )
+
+    scheduled, unplaced = schedule_fixtures(
+        generate_round_robin_fixtures(team_ids),
+        venues,
+        slot_times,
+        match_minutes=match_minutes,
+        rest_minutes=rest_minutes,
+        existing=existing_bookings(tournament, team_ids, venues)
+    )
+
+    matches = bulk_create_matches(tournament, scheduled) if scheduled else []
+
+    return matches, unplaced
@@ -1,3 +1,311 @@
+import time
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from matches.models import Match
+from players.models import Player
+from teams.models import Team
+from users.models import User
+from .bracket import advance_winner, generate_knockout_bracket, get_bracket, seed_order
+from .models import KnockoutSlot, Tournament
+from .scheduling import schedule_matches_for_tournament
+from .utils import (
+    bulk_create_matches_for_tournament,
+    create_matches_for_tournament,
+)
+
+
+def create_tournament(team_count, players_per_team=7, end_date=date(2028, 12, 31)):
+    tournament = Tournament.objects.create(
+        name="Fixture Cup",
+        location="Pune",
+        gender="MEN",
+        start_date=date(2026, 1, 1),
+        end_date=end_date,
+        organizer="Test",
+    )
+
+    teams = Team.objects.bulk_create([
+        Team(
+            tournament=tournament,
+            name=f"Team {index}",
+            short_name=f"T{index}",
+            color="Red",
+            state="MH",
+            city="Pune",
+            gender="MEN",
+            age_group="SENIOR",
+        )
+        for index in range(team_count)
+    ])
+
+    Player.objects.bulk_create([
+        Player(
+            team=team,
+            first_name=f"Player{number}",
+            last_name=team.name,
+            jersey_number=number,
+            role="ALL_ROUNDER",
+            date_of_birth=date(2000, 1, 1),
+        )
+        for team in teams
+        for number in range(1, players_per_team + 1)
+    ])
+
+    return tournament, [team.id for team in teams]
+
+
+class BulkFixtureTests(TestCase):
+
+    def test_bulk_path_matches_per_match_path(self):
+        tournament, team_ids = create_tournament(6)
+
+        with transaction.atomic():
+            saved = create_matches_for_tournament(tournament, team_ids)
+            expected = [
+                (m.match_number, m.round_number, m.team_a_id, m.team_b_id, m.match_date)
+                for m in Match.objects.filter(id__in=[m.id for m in saved]).order_by("match_number")
+            ]
+            transaction.set_rollback(True)
+
+        bulk = bulk_create_matches_for_tournament(tournament, team_ids)
+
+        self.assertEqual(
+            [
+                (m.match_number, m.round_number, m.team_a_id, m.team_b_id, m.match_date)
+                for m in Match.objects.filter(tournament=tournament).order_by("match_number")
+            ],
+            expected
+        )
+        self.assertEqual(len(bulk), 15)
+
+    def test_invalid_fixtures_are_all_reported_and_nothing_is_written(self):
+        tournament, team_ids = create_tournament(4)
+        Player.objects.filter(team_id=team_ids[0], jersey_number=1).update(
+            is_active=False
+        )
+
+        with self.assertRaises(ValidationError) as raised:
+            bulk_create_matches_for_tournament(tournament, team_ids)
+
+        # team 0 plays 3 matches
+        self.assertEqual(len(raised.exception.messages), 3)
+        self.assertFalse(Match.objects.exists())
+
+    def test_generate_matches_endpoint_writes_every_fixture_once(self):
+        tournament, team_ids = create_tournament(6)
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="organizer"))
+        url = f"/api/tournaments/{tournament.id}/generate_matches/"
+
+        response = client.post(url, {"venue": "Ground 1"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 15)
+        self.assertEqual(
+            sorted(match["match_number"] for match in response.data),
+            list(range(1, 16))
+        )
+        self.assertEqual(
+            set(Match.objects.filter(tournament=tournament).values_list("venue", flat=True)),
+            {"Ground 1"}
+        )
+
+        response = client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Match.objects.filter(tournament=tournament).count(), 15)
+
+    def test_generate_matches_endpoint_reports_invalid_fixtures(self):
+        tournament, team_ids = create_tournament(4)
+        Player.objects.filter(team_id=team_ids[0], jersey_number=1).update(
+            is_active=False
+        )
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="organizer"))
+
+        response = client.post(
+            f"/api/tournaments/{tournament.id}/generate_matches/", {}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data["error"]), 3)
+        self.assertFalse(Match.objects.exists())
+
+    def test_benchmark_per_match_vs_bulk(self):
+        """
+        32-team round robin (496 fixtures) through both paths.
+        """
+        tournament, team_ids = create_tournament(32)
+
+        queries_by_path = {}
+        for name, create in [
+            ("per-match", create_matches_for_tournament),
+            ("bulk", bulk_create_matches_for_tournament),
+        ]:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    matches = create(tournament, team_ids)
+                transaction.set_rollback(True)
+
+            self.assertEqual(len(matches), 496)
+            queries_by_path[name] = queries.captured_queries
+
+        self.assertLess(
+            len(queries_by_path["bulk"]), len(queries_by_path["per-match"]) / 100
+        )
+
+        # last match number, teams with player counts, clashing fixtures;
+        # the rest is the insert (split into batches on SQLite)
+        reads = [
+            query for query in queries_by_path["bulk"]
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(len(reads), 3)
+
+
+class SchedulerTests(TestCase):
+
+    def test_schedules_large_round_robin_within_dates(self):
+        """
+        32 teams, 496 fixtures, 4 venues, 16 days.
+        """
+        tournament, team_ids = create_tournament(32, end_date=date(2026, 1, 16))
+
+        started = time.perf_counter()
+        matches, unplaced = schedule_matches_for_tournament(
+            tournament, team_ids, ["Ground 1", "Ground 2", "Ground 3", "Ground 4"],
+            match_minutes=60, rest_minutes=60
+        )
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(unplaced, [])
+        self.assertEqual(len(matches), 496)
+        self.assertLess(elapsed, 1)
+
+        by_team = {}
+        venue_slots = set()
+        for match in matches:
+            self.assertLessEqual(match.match_date.date(), tournament.end_date)
+            self.assertNotIn((match.match_date, match.venue), venue_slots)
+            venue_slots.add((match.match_date, match.venue))
+            for team_id in (match.team_a_id, match.team_b_id):
+                by_team.setdefault(team_id, []).append(match.match_date)
+
+        # one hour match plus one hour rest
+        for starts in by_team.values():
+            starts.sort()
+            gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+            self.assertGreaterEqual(min(gaps).total_seconds(), 2 * 3600)
+
+    def test_reports_fixtures_that_do_not_fit(self):
+        tournament, team_ids = create_tournament(6, end_date=date(2026, 1, 1))
+
+        matches, unplaced = schedule_matches_for_tournament(
+            tournament, team_ids, ["Ground 1"], match_minutes=60, rest_minutes=0
+        )
+
+        # 09:00 - 18:00 holds nine one-hour matches
+        self.assertEqual(len(matches), 9)
+        self.assertEqual(len(unplaced), 6)
+        self.assertEqual(Match.objects.filter(tournament=tournament).count(), 9)
+
+
+class KnockoutBracketTests(TestCase):
+
+    def test_seed_order_keeps_top_seeds_apart(self):
+        self.assertEqual(seed_order(8), [1, 8, 4, 5, 2, 7, 3, 6])
+
+    def test_byes_and_advancement(self):
+        tournament, team_ids = create_tournament(5)
+
+        round_one = generate_knockout_bracket(tournament, team_ids)
+
+        # 8-slot bracket: seeds 1, 2 and 3 get byes, only 4 v 5 is played
+        self.assertEqual(len(round_one), 1)
+        self.assertEqual(
+            {round_one[0].team_a_id, round_one[0].team_b_id},
+            {team_ids[3], team_ids[4]}
+        )
+
+        # seeds 2 and 3 both had byes, so their semi-final already exists
+        semis = KnockoutSlot.objects.filter(tournament=tournament, round_number=2)
+        self.assertEqual(semis.get(position=0).match, None)
+        self.assertIsNotNone(semis.get(position=1).match)
+
+        advance_winner(round_one[0], team_ids[4])
+        semi = semis.get(position=0)
+        self.assertEqual((semi.team_a_id, semi.team_b_id), (team_ids[0], team_ids[4]))
+        self.assertEqual(semi.seed_b, 5)
+
+        for slot in semis.order_by("position"):
+            advance_winner(slot.match, slot.team_a_id)
+
+        final = KnockoutSlot.objects.get(tournament=tournament, round_number=3)
+        self.assertEqual((final.team_a_id, final.team_b_id), (team_ids[0], team_ids[1]))
+        self.assertEqual(final.match.round_number, 3)
+
+        # draws do not advance
+        self.assertIsNone(advance_winner(final.match, None))
+
+        with self.assertNumQueries(1):
+            rounds = get_bracket(tournament.id)
+        self.assertEqual([len(r["slots"]) for r in rounds], [4, 2, 1])
+
+    def test_bracket_endpoint_checks_and_defaults_the_seeds(self):
+        tournament, team_ids = create_tournament(4)
+        Tournament.objects.filter(id=tournament.id).update(format_type="KNOCKOUT")
+        Team.objects.filter(id=team_ids[2]).update(total_points=6)
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="organizer"))
+        url = f"/api/tournaments/{tournament.id}/generate_matches/"
+
+        for seeds in ([team_ids[0], str(team_ids[1]), *team_ids[2:]], "1,2,3,4", [True] * 4):
+            response = client.post(url, {"seeds": seeds}, format="json")
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(Match.objects.exists())
+
+        # most points is the top seed, the rest by name
+        response = client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, 201)
+        first_round = KnockoutSlot.objects.filter(
+            tournament=tournament, round_number=1
+        ).order_by("position")
+        self.assertEqual(
+            [(slot.seed_a, slot.team_a_id) for slot in first_round],
+            [(1, team_ids[2]), (2, team_ids[0])]
+        )
+
+    def test_next_round_in_a_short_tournament_avoids_the_feeders(self):
+        tournament, team_ids = create_tournament(4, end_date=date(2026, 1, 2))
+        semis = generate_knockout_bracket(tournament, team_ids)
+
+        for semi in semis:
+            advance_winner(semi, semi.team_a_id)
+
+        # past the last day: moved back to it, after the second semi
+        final = KnockoutSlot.objects.get(tournament=tournament, round_number=2).match
+        self.assertEqual(
+            final.match_date,
+            timezone.make_aware(datetime(2026, 1, 2, 3, 0))
+        )
+
+    def test_next_round_without_free_time_is_left_unscheduled(self):
+        tournament, team_ids = create_tournament(4, end_date=date(2026, 1, 2))
+        semis = generate_knockout_bracket(tournament, team_ids)
+        Match.objects.filter(id=semis[1].id).update(
+            match_date=timezone.make_aware(datetime(2026, 1, 2, 22, 0))
+        )
+
+        with self.assertLogs("tournaments.bracket", "WARNING"):
+            for semi in semis:
+                advance_winner(semi, semi.team_a_id)
 
-# Create your tests here.
+        final = KnockoutSlot.objects.get(tournament=tournament, round_number=2)
+        self.assertEqual(
+            (final.team_a_id, final.team_b_id, final.match_id),
+            (semis[0].team_a_id, semis[1].team_a_id, None)
+        )
@@ -1,6 +1,15 @@
 # tournaments/utils.py
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
 from matches.models import Match
+from teams.models import Team
+
+MIN_ACTIVE_PLAYERS = 7
 
 def generate_round_robin_fixtures(team_ids):
     """
@@ -58,4 +67,133 @@ def create_matches_for_tournament(tournament, team_ids, venue="TBD"):
         )
         matches_created.append(match)
     
-    return matches_created
\ No newline at end of file
+    return matches_created
+
+
+def validate_fixtures(tournament, matches):
+    """
+    In-memory version of Match.clean for a batch of unsaved matches.
+    Teams, active-player counts and existing fixtures on the same dates
+    are loaded once. Returns a list of error messages (empty if valid).
+    """
+    errors = []
+
+    if not tournament.is_active:
+        return ["Cannot create match for inactive tournament."]
+
+    team_ids = {m.team_a_id for m in matches} | {m.team_b_id for m in matches}
+
+    # id -> (tournament id, active players)
+    teams = {
+        team["id"]: (team["tournament_id"], team["active_players"])
+        for team in Team.objects.filter(id__in=team_ids).order_by().values(
+            "id", "tournament_id"
+        ).annotate(
+            active_players=Count("players", filter=Q(players__is_active=True))
+        )
+    }
+
+    # (match_date, team id) already taken, in the database or this batch
+    busy = set()
+    for match_date, team_a_id, team_b_id in Match.objects.filter(
+        match_date__in={m.match_date for m in matches}
+    ).filter(
+        Q(team_a_id__in=team_ids) | Q(team_b_id__in=team_ids)
+    ).values_list("match_date", "team_a_id", "team_b_id"):
+        busy.add((match_date, team_a_id))
+        busy.add((match_date, team_b_id))
+
+    for m in matches:
+        label = f"Match {m.match_number}"
+
+        if m.match_number <= 0:
+            errors.append(f"{label}: Match number must be positive.")
+            continue
+
+        if m.team_a_id == m.team_b_id:
+            errors.append(f"{label}: Team A and Team B cannot be same.")
+            continue
+
+        invalid = False
+        for side, team_id in [("A", m.team_a_id), ("B", m.team_b_id)]:
+            tournament_id, active_players = teams.get(team_id, (None, 0))
+
+            if tournament_id != tournament.id:
+                errors.append(f"{label}: Team {side} does not belong to this tournament.")
+                invalid = True
+            elif active_players < MIN_ACTIVE_PLAYERS:
+                errors.append(
+                    f"{label}: Team {side} must have at least "
+                    f"{MIN_ACTIVE_PLAYERS} active players."
+                )
+                invalid = True
+
+        if invalid:
+            continue
+
+        match_day = timezone.localtime(m.match_date).date()
+        if match_day < tournament.start_date or match_day > tournament.end_date:
+            errors.append(f"{label}: Match date must be within tournament dates.")
+            continue
+
+        slots = [(m.match_date, m.team_a_id), (m.match_date, m.team_b_id)]
+        if any(slot in busy for slot in slots):
+            errors.append(f"{label}: One of the teams already has a match at this time.")
+            continue
+
+        busy.update(slots)
+
+    return errors
+
+
+def bulk_create_matches(tournament, fixtures):
+    """
+    Validate scheduled fixtures in memory and write them with one bulk
+    insert instead of a save (and Match.clean) per match.
+    Fixtures are dicts with team_a, team_b, round, match_date and venue,
+    numbered in the given order. All or nothing: raises ValidationError
+    listing every invalid fixture.
+    """
+    with transaction.atomic():
+        last_number = Match.objects.filter(tournament=tournament).aggregate(
+            last=Max("match_number")
+        )["last"] or 0
+
+        matches = [
+            Match(
+                tournament=tournament,
+                team_a_id=fix['team_a'],
+                team_b_id=fix['team_b'],
+                match_number=last_number + idx + 1,
+                round_number=fix['round'],
+                match_date=fix['match_date'],
+                venue=fix['venue'],
+                status='SCHEDULED'
+            )
+            for idx, fix in enumerate(fixtures)
+        ]
+
+        errors = validate_fixtures(tournament, matches)
+        if errors:
+            raise ValidationError(errors)
+
+        return Match.objects.bulk_create(matches)
+
+
+def bulk_create_matches_for_tournament(tournament, team_ids, venue="TBD"):
+    """
+    Same fixtures and schedule as create_matches_for_tournament (one match
+    per day), written through bulk_create_matches.
+    """
+    fixtures = [
+        {
+            **fix,
+            'match_date': timezone.make_aware(datetime.combine(
+                tournament.start_date + timedelta(days=idx), time.min
+            )),
+            'venue': venue,
+        }
+        for idx, fix in enumerate(generate_round_robin_fixtures(team_ids))
+    ]
+
+    return bulk_create_matches(tournament, fixtures)
@@ -12,7 +12,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Tournament
 from .serializers import TournamentSerializer
-from .utils import create_matches_for_tournament
+from django.core.exceptions import ValidationError
+from datetime import time
+from .scheduling import (
+    DEFAULT_DAY_END,
+    DEFAULT_DAY_START,
+    DEFAULT_MATCH_MINUTES,
+    DEFAULT_REST_MINUTES,
+    schedule_matches_for_tournament,
+)
+from .bracket import generate_knockout_bracket, get_bracket
+from .utils import bulk_create_matches_for_tournament
 from matches.serializers import MatchSerializer  # we'll create this next
 
 class TournamentViewSet(viewsets.ModelViewSet):
@@ -35,14 +45,137 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 {'error': 'Matches have already been generated for this tournament'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        team_ids = [team.id for team in teams]
+        venues = request.data.get('venues')
+
+        if tournament.format_type == 'KNOCKOUT':
+            return self.generate_bracket(request, tournament, team_ids)
+
+        # Several venues: pack fixtures into venue/time slots
+        if venues:
+            return self.schedule_matches(request, tournament, team_ids, venues)
+
         # Create matches
-        matches = create_matches_for_tournament(
-            tournament,
-            [team.id for team in teams],
-            venue=request.data.get('venue', 'TBD')
-        )
+        try:
+            matches = bulk_create_matches_for_tournament(
+                tournament,
+                team_ids,
+                venue=request.data.get('venue', 'TBD')
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': e.messages},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         serializer = MatchSerializer(matches, many=True)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def generate_bracket(self, request, tournament, team_ids):
+        """
+        Optional: seeds, the tournament's team ids best first
+        (default: team table order, most points first, then by name)
+        """
+        seeds = request.data.get('seeds') or list(
+            tournament.teams.order_by('-total_points', 'name').values_list('id', flat=True)
+        )
+
+        if not isinstance(seeds, list) or not all(
+            isinstance(seed, int) and not isinstance(seed, bool) for seed in seeds
+        ):
+            return Response(
+                {'error': 'seeds must be a list of team ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if sorted(seeds) != sorted(team_ids):
+            return Response(
+                {'error': 'seeds must list every team of the tournament once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            matches = generate_knockout_bracket(
+                tournament,
+                seeds,
+                venue=request.data.get('venue', 'TBD')
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': e.messages},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            'matches': MatchSerializer(matches, many=True).data,
+            'bracket': get_bracket(tournament.id),
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def bracket(self, request, pk=None):
+        """Knockout bracket with teams, seeds, winners and scores"""
+        rounds = get_bracket(pk)
+
+        if not rounds:
+            return Response(
+                {'error': 'No bracket has been generated for this tournament'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({'tournament_id': int(pk), 'rounds': rounds})
+
+    def schedule_matches(self, request, tournament, team_ids, venues):
+        """
+        Optional: day_start / day_end ("HH:MM"), match_minutes, rest_minutes
+        """
+        if not isinstance(venues, list) or not all(
+            isinstance(venue, str) and venue for venue in venues
+        ):
+            return Response(
+                {'error': 'venues must be a list of venue names'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            day_start = time.fromisoformat(
+                request.data.get('day_start', DEFAULT_DAY_START.isoformat())
+            )
+            day_end = time.fromisoformat(
+                request.data.get('day_end', DEFAULT_DAY_END.isoformat())
+            )
+            match_minutes = int(request.data.get('match_minutes', DEFAULT_MATCH_MINUTES))
+            rest_minutes = int(request.data.get('rest_minutes', DEFAULT_REST_MINUTES))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Invalid day_start, day_end, match_minutes or rest_minutes'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if match_minutes <= 0 or rest_minutes < 0 or day_end <= day_start:
+            return Response(
+                {'error': 'Invalid day_start, day_end, match_minutes or rest_minutes'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            matches, unplaced = schedule_matches_for_tournament(
+                tournament,
+                team_ids,
+                venues,
+                day_start=day_start,
+                day_end=day_end,
+                match_minutes=match_minutes,
+                rest_minutes=rest_minutes
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': e.messages},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            'matches': MatchSerializer(matches, many=True).data,
+            'unplaced': unplaced,
+        }, status=status.HTTP_201_CREATED)
     
 from rest_framework.decorators import api_view
 from rest_framework.response import Response